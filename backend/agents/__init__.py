@@ -6,9 +6,27 @@ agents that perform autonomous task planning and execution.
 This module re-exports the core building blocks for the multi-agent
 pipeline: the requirements agent, the development council, and the
 legacy `get_agent` entry point for the original SuperBuilderAgent.
+
+The re-exports are resolved lazily (PEP 562) so importing a single
+submodule such as ``backend.agents.claude_agent`` does not also pull in
+every other agent and its SDK on cold start.
 """
 
-# re-export get_agent for convenient import in main
-from .super_builder import get_agent  # noqa: F401
-from .requirements_agent import RequirementsAgent  # noqa: F401
-from .council import DevelopmentCouncil  # noqa: F401
+import importlib
+
+_LAZY_EXPORTS = {
+    "get_agent": ".super_builder",
+    "RequirementsAgent": ".requirements_agent",
+    "DevelopmentCouncil": ".council",
+}
+
+__all__ = list(_LAZY_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
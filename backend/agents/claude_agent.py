@@ -1,9 +1,19 @@
+import asyncio
+import functools
+import hashlib
 import importlib
 import logging
 import os
-import re
-from datetime import datetime
-from typing import Any, Dict, List, Optional
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import httpx
+
+from backend.agents import content_cache
+from backend.agents.plan_cache import PlanCache
+from backend.tools.github import GitHubTools
+from backend.utils.file_ops import list_dir, read_file, write_file
 
 anthropic_spec = importlib.util.find_spec("anthropic")
 if anthropic_spec:
@@ -11,11 +21,106 @@ if anthropic_spec:
 else:
     anthropic = None  # type: ignore
 
+# google-re2 matches in linear time and releases the GIL while it runs, which
+# helps when steps execute in worker threads. The patterns below stick to the
+# shared subset (inline flags, no lookaround) so stdlib ``re`` is a drop-in
+# fallback when the wheel is not installed.
+try:
+    import re2 as _regex
+except ImportError:  # pragma: no cover - optional dependency
+    import re as _regex
+
 logger = logging.getLogger(__name__)
 
+_FILENAME_RE = _regex.compile(
+    r"(?i)"
+    r"create\s+(?:file\s+)?[\"']?(?P<create>[a-zA-Z0-9_\-./]+\.[a-z]+)[\"']?"
+    r"|file\s+[\"']?(?P<file>[a-zA-Z0-9_\-./]+\.[a-z]+)[\"']?"
+    r"|[\"'](?P<quoted>[a-zA-Z0-9_\-./]+\.[a-z]+)[\"']"
+    r"|(?P<bare>\w+\.(?:py|js|ts|tsx|jsx|html|css|json|md|txt))"
+)
+_REPO_RE = _regex.compile(r"(?i)repo\s+([\w\-\.]+/?[\w\-\.]*)")
+_FILE_RE = _regex.compile(r"(?i)file\s+([\w\-\./]+)")
+# One non-blank line, minus any "1." / "-" / "*" / "•" marker
+_STEP_RE = _regex.compile(r"(?m)^[ \t]*(?:\d+\.[ \t]*|[-*•][ \t]*)?(\S.*?)[ \t\r]*$")
+_MAX_PLAN_STEPS = 8
+# Fallback plan used when Claude is unavailable; {0} is the cleaned goal
+_STATIC_TEMPLATES = (
+    "Analyze the goal and clarify requirements for: {0}",
+    "Design and implement a solution for: {0}",
+    "Test, review, and refine the solution for: {0}",
+)
+# Keywords (matched against the lowercased description) that route a step to
+# a tool; prefix matches so "files"/"reading" still count, except "pr" which
+# must stand alone.
+_INTENT_RE = _regex.compile(r"\b(github|read|write|create|commit|update|pull request|list|explore|file|pr\b)")
+
+# Message Batches are billed at half price but can take minutes to finish,
+# so pre-generating step content through them is opt-in.
+_BATCH_PRECOMPUTE = os.getenv("CLAUDE_BATCH_PRECOMPUTE", "").lower() in ("1", "true", "yes")
+_BATCH_TIMEOUT_SECONDS = float(os.getenv("CLAUDE_BATCH_TIMEOUT", "600"))
+_BATCH_POLL_SECONDS = 5.0
+
+# System prompts are module constants so every call sends a byte-identical
+# prefix, which is what Anthropic prompt caching keys on.
+_PLANNER_SYSTEM_PROMPT = (
+    "You are a senior software engineer and project planner. "
+    "Given a single development goal, break it into 3–7 concrete, "
+    "sequential steps that a coding agent could execute. "
+    "Each step should be short, action-focused, and specific. "
+    "Format each step clearly with actions like: create file, write code, test, etc."
+)
+_FILE_SYSTEM_PROMPT = (
+    "You are a code generation assistant. Generate clean, well-documented code "
+    "based on the step description and overall goal."
+)
+_GUIDANCE_SYSTEM_PROMPT = "You are a software development assistant executing a step in a larger task."
+_COMMIT_SYSTEM_PROMPT = "You are a coding assistant. Generate the file content to be committed."
+
+
+def _system_blocks(system_prompt: str) -> List[Dict[str, Any]]:
+    """Wrap a system prompt as a cacheable content block."""
+    return [{"type": "text", "text": system_prompt, "cache_control": {"type": "ephemeral"}}]
+
+
+@functools.cache
+def _github_tools() -> GitHubTools:
+    """Shared GitHub client, built on first use and reused by every step."""
+    return GitHubTools()
+
+
+@functools.lru_cache(maxsize=4096)
+def _classify_intent(desc_lower: str) -> str:
+    """
+    Map a lowercased step description to the handler that should run it.
+
+    Cached because identical descriptions recur across retries and cached plans.
+    """
+    tokens = set(_INTENT_RE.findall(desc_lower))
+    if "github" in tokens:
+        if "read" in tokens:
+            return "github_read"
+        if "commit" in tokens or "update" in tokens:
+            return "github_write"
+        if ("create" in tokens and "pr" in tokens) or "pull request" in tokens:
+            return "github_pr"
+        return "github"
+    if "create" in tokens and "file" in tokens:
+        return "create_file"
+    if "read" in tokens and "file" in tokens:
+        return "read_file"
+    if "list" in tokens or "explore" in tokens:
+        return "list"
+    return "default"
+
+
+def _step_cache_key(task_goal: str, description: str) -> str:
+    """Stable key for a step's prompt, computed once when the plan is built."""
+    return hashlib.blake2b(f"{task_goal}|{description}".encode("utf-8"), digest_size=16).hexdigest()
+
 
 def _now_iso() -> str:
-    return datetime.utcnow().isoformat() + "Z"
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
 
 
 class ClaudeAgent:
@@ -34,14 +139,29 @@ class ClaudeAgent:
         self.model = os.getenv("ANTHROPIC_MODEL", "claude-3-5-sonnet-latest")
         api_key = os.getenv("ANTHROPIC_API_KEY")
         self._client: Optional["anthropic.Anthropic"] = None
+        self._async_client: Optional["anthropic.AsyncAnthropic"] = None
+        self._plan_cache = PlanCache()
 
         if anthropic is not None and api_key:
             try:
-                self._client = anthropic.Anthropic(api_key=api_key)
+                # Keep-alive pool shared by every call this agent makes
+                http_client = anthropic.DefaultHttpxClient(
+                    timeout=60.0,
+                    limits=httpx.Limits(max_keepalive_connections=10, max_connections=20),
+                )
+                self._client = anthropic.Anthropic(api_key=api_key, http_client=http_client)
+                self._async_client = anthropic.AsyncAnthropic(
+                    api_key=api_key,
+                    http_client=anthropic.DefaultAsyncHttpxClient(
+                        timeout=60.0,
+                        limits=httpx.Limits(max_keepalive_connections=10, max_connections=20),
+                    ),
+                )
                 logger.info("ClaudeAgent initialized with model %s", self.model)
             except Exception as exc:  # pragma: no cover - defensive
                 logger.warning("Failed to initialize Anthropic client: %s", exc)
                 self._client = None
+                self._async_client = None
         else:
             if anthropic is None:
                 logger.warning("anthropic package is not installed, ClaudeAgent in fallback mode")
@@ -64,17 +184,110 @@ class ClaudeAgent:
             response = self._client.messages.create(
                 model=self.model,
                 max_tokens=max_tokens,
-                system=system_prompt,
+                system=_system_blocks(system_prompt),
+                messages=[{"role": "user", "content": user_prompt}],
+            )
+            return self._response_text(response)
+        except Exception as exc:  # pragma: no cover - defensive
+            logger.warning("Claude API call failed: %s", exc)
+            return None
+
+    async def _acall_claude(self, system_prompt: str, user_prompt: str, max_tokens: int = 800) -> Optional[str]:
+        """
+        Async counterpart of ``_call_claude`` that does not block the event loop.
+        """
+        if self._async_client is None:
+            return None
+
+        try:
+            response = await self._async_client.messages.create(
+                model=self.model,
+                max_tokens=max_tokens,
+                system=_system_blocks(system_prompt),
                 messages=[{"role": "user", "content": user_prompt}],
             )
-            for block in response.content:
-                if getattr(block, "type", None) == "text":
-                    return block.text
-            return str(response)
+            return self._response_text(response)
         except Exception as exc:  # pragma: no cover - defensive
             logger.warning("Claude API call failed: %s", exc)
             return None
 
+    def _stream_claude(self, system_prompt: str, user_prompt: str, max_tokens: int = 800) -> Iterator[str]:
+        """
+        Stream Claude's reply as text deltas. Yields nothing if the client is
+        not configured. A failed stream is logged and re-raised, so callers
+        can tell a truncated reply from a complete one.
+        """
+        if self._client is None:
+            return
+
+        try:
+            with self._client.messages.stream(
+                model=self.model,
+                max_tokens=max_tokens,
+                system=_system_blocks(system_prompt),
+                messages=[{"role": "user", "content": user_prompt}],
+            ) as stream:
+                for text in stream.text_stream:
+                    yield text
+        except Exception as exc:  # pragma: no cover - defensive
+            logger.warning("Claude streaming call failed: %s", exc)
+            raise
+
+    @staticmethod
+    def _response_text(response: Any) -> str:
+        for block in response.content:
+            if getattr(block, "type", None) == "text":
+                return block.text
+        return str(response)
+
+    def _call_claude_batch(self, requests: List[Tuple[str, str, int]]) -> List[Optional[str]]:
+        """
+        Submit several (system_prompt, user_prompt, max_tokens) requests as one
+        Message Batch and wait for the results.
+
+        Returns one entry per request, in order; entries are None when the
+        request failed, the batch timed out, or the client is not configured.
+        """
+        results: List[Optional[str]] = [None] * len(requests)
+        if self._client is None or not requests:
+            return results
+
+        try:
+            batch = self._client.messages.batches.create(
+                requests=[
+                    {
+                        "custom_id": str(idx),
+                        "params": {
+                            "model": self.model,
+                            "max_tokens": max_tokens,
+                            "system": _system_blocks(system_prompt),
+                            "messages": [{"role": "user", "content": user_prompt}],
+                        },
+                    }
+                    for idx, (system_prompt, user_prompt, max_tokens) in enumerate(requests)
+                ]
+            )
+
+            deadline = time.monotonic() + _BATCH_TIMEOUT_SECONDS
+            while batch.processing_status != "ended":
+                if time.monotonic() >= deadline:
+                    logger.warning("Claude batch %s timed out, cancelling", batch.id)
+                    self._client.messages.batches.cancel(batch.id)
+                    return results
+                time.sleep(_BATCH_POLL_SECONDS)
+                batch = self._client.messages.batches.retrieve(batch.id)
+
+            for entry in self._client.messages.batches.results(batch.id):
+                if entry.result.type != "succeeded":
+                    continue
+                for block in entry.result.message.content:
+                    if getattr(block, "type", None) == "text":
+                        results[int(entry.custom_id)] = block.text
+                        break
+        except Exception as exc:  # pragma: no cover - defensive
+            logger.warning("Claude batch call failed: %s", exc)
+        return results
+
     # ------------------------------------------------------------------ #
     # Planning
     # ------------------------------------------------------------------ #
@@ -83,28 +296,11 @@ class ClaudeAgent:
         """
         Parse bullet/numbered steps from Claude's response text.
         """
-        lines = [ln.strip() for ln in text.splitlines() if ln.strip()]
-        steps: List[str] = []
-        for ln in lines:
-            if ln[0].isdigit():
-                parts = ln.split(".", 1)
-                if len(parts) == 2 and parts[1].strip():
-                    steps.append(parts[1].strip())
-                    continue
-            if ln.startswith(("-", "*", "•")):
-                steps.append(ln.lstrip("-*• ").strip())
-                continue
-            if len(steps) < 8:
-                steps.append(ln)
-        return steps
+        return [match.group(1) for match in _STEP_RE.finditer(text)][:_MAX_PLAN_STEPS]
 
     def _static_plan(self, goal: str) -> List[str]:
         cleaned = goal.strip() or "the requested task"
-        return [
-            f"Analyze the goal and clarify requirements for: {cleaned}",
-            f"Design and implement a solution for: {cleaned}",
-            f"Test, review, and refine the solution for: {cleaned}",
-        ]
+        return [template.format(cleaned) for template in _STATIC_TEMPLATES]
 
     def _create_plan(self, goal: str) -> List[str]:
         """
@@ -112,17 +308,82 @@ class ClaudeAgent:
         Uses Claude when available, otherwise falls back to a static plan.
         """
         goal = goal.strip()
+        known = self._known_plan(goal)
+        if known is not None:
+            return known
+
+        text = self._call_claude(_PLANNER_SYSTEM_PROMPT, self._plan_prompt(goal), max_tokens=1200)
+        return self._plan_from_reply(goal, text)
+
+    async def _acreate_plan(self, goal: str) -> List[str]:
+        """
+        Async counterpart of ``_create_plan``.
+        """
+        goal = goal.strip()
+        known = self._known_plan(goal)
+        if known is not None:
+            return known
+
+        text = await self._acall_claude(_PLANNER_SYSTEM_PROMPT, self._plan_prompt(goal), max_tokens=1200)
+        return self._plan_from_reply(goal, text)
+
+    def stream_plan(self, goal: str) -> Iterator[str]:
+        """
+        Yield step descriptions for the goal as soon as each line of the
+        planner reply is complete, instead of waiting for the whole message.
+
+        Falls back to the static plan when Claude yields no parseable steps.
+        """
+        goal = goal.strip()
+        known = self._known_plan(goal)
+        if known is not None:
+            yield from known
+            return
+
+        steps: List[str] = []
+        buffer = ""
+        try:
+            for delta in self._stream_claude(_PLANNER_SYSTEM_PROMPT, self._plan_prompt(goal), max_tokens=1200):
+                buffer += delta
+                *lines, buffer = buffer.split("\n")
+                for line in lines:
+                    match = _STEP_RE.match(line)
+                    if match and len(steps) < _MAX_PLAN_STEPS:
+                        steps.append(match.group(1))
+                        yield match.group(1)
+        except Exception:  # pragma: no cover - logged by _stream_claude
+            # The trailing line may be cut off and the plan incomplete: keep
+            # the steps already sent, but don't add the fragment or cache it
+            if not steps:
+                yield from self._static_plan(goal)
+            return
+        match = _STEP_RE.match(buffer)
+        if match and len(steps) < _MAX_PLAN_STEPS:
+            steps.append(match.group(1))
+            yield match.group(1)
+
+        if not steps:
+            logger.info("Claude returned no streamed steps, using static plan")
+            yield from self._static_plan(goal)
+            return
+        self._plan_cache.put(goal, steps)
+
+    def _known_plan(self, goal: str) -> Optional[List[str]]:
+        """
+        Return a plan that needs no LLM call (empty goal or cache hit), else None.
+        """
         if not goal:
             return self._static_plan("the requested task")
 
-        system_prompt = (
-            "You are a senior software engineer and project planner. "
-            "Given a single development goal, break it into 3–7 concrete, "
-            "sequential steps that a coding agent could execute. "
-            "Each step should be short, action-focused, and specific. "
-            "Format each step clearly with actions like: create file, write code, test, etc."
-        )
-        user_prompt = (
+        cached = self._plan_cache.get(goal)
+        if cached:
+            logger.info("planner: cache hit")
+            return cached
+        return None
+
+    @staticmethod
+    def _plan_prompt(goal: str) -> str:
+        return (
             "Goal:\n"
             f"{goal}\n\n"
             "Respond ONLY with a list of steps, one per line. "
@@ -130,7 +391,7 @@ class ClaudeAgent:
             "Be specific about file operations."
         )
 
-        text = self._call_claude(system_prompt, user_prompt, max_tokens=1200)
+    def _plan_from_reply(self, goal: str, text: Optional[str]) -> List[str]:
         if not text:
             logger.info("Claude unavailable, using static plan")
             return self._static_plan(goal)
@@ -139,8 +400,111 @@ class ClaudeAgent:
         if not steps:
             logger.info("Claude returned no parseable steps, using static plan")
             return self._static_plan(goal)
+        self._plan_cache.put(goal, steps)
         return steps
 
+    # ------------------------------------------------------------------ #
+    # Step content requests
+    # ------------------------------------------------------------------ #
+
+    def _file_content_request(self, description: str, task_goal: str) -> Tuple[str, str, int]:
+        user_prompt = (
+            f"Overall Goal: {task_goal}\n\n"
+            f"Current Step: {description}\n\n"
+            "Generate the complete file content. Include all necessary code, "
+            "imports, and documentation. Respond ONLY with the file content, "
+            "no explanations or markdown formatting."
+        )
+        return _FILE_SYSTEM_PROMPT, user_prompt, 4000
+
+    def _guidance_request(self, description: str, task_goal: str) -> Tuple[str, str, int]:
+        user_prompt = (
+            f"Overall Goal: {task_goal}\n\n"
+            f"Current Step: {description}\n\n"
+            "Describe what should be done for this step and what the expected outcome is. "
+            "Be specific and actionable. Keep it under 200 words."
+        )
+        return _GUIDANCE_SYSTEM_PROMPT, user_prompt, 400
+
+    def _independent_request(self, description: str, task_goal: str) -> Optional[Tuple[str, str, int]]:
+        """
+        Return the Claude request for a step whose content does not depend on
+        earlier steps (file creation, guidance), or None when the step reads
+        workspace/GitHub state and must run in order.
+        """
+        intent = _classify_intent(description.lower())
+        if intent == "create_file":
+            return self._file_content_request(description, task_goal)
+        if intent == "default":
+            return self._guidance_request(description, task_goal)
+        return None
+
+    def _file_cache_key(self, step: Dict[str, Any], task_goal: str) -> Optional[str]:
+        """Content-cache key of a create-file step, or None for other steps."""
+        description = step["description"]
+        if _classify_intent(description.lower()) != "create_file":
+            return None
+        filename = self._extract_filename(description)
+        if not filename:
+            return None
+        # Plans built before steps carried a key fall back to hashing here
+        return step.get("user_prompt_cache_key") or content_cache.fingerprint(task_goal, description, filename)
+
+    def _requests_to_precompute(
+        self, steps: List[Dict[str, Any]], task_goal: str
+    ) -> List[Tuple[Dict[str, Any], Tuple[str, str, int], Optional[str]]]:
+        # Files already in the content cache are served from it when the step
+        # runs, so they are not paid for again here
+        pending = []
+        for step in steps:
+            request = self._independent_request(step["description"], task_goal)
+            if request is None:
+                continue
+            fp = self._file_cache_key(step, task_goal)
+            if fp is None or content_cache.get(fp) is None:
+                pending.append((step, request, fp))
+        return pending
+
+    @staticmethod
+    def _store_precomputed(
+        pending: List[Tuple[Dict[str, Any], Tuple[str, str, int], Optional[str]]], outputs: List[Optional[str]]
+    ) -> None:
+        for (step, _, fp), content in zip(pending, outputs):
+            if content:
+                step.setdefault("metadata", {})["precomputed_content"] = content
+                if fp:
+                    content_cache.put(fp, content)
+
+    def _precompute_step_content(self, steps: List[Dict[str, Any]], task_goal: str) -> None:
+        """
+        Generate content for all independent steps in one Message Batch and
+        stash it in each step's metadata for ``_execute_step_with_tools``.
+        """
+        pending = self._requests_to_precompute(steps, task_goal)
+        if not pending:
+            return
+
+        self._store_precomputed(pending, self._call_claude_batch([request for _, request, _ in pending]))
+
+    async def _aprecompute_step_content(self, steps: List[Dict[str, Any]], task_goal: str) -> None:
+        """
+        Async counterpart of ``_precompute_step_content``: the independent
+        requests are sent concurrently rather than as a Message Batch.
+        """
+        pending = self._requests_to_precompute(steps, task_goal)
+        if not pending:
+            return
+
+        outputs = await asyncio.gather(*(self._acall_claude(*request) for _, request, _ in pending))
+        self._store_precomputed(pending, list(outputs))
+
+    @staticmethod
+    def _take_precomputed(step: Dict[str, Any]) -> Optional[str]:
+        metadata = step.get("metadata")
+        if isinstance(metadata, dict):
+            return metadata.pop("precomputed_content", None)
+        return None
+
     # ------------------------------------------------------------------ #
     # Step execution with real tools
     # ------------------------------------------------------------------ #
@@ -148,158 +512,176 @@ class ClaudeAgent:
     def _execute_step_with_tools(self, step: Dict[str, Any], task_goal: str) -> Dict[str, Any]:
         """
         Execute a step using real file operations and tools.
+
+        ``updated_at`` is left to the caller, which stamps the step together
+        with the task.
         """
-        from backend.utils.file_ops import list_dir, read_file, write_file
-        from backend.tools.github import GitHubTools
-
-        description = step.get("description", "")
-        step_logs = step.get("logs", [])
-
-        # Check for GitHub-specific tasks
-        if "github" in description.lower():
-            gh_tools = GitHubTools()
-
-            # Simple heuristic for now - can be replaced with LLM decision
-            # Update regex to support owner/repo (including slash)
-            repo_match = re.search(r"repo\s+([\w\-\.]+/?[\w\-\.]*)", description, re.IGNORECASE)
-            logger.info(f"GitHub task detected. Description: {description}")
-            logger.info(f"Repo match: {repo_match.group(1) if repo_match else 'None'}")
-
-            if "read" in description.lower():
-                # Expecting description like "Read file x from repo y"
-                file_match = re.search(r"file\s+([\w\-\./]+)", description, re.IGNORECASE)
-                if repo_match and file_match:
-                    content = gh_tools.read_file(repo_match.group(1), file_match.group(1))
-                    step["result"] = f"GitHub Read Result: {content[:100]}..."
-                    step_logs.append(f"Read GitHub file {file_match.group(1)}")
-                else:
-                    step["result"] = "Could not parse repo or file from description"
-
-            elif "commit" in description.lower() or "update" in description.lower():
-                # Expecting description like "Update file x in repo y with message z"
-                file_match = re.search(r"file\s+([\w\-\./]+)", description, re.IGNORECASE)
-                if repo_match and file_match:
-                    # For content, we'd typically ask the LLM to generate it, but here we assume
-                    # the agent has already generated content or we need to ask for it.
-                    # For this simple "tool use" step, let's ask Claude to generate the content to be written.
-
-                    system_prompt = "You are a coding assistant. Generate the file content to be committed."
-                    user_prompt = f"Goal: {task_goal}\nStep: {description}\n\nProvide only the file content."
-                    content = self._call_claude(system_prompt, user_prompt)
-
-                    if content:
-                        msg = f"Update {file_match.group(1)}"  # Simple commit message
-                        res = gh_tools.update_file(repo_match.group(1), file_match.group(1), content, msg)
-                        step["result"] = res
-                        step_logs.append(res)
-                    else:
-                        step["result"] = "Failed to generate content for commit"
-                else:
-                    step["result"] = "Could not parse repo or file for commit"
-
-            elif "create pr" in description.lower() or "pull request" in description.lower():
-                # This needs more params, would be better served by a structured tool call
-                step["result"] = "PR creation requires more structured input"
-            # Add more specific handlers as needed
-
-        # Fallback to local file ops (existing logic)
-        elif "create" in description.lower() and "file" in description.lower():
-            system_prompt = (
-                "You are a code generation assistant. Generate clean, well-documented code "
-                "based on the step description and overall goal."
-            )
-            user_prompt = (
-                f"Overall Goal: {task_goal}\n\n"
-                f"Current Step: {step['description']}\n\n"
-                "Generate the complete file content. Include all necessary code, "
-                "imports, and documentation. Respond ONLY with the file content, "
-                "no explanations or markdown formatting."
-            )
+        # Original case goes to prompts and filename parsing; the lowercased
+        # copy is only used for routing.
+        desc_raw = step.get("description", "")
+        desc = desc_raw.lower()
+        step_logs = step.get("logs") or []
+
+        handler = self._STEP_HANDLERS[_classify_intent(desc)]
+        handler(self, step, desc_raw, task_goal, step_logs)
+
+        step["logs"] = step_logs
+
+        return step
 
-            content = self._call_claude(system_prompt, user_prompt, max_tokens=4000)
+    def _github_repo(self, description: str) -> Optional[Any]:
+        # Simple heuristic for now - can be replaced with LLM decision
+        # Update regex to support owner/repo (including slash)
+        repo_match = _REPO_RE.search(description)
+        logger.info(f"GitHub task detected. Description: {description}")
+        logger.info(f"Repo match: {repo_match.group(1) if repo_match else 'None'}")
+        return repo_match
+
+    def _run_github_read(
+        self, step: Dict[str, Any], description: str, task_goal: str, step_logs: List[str]
+    ) -> None:
+        # Expecting description like "Read file x from repo y"
+        repo_match = self._github_repo(description)
+        file_match = _FILE_RE.search(description)
+        if repo_match and file_match:
+            content = _github_tools().read_file(repo_match.group(1), file_match.group(1))
+            step["result"] = f"GitHub Read Result: {content[:100]}..."
+            step_logs.append(f"Read GitHub file {file_match.group(1)}")
+        else:
+            step["result"] = "Could not parse repo or file from description"
+
+    def _run_github_write(
+        self, step: Dict[str, Any], description: str, task_goal: str, step_logs: List[str]
+    ) -> None:
+        # Expecting description like "Update file x in repo y with message z"
+        repo_match = self._github_repo(description)
+        file_match = _FILE_RE.search(description)
+        if repo_match and file_match:
+            # For content, we'd typically ask the LLM to generate it, but here we assume
+            # the agent has already generated content or we need to ask for it.
+            # For this simple "tool use" step, let's ask Claude to generate the content to be written.
+
+            user_prompt = f"Goal: {task_goal}\nStep: {description}\n\nProvide only the file content."
+            content = self._call_claude(_COMMIT_SYSTEM_PROMPT, user_prompt)
 
             if content:
-                filename = self._extract_filename(step["description"])
-                if filename:
-                    try:
-                        write_file(filename, content)
-                        step_logs.append(f"Created file: {filename}")
-                        step["result"] = f"Successfully created {filename}"
-                        step["metadata"] = {"filename": filename, "size": len(content)}
-                    except Exception as exc:
-                        step["error"] = f"Failed to create file: {exc}"
-                        step_logs.append(f"Error: {exc}")
-                else:
-                    step["result"] = "Generated content but couldn't determine filename"
-                    step_logs.append("Warning: Could not extract filename from step description")
+                msg = f"Update {file_match.group(1)}"  # Simple commit message
+                res = _github_tools().update_file(repo_match.group(1), file_match.group(1), content, msg)
+                step["result"] = res
+                step_logs.append(res)
             else:
-                step["result"] = "Could not generate file content (Claude unavailable)"
-                step_logs.append("Warning: File generation skipped")
-
-        elif "read" in description.lower() and "file" in description.lower():
-            filename = self._extract_filename(step["description"])
+                step["result"] = "Failed to generate content for commit"
+        else:
+            step["result"] = "Could not parse repo or file for commit"
+
+    def _run_github_pr(
+        self, step: Dict[str, Any], description: str, task_goal: str, step_logs: List[str]
+    ) -> None:
+        self._github_repo(description)
+        # This needs more params, would be better served by a structured tool call
+        step["result"] = "PR creation requires more structured input"
+
+    def _run_github_other(
+        self, step: Dict[str, Any], description: str, task_goal: str, step_logs: List[str]
+    ) -> None:
+        # Add more specific handlers as needed
+        self._github_repo(description)
+
+    def _run_create_file(
+        self, step: Dict[str, Any], description: str, task_goal: str, step_logs: List[str]
+    ) -> None:
+        filename = self._extract_filename(description)
+        fp = self._file_cache_key(step, task_goal)
+
+        content = self._take_precomputed(step)
+        if content is None and fp:
+            content = content_cache.get(fp)
+            if content is not None:
+                logger.info("content cache hit for step %s", fp)
+                step_logs.append("Reused cached file content")
+        if content is None:
+            content = self._call_claude(*self._file_content_request(description, task_goal))
+            if content and fp:
+                content_cache.put(fp, content)
+
+        if content:
             if filename:
                 try:
-                    content = read_file(filename)
-                    step["result"] = f"Read {len(content)} characters from {filename}"
-                    step_logs.append(f"Successfully read {filename}")
-                    step["metadata"] = {"filename": filename, "content_preview": content[:200]}
+                    write_file(filename, content)
+                    step_logs.append(f"Created file: {filename}")
+                    step["result"] = f"Successfully created {filename}"
+                    step["metadata"] = {"filename": filename, "size": len(content)}
                 except Exception as exc:
-                    step["error"] = f"Failed to read file: {exc}"
+                    step["error"] = f"Failed to create file: {exc}"
                     step_logs.append(f"Error: {exc}")
             else:
-                step["result"] = "Could not determine which file to read"
-                step_logs.append("Warning: Filename not found in description")
-
-        elif "list" in description.lower() or "explore" in description.lower():
+                step["result"] = "Generated content but couldn't determine filename"
+                step_logs.append("Warning: Could not extract filename from step description")
+        else:
+            step["result"] = "Could not generate file content (Claude unavailable)"
+            step_logs.append("Warning: File generation skipped")
+
+    def _run_read_file(
+        self, step: Dict[str, Any], description: str, task_goal: str, step_logs: List[str]
+    ) -> None:
+        filename = self._extract_filename(description)
+        if filename:
             try:
-                entries = list_dir("")
-                step["result"] = f"Found {len(entries)} items in workspace"
-                step_logs.append(f"Listed workspace: {len(entries)} items")
-                step["metadata"] = {"entries": [e["name"] for e in entries[:10]]}
+                content = read_file(filename)
+                step["result"] = f"Read {len(content)} characters from {filename}"
+                step_logs.append(f"Successfully read {filename}")
+                step["metadata"] = {"filename": filename, "content_preview": content[:200]}
             except Exception as exc:
-                step["error"] = f"Failed to list directory: {exc}"
+                step["error"] = f"Failed to read file: {exc}"
                 step_logs.append(f"Error: {exc}")
-
         else:
-            system_prompt = "You are a software development assistant executing a step in a larger task."
-            user_prompt = (
-                f"Overall Goal: {task_goal}\n\n"
-                f"Current Step: {step['description']}\n\n"
-                "Describe what should be done for this step and what the expected outcome is. "
-                "Be specific and actionable. Keep it under 200 words."
-            )
+            step["result"] = "Could not determine which file to read"
+            step_logs.append("Warning: Filename not found in description")
 
-            guidance = self._call_claude(system_prompt, user_prompt, max_tokens=400)
-            if guidance:
-                step["result"] = guidance
-                step_logs.append(f"Step guidance: {guidance[:100]}...")
-            else:
-                step["result"] = f"Completed step: {step['description']}"
-                step_logs.append("Step completed (no specific actions)")
-
-        step["logs"] = step_logs
-        step["updated_at"] = _now_iso()
-
-        return step
+    def _run_list(
+        self, step: Dict[str, Any], description: str, task_goal: str, step_logs: List[str]
+    ) -> None:
+        try:
+            entries = list_dir("")
+            step["result"] = f"Found {len(entries)} items in workspace"
+            step_logs.append(f"Listed workspace: {len(entries)} items")
+            step["metadata"] = {"entries": [e["name"] for e in entries[:10]]}
+        except Exception as exc:
+            step["error"] = f"Failed to list directory: {exc}"
+            step_logs.append(f"Error: {exc}")
+
+    def _run_guidance(
+        self, step: Dict[str, Any], description: str, task_goal: str, step_logs: List[str]
+    ) -> None:
+        guidance = self._take_precomputed(step)
+        if guidance is None:
+            guidance = self._call_claude(*self._guidance_request(description, task_goal))
+        if guidance:
+            step["result"] = guidance
+            step_logs.append(f"Step guidance: {guidance[:100]}...")
+        else:
+            step["result"] = f"Completed step: {step['description']}"
+            step_logs.append("Step completed (no specific actions)")
+
+    _STEP_HANDLERS = {
+        "github_read": _run_github_read,
+        "github_write": _run_github_write,
+        "github_pr": _run_github_pr,
+        "github": _run_github_other,
+        "create_file": _run_create_file,
+        "read_file": _run_read_file,
+        "list": _run_list,
+        "default": _run_guidance,
+    }
 
     def _extract_filename(self, text: str) -> Optional[str]:
         """
         Try to extract a filename from step description.
         """
-        patterns = [
-            r"create\s+(?:file\s+)?[\"']?([a-zA-Z0-9_\-./]+\.[a-z]+)[\"']?",
-            r"file\s+[\"']?([a-zA-Z0-9_\-./]+\.[a-z]+)[\"']?",
-            r"[\"']([a-zA-Z0-9_\-./]+\.[a-z]+)[\"']",
-            r"(\w+\.(py|js|ts|tsx|jsx|html|css|json|md|txt))",
-        ]
-
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                return match.group(1)
-
-        return None
+        match = _FILENAME_RE.search(text)
+        if match is None:
+            return None
+        return match.group("create") or match.group("file") or match.group("quoted") or match.group("bare")
 
     # ------------------------------------------------------------------ #
     # Task execution
@@ -319,78 +701,141 @@ class ClaudeAgent:
           * advance current_step index
           * mark task 'completed' when all steps are done.
         """
-        task = dict(task_dict)
+        now = _now_iso()
+        task = self._prepare_task(task_dict, now)
+
+        if not task.get("plan"):
+            goal = task.get("goal") or ""
+            steps = self._build_steps(self._create_plan(goal), goal, now)
+            if _BATCH_PRECOMPUTE and self._client is not None:
+                self._precompute_step_content(steps, goal)
+            return self._install_plan(task, steps, now)
+
+        current_idx = self._active_step_index(task, now)
+        if current_idx is None:
+            return task
+
+        step = self._execute_step_with_tools(task["plan"][current_idx], task.get("goal", ""))
+        return self._complete_step(task, current_idx, step, now)
+
+    async def aexecute_task(self, task_dict: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Async counterpart of ``execute_task`` for use from FastAPI routes.
+
+        Planning and content pre-generation use the async Anthropic client;
+        step execution (file and GitHub I/O) runs in a worker thread so the
+        event loop stays free.
+        """
+        now = _now_iso()
+        task = self._prepare_task(task_dict, now)
+
+        if not task.get("plan"):
+            goal = task.get("goal") or ""
+            steps = self._build_steps(await self._acreate_plan(goal), goal, now)
+            if _BATCH_PRECOMPUTE and self._async_client is not None:
+                await self._aprecompute_step_content(steps, goal)
+            return self._install_plan(task, steps, now)
+
+        current_idx = self._active_step_index(task, now)
+        if current_idx is None:
+            return task
+
+        step = await asyncio.to_thread(self._execute_step_with_tools, task["plan"][current_idx], task.get("goal", ""))
+        return self._complete_step(task, current_idx, step, now)
+
+    def apply_plan(self, task_dict: Dict[str, Any], descriptions: List[str]) -> Dict[str, Any]:
+        """
+        Install an already generated plan (e.g. from ``stream_plan``) on the
+        task, exactly as the planning branch of ``execute_task`` would.
+        """
+        now = _now_iso()
+        task = self._prepare_task(task_dict, now)
+        return self._install_plan(task, self._build_steps(descriptions, task.get("goal") or "", now), now)
+
+    # ------------------------------------------------------------------ #
+    # Task bookkeeping shared by execute_task / aexecute_task
+    # ------------------------------------------------------------------ #
+
+    def _prepare_task(self, task: Dict[str, Any], now: str) -> Dict[str, Any]:
+        # The task dict is mutated in place; ``now`` is this call's only
+        # timestamp, so ``updated_at`` is written once here.
         task.setdefault("logs", [])
         task.setdefault("status", "queued")
         task.setdefault("plan", [])
         task.setdefault("current_step", None)
 
         if not task.get("created_at"):
-            task["created_at"] = _now_iso()
-        task["updated_at"] = _now_iso()
-
-        plan: List[Dict[str, Any]] = task.get("plan") or []
-
-        if not plan:
-            goal = task.get("goal") or ""
-            descriptions = self._create_plan(goal)
+            task["created_at"] = now
+        task["updated_at"] = now
+        return task
 
-            steps: List[Dict[str, Any]] = []
-            for desc in descriptions:
-                steps.append(
-                    {
-                        "description": desc,
-                        "status": "pending",
-                        "logs": [],
-                        "error": None,
-                        "metadata": {},
-                        "created_at": _now_iso(),
-                        "updated_at": _now_iso(),
-                    }
-                )
+    def _build_steps(self, descriptions: List[str], goal: str, now: str) -> List[Dict[str, Any]]:
+        steps: List[Dict[str, Any]] = []
+        for desc in descriptions:
+            steps.append(
+                {
+                    "description": desc,
+                    "user_prompt_cache_key": _step_cache_key(goal, desc),
+                    "status": "pending",
+                    "logs": [],
+                    "error": None,
+                    "metadata": {},
+                    "created_at": now,
+                    "updated_at": now,
+                }
+            )
+        return steps
 
-            task["plan"] = steps
-            task["current_step"] = 0 if steps else None
-            task["status"] = "in_progress"
-            task["logs"].append(f"[{_now_iso()}] Plan created with {len(steps)} steps by ClaudeAgent.")
-            return task
+    def _install_plan(self, task: Dict[str, Any], steps: List[Dict[str, Any]], now: str) -> Dict[str, Any]:
+        task["plan"] = steps
+        task["current_step"] = 0 if steps else None
+        task["status"] = "in_progress"
+        task["logs"].append(f"[{now}] Plan created with {len(steps)} steps by ClaudeAgent.")
+        return task
 
+    def _active_step_index(self, task: Dict[str, Any], now: str) -> Optional[int]:
+        """
+        Return the index of the step to run, or None after marking the task
+        completed when there is nothing left to run.
+        """
         current_idx = task.get("current_step")
         if current_idx is None:
             task["status"] = "completed"
-            task["logs"].append(f"[{_now_iso()}] Task marked completed; no active step.")
-            return task
+            task["logs"].append(f"[{now}] Task marked completed; no active step.")
+            return None
 
-        if current_idx < 0 or current_idx >= len(plan):
+        if current_idx < 0 or current_idx >= len(task["plan"]):
             task["status"] = "completed"
             task["current_step"] = None
-            task["logs"].append(f"[{_now_iso()}] current_step index out of range; forcing task to completed.")
-            return task
+            task["logs"].append(f"[{now}] current_step index out of range; forcing task to completed.")
+            return None
 
-        step = plan[current_idx]
-        step = self._execute_step_with_tools(step, task.get("goal", ""))
+        return current_idx
 
+    def _complete_step(
+        self, task: Dict[str, Any], current_idx: int, step: Dict[str, Any], now: str
+    ) -> Dict[str, Any]:
         step["status"] = "completed"
-        step["updated_at"] = _now_iso()
+        step["updated_at"] = now
 
-        completion_msg = f"[{_now_iso()}] Completed step {current_idx + 1}: {step.get('description', '')}"
+        completion_msg = f"[{now}] Completed step {current_idx + 1}: {step.get('description', '')}"
         task["logs"].append(completion_msg)
 
-        if current_idx + 1 < len(plan):
+        if current_idx + 1 < len(task["plan"]):
             task["current_step"] = current_idx + 1
             task["status"] = "in_progress"
         else:
             task["current_step"] = None
             task["status"] = "completed"
-            task["logs"].append(f"[{_now_iso()}] All steps completed by ClaudeAgent.")
-
-        task["plan"][current_idx] = step
-        task["updated_at"] = _now_iso()
+            task["logs"].append(f"[{now}] All steps completed by ClaudeAgent.")
         return task
 
 
+@functools.cache
 def get_agent() -> ClaudeAgent:
     """
     Factory function to keep parity with backend.agents.super_builder.get_agent.
+
+    The agent (and its pooled Anthropic client) is created once per process.
     """
     return ClaudeAgent()
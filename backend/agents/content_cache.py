@@ -0,0 +1,100 @@
+"""On-disk cache of generated file contents keyed by a request fingerprint.
+
+Creating a file means asking Claude for up to 4000 tokens of content, and
+reruns, retries and test loops ask for the same file for the same goal over
+and over. ``fingerprint`` hashes the inputs that determine the content;
+``get``/``put`` store the text under ``CONTENT_CACHE_DIR/<fp[:2]>/<fp>.txt``.
+
+Entries older than ``CONTENT_CACHE_TTL_SECONDS`` are treated as misses and
+the directory is trimmed back under ``CONTENT_CACHE_MAX_BYTES`` after each
+write, least recently used first (reads refresh an entry's mtime).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+CONTENT_CACHE_DIR = Path(
+    os.getenv(
+        "CONTENT_CACHE_PATH",
+        str(Path(__file__).resolve().parents[2] / ".cache" / "claude_content"),
+    )
+)
+CONTENT_CACHE_TTL_SECONDS = 7 * 24 * 60 * 60
+CONTENT_CACHE_MAX_BYTES = 100 * 1024 * 1024
+
+
+def fingerprint(task_goal: str, description: str, filename: str) -> str:
+    """Return the cache key for content generated for a step."""
+    return hashlib.sha256(f"{task_goal}|{description}|{filename}".encode("utf-8")).hexdigest()
+
+
+def _entry_path(fp: str) -> Path:
+    return CONTENT_CACHE_DIR / fp[:2] / f"{fp}.txt"
+
+
+def get(fp: str) -> Optional[str]:
+    """Return cached content for the fingerprint, or None on a miss."""
+    path = _entry_path(fp)
+    try:
+        if time.time() - path.stat().st_mtime > CONTENT_CACHE_TTL_SECONDS:
+            path.unlink(missing_ok=True)
+            return None
+        content = path.read_text(encoding="utf-8")
+        os.utime(path)
+        return content
+    except FileNotFoundError:
+        return None
+    except OSError as exc:
+        logger.warning("Content cache read failed: %s", exc)
+        return None
+
+
+def put(fp: str, content: str) -> None:
+    """Store content for the fingerprint, then enforce the size cap."""
+    path = _entry_path(fp)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a sibling temp file so readers never see a partial entry
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            fh.write(content)
+        os.replace(tmp, path)
+    except OSError as exc:
+        logger.warning("Content cache write failed: %s", exc)
+        return
+    _sweep()
+
+
+def _sweep() -> None:
+    """Drop expired entries, then the least recently used until under the cap."""
+    now = time.time()
+    entries = []
+    total = 0
+    for path in CONTENT_CACHE_DIR.glob("*/*.txt"):
+        try:
+            st = path.stat()
+        except OSError:
+            continue
+        if now - st.st_mtime > CONTENT_CACHE_TTL_SECONDS:
+            path.unlink(missing_ok=True)
+            continue
+        entries.append((st.st_mtime, st.st_size, path))
+        total += st.st_size
+
+    if total <= CONTENT_CACHE_MAX_BYTES:
+        return
+    entries.sort()
+    for _, size, path in entries:
+        path.unlink(missing_ok=True)
+        total -= size
+        if total <= CONTENT_CACHE_MAX_BYTES:
+            break
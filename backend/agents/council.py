@@ -2,7 +2,8 @@
 
 from __future__ import annotations
 
-from typing import List
+import asyncio
+from typing import Final, List
 
 from ..models import (
     AgentOpinion,
@@ -27,125 +28,158 @@ DEFAULT_AGENT_PROFILES = [
     ("Code Quality", "Best practices"),
 ]
 
+# The debate and plan content below does not depend on the request, so it is
+# built once at import. The models are frozen and hold tuples rather than
+# lists, which makes sharing them safe.
+
+_ROUND_ONE_CONCERNS = ("Validate dependencies", "Confirm hosting model")
+_RISK_ROUND_CONCERNS = ("Validate dependencies", "Confirm timelines")
+_COUNCIL_RECOMMENDATIONS = ("Document assumptions", "Share architecture digest")
+
+_ROUND_TWO: Final[DebateRound] = DebateRound(
+    topic="Critique and risk analysis",
+    opinions=[
+        AgentOpinion(
+            agent="Security",
+            role="Vulnerability analysis",
+            proposal="Enforce input validation, CSP headers, and secrets management.",
+            concerns=["Add rate limiting", "Plan logging redaction"],
+        ),
+        AgentOpinion(
+            agent="Performance",
+            role="Scalability",
+            proposal="Prefer edge-friendly frameworks and lazy loading for heavy assets.",
+            concerns=["Budget cold start times", "Monitor lighthouse scores"],
+        ),
+    ],
+)
+
+_ROUND_THREE: Final[DebateRound] = DebateRound(
+    topic="Consensus building",
+    opinions=[
+        AgentOpinion(
+            agent="Architect",
+            role="System design",
+            proposal="Adopt Next.js with TypeScript, Tailwind, and automated testing harness.",
+            concerns=["Confirm analytics SDK choices"],
+        )
+    ],
+)
+
+_DECISION: Final[CouncilDecision] = CouncilDecision(
+    consensus="Proceed with the proposed architecture and phased delivery plan.",
+    rationale=[
+        "Balances performance and security requirements",
+        "Aligns UX and accessibility goals with rapid iteration",
+    ],
+    dissent=["Validate integration specifics once user answers clarifying questions."],
+)
+
+_FOUNDATION_PHASE: Final[PlanPhase] = PlanPhase.model_construct(
+    name="Foundation",
+    steps=(
+        PlanStep.model_construct(
+            name="Initialize project",
+            description="Bootstrap Next.js + TypeScript workspace with linting and formatting",
+        ),
+        PlanStep.model_construct(
+            name="Design system",
+            description="Configure Tailwind theme based on brand preferences",
+            requires_review=True,
+        ),
+        PlanStep.model_construct(
+            name="Testing harness",
+            description="Install Jest, Testing Library, and Playwright for E2E coverage",
+        ),
+    ),
+)
+
+_CORE_PHASE: Final[PlanPhase] = PlanPhase.model_construct(
+    name="Core Components",
+    steps=(
+        PlanStep.model_construct(name="Navbar", description="Responsive navigation with mobile drawer"),
+        PlanStep.model_construct(name="Hero", description="Animated hero with CTA and optimized media", requires_review=True),
+        PlanStep.model_construct(name="Features", description="Grid of differentiators with iconography"),
+        PlanStep.model_construct(
+            name="Social Proof",
+            description="Testimonials and logo row sourced from structured content",
+            verification=("Accessibility audit", "Visual regression"),
+        ),
+        PlanStep.model_construct(name="Contact", description="Validated contact form with rate limiting", requires_review=True),
+    ),
+    verification=("Lighthouse >90", "WCAG 2.1 AA"),
+)
+
+_POLISH_PHASE: Final[PlanPhase] = PlanPhase.model_construct(
+    name="Polish & Optimization",
+    steps=(
+        PlanStep.model_construct(name="Micro-interactions", description="Motion and hover states for delight"),
+        PlanStep.model_construct(name="SEO", description="Meta tags, schema.org, and analytics events"),
+        PlanStep.model_construct(name="Performance", description="Code splitting and asset optimization"),
+    ),
+)
+
+
+# Skips validation: the content above is static and known to be valid
+_STATIC_PLAN: Final[DetailedPlan] = DetailedPlan.model_construct(phases=(_FOUNDATION_PHASE, _CORE_PHASE, _POLISH_PHASE))
+
+
+def _round_one_templates(agent_profiles: List[tuple[str, str]]) -> tuple[AgentOpinion, ...]:
+    return tuple(
+        AgentOpinion(agent=name, role=role, proposal="", concerns=_ROUND_ONE_CONCERNS)
+        for name, role in agent_profiles
+    )
+
+
+_DEFAULT_ROUND_ONE_TEMPLATES: Final = _round_one_templates(DEFAULT_AGENT_PROFILES)
+
 
 class DevelopmentCouncil:
     """Coordinates specialized agents to create a debated plan."""
 
     def __init__(self, agent_profiles: List[tuple[str, str]] | None = None) -> None:
         self.agent_profiles = agent_profiles or DEFAULT_AGENT_PROFILES
+        self._round_one_templates = (
+            _DEFAULT_ROUND_ONE_TEMPLATES
+            if self.agent_profiles is DEFAULT_AGENT_PROFILES
+            else _round_one_templates(self.agent_profiles)
+        )
 
     async def _round_one(self, spec: Specification) -> DebateRound:
+        proposal = f"Initial approach for goal '{spec.goal}'."
         opinions = [
-            AgentOpinion(
-                agent=name,
-                role=role,
-                proposal=f"Initial approach for goal '{spec.goal}'.",
-                concerns=["Validate dependencies", "Confirm hosting model"],
-            )
-            for name, role in self.agent_profiles
+            template.model_copy(update={"proposal": proposal}) for template in self._round_one_templates
         ]
         return DebateRound(topic="Initial approaches", opinions=opinions)
 
     async def _round_two(self, spec: Specification) -> DebateRound:
-        opinions = [
-            AgentOpinion(
-                agent="Security",
-                role="Vulnerability analysis",
-                proposal="Enforce input validation, CSP headers, and secrets management.",
-                concerns=["Add rate limiting", "Plan logging redaction"],
-            ),
-            AgentOpinion(
-                agent="Performance",
-                role="Scalability",
-                proposal="Prefer edge-friendly frameworks and lazy loading for heavy assets.",
-                concerns=["Budget cold start times", "Monitor lighthouse scores"],
-            ),
-        ]
-        return DebateRound(topic="Critique and risk analysis", opinions=opinions)
+        return _ROUND_TWO
 
     async def _round_three(self, spec: Specification) -> DebateRound:
-        opinions = [
-            AgentOpinion(
-                agent="Architect",
-                role="System design",
-                proposal="Adopt Next.js with TypeScript, Tailwind, and automated testing harness.",
-                concerns=["Confirm analytics SDK choices"],
-            )
-        ]
-        return DebateRound(topic="Consensus building", opinions=opinions)
+        return _ROUND_THREE
 
     async def _build_plan(self, spec: Specification) -> DetailedPlan:
-        foundation = PlanPhase(
-            name="Foundation",
-            steps=[
-                PlanStep(
-                    name="Initialize project",
-                    description="Bootstrap Next.js + TypeScript workspace with linting and formatting",
-                ),
-                PlanStep(
-                    name="Design system",
-                    description="Configure Tailwind theme based on brand preferences",
-                    requires_review=True,
-                ),
-                PlanStep(
-                    name="Testing harness",
-                    description="Install Jest, Testing Library, and Playwright for E2E coverage",
-                ),
-            ],
-        )
-
-        core_components = PlanPhase(
-            name="Core Components",
-            steps=[
-                PlanStep(name="Navbar", description="Responsive navigation with mobile drawer"),
-                PlanStep(name="Hero", description="Animated hero with CTA and optimized media", requires_review=True),
-                PlanStep(name="Features", description="Grid of differentiators with iconography"),
-                PlanStep(
-                    name="Social Proof",
-                    description="Testimonials and logo row sourced from structured content",
-                    verification=["Accessibility audit", "Visual regression"],
-                ),
-                PlanStep(name="Contact", description="Validated contact form with rate limiting", requires_review=True),
-            ],
-            verification=["Lighthouse >90", "WCAG 2.1 AA"],
-        )
-
-        polish = PlanPhase(
-            name="Polish & Optimization",
-            steps=[
-                PlanStep(name="Micro-interactions", description="Motion and hover states for delight"),
-                PlanStep(name="SEO", description="Meta tags, schema.org, and analytics events"),
-                PlanStep(name="Performance", description="Code splitting and asset optimization"),
-            ],
-        )
-
-        return DetailedPlan(phases=[foundation, core_components, polish])
+        return _STATIC_PLAN
 
     async def debate(self, spec: Specification) -> DebateResult:
         """Run three lightweight debate rounds and produce a plan and decision."""
 
-        rounds = [
-            await self._round_one(spec),
-            await self._round_two(spec),
-            await self._round_three(spec),
-        ]
-
-        decision = CouncilDecision(
-            consensus="Proceed with the proposed architecture and phased delivery plan.",
-            rationale=[
-                "Balances performance and security requirements",
-                "Aligns UX and accessibility goals with rapid iteration",
-            ],
-            dissent=["Validate integration specifics once user answers clarifying questions."],
+        # Rounds don't consume each other's output, so they can run side by side
+        rounds = list(
+            await asyncio.gather(
+                self._round_one(spec),
+                self._round_two(spec),
+                self._round_three(spec),
+            )
         )
 
-        return DebateResult(rounds=rounds, decision=decision)
+        return DebateResult(rounds=rounds, decision=_DECISION)
 
     async def produce_plan(self, spec: Specification) -> DetailedPlan:
         """Expose the consolidated plan after debate."""
 
-        await self.debate(spec)
-        return await self._build_plan(spec)
+        _, plan = await asyncio.gather(self.debate(spec), self._build_plan(spec))
+        return plan
 
     async def conduct_debate(self, prd: str) -> CouncilDebateResult:
         """Public API used by the backend endpoint to orchestrate three rounds of debate."""
@@ -166,8 +200,8 @@ class DevelopmentCouncil:
                     CouncilOpinion(
                         agent_role=f"{name} ({role})",
                         proposal=f"{topic}: {name} recommends aligning with the PRD focus.",
-                        concerns=["Validate dependencies", "Confirm timelines"] if round_number == 2 else [],
-                        recommendations=["Document assumptions", "Share architecture digest"],
+                        concerns=_RISK_ROUND_CONCERNS if round_number == 2 else (),
+                        recommendations=_COUNCIL_RECOMMENDATIONS,
                         confidence=0.7 + (round_number * 0.05),
                     )
                 )
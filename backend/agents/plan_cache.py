@@ -0,0 +1,124 @@
+"""Persistent cache of planner output keyed by the task goal.
+
+Planning is the most expensive call an agent makes for a new task, and
+many goals recur verbatim (templates, retries, demos). ``PlanCache``
+stores the parsed step descriptions for each goal in a small SQLite
+database so a repeated goal can skip the LLM entirely.
+
+Lookups first try an exact match on the normalized goal. When that
+misses, a cheap keyword-overlap score is computed against the stored
+goals and the best candidate above ``similarity_threshold`` is reused.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Stored next to tasks.json unless overridden (e.g. /tmp on read-only hosts)
+PLAN_CACHE_FILE = Path(
+    os.getenv("PLAN_CACHE_PATH", str(Path(__file__).resolve().parents[2] / "plan_cache.db"))
+)
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS plan_cache (
+    goal_hash TEXT PRIMARY KEY,
+    goal TEXT NOT NULL,
+    steps TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+)
+"""
+
+
+def normalize_goal(goal: str) -> str:
+    """Lowercase the goal and collapse whitespace."""
+    return " ".join(goal.lower().split())
+
+
+def goal_hash(goal: str) -> str:
+    """Return the cache key for a goal."""
+    return hashlib.sha256(normalize_goal(goal).encode("utf-8")).hexdigest()
+
+
+def _tokens(text: str) -> Set[str]:
+    return set(_TOKEN_RE.findall(text.lower()))
+
+
+def _keyword_overlap(a: Set[str], b: Set[str]) -> float:
+    """Jaccard similarity of two token sets."""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class PlanCache:
+    """SQLite-backed store mapping goals to previously generated plans."""
+
+    def __init__(self, path: Path = PLAN_CACHE_FILE, similarity_threshold: float = 0.9) -> None:
+        self.path = Path(path)
+        self.similarity_threshold = similarity_threshold
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        # One connection per cache, shared across threads behind ``_lock``
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+            conn.execute(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def get(self, goal: str) -> Optional[List[str]]:
+        """Return cached steps for the goal, or None on a miss."""
+        key = goal_hash(goal)
+        try:
+            with self._lock, self._connect() as conn:
+                row = conn.execute("SELECT steps FROM plan_cache WHERE goal_hash = ?", (key,)).fetchone()
+                if row is None and self.similarity_threshold < 1.0:
+                    row, key = self._closest(conn, goal)
+                if row is None:
+                    return None
+                conn.execute("UPDATE plan_cache SET hits = hits + 1 WHERE goal_hash = ?", (key,))
+            return json.loads(row[0])
+        except (sqlite3.Error, ValueError) as exc:
+            logger.warning("Plan cache lookup failed: %s", exc)
+            return None
+
+    def _closest(self, conn: sqlite3.Connection, goal: str):
+        wanted = _tokens(goal)
+        best_score, best = 0.0, (None, None)
+        for key, stored_goal, steps in conn.execute("SELECT goal_hash, goal, steps FROM plan_cache"):
+            score = _keyword_overlap(wanted, _tokens(stored_goal))
+            if score >= self.similarity_threshold and score > best_score:
+                best_score, best = score, ((steps,), key)
+        return best
+
+    def put(self, goal: str, steps: List[str]) -> None:
+        """Store the steps generated for a goal, replacing any previous entry."""
+        try:
+            with self._lock, self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO plan_cache (goal_hash, goal, steps, created_at, hits) "
+                    "VALUES (?, ?, ?, ?, 0)",
+                    (
+                        goal_hash(goal),
+                        normalize_goal(goal),
+                        json.dumps(steps),
+                        datetime.now(timezone.utc).isoformat(),
+                    ),
+                )
+        except sqlite3.Error as exc:
+            logger.warning("Plan cache write failed: %s", exc)
@@ -0,0 +1,107 @@
+"""Client-side request/token throttling for model API calls.
+
+Hitting a provider's rate limit costs a full round trip that returns
+nothing. ``RateLimiter`` keeps callers under requests-per-minute and
+tokens-per-minute budgets before a request is sent, in the style of the
+OpenAI cookbook's parallel request processor.
+
+Each budget is a leaky bucket: a request reserves capacity immediately and
+sleeps until the bucket has drained enough to admit it. On a 429 the
+allowed rate is halved; every success adds back 5% of the configured
+ceiling, so throughput settles just under the real limit.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import os
+import threading
+import time
+from typing import Any, Optional
+
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - optional dependency
+    tiktoken = None
+
+
+class _LeakyBucket:
+    def __init__(self, max_rate: float, time_period: float = 60.0) -> None:
+        self.max_rate = max_rate
+        self.rate = max_rate
+        self.time_period = time_period
+        self._level = 0.0
+        self._last = time.monotonic()
+
+    def reserve(self, amount: float) -> float:
+        """Add ``amount`` to the bucket and return how long to wait first."""
+        now = time.monotonic()
+        drain_per_second = self.rate / self.time_period
+        self._level = max(0.0, self._level - (now - self._last) * drain_per_second)
+        self._last = now
+        # A single request larger than the whole budget still gets through
+        overflow = self._level + min(amount, self.rate) - self.rate
+        self._level += amount
+        return max(0.0, overflow / drain_per_second)
+
+
+class RateLimiter:
+    """Requests-per-minute and tokens-per-minute budget shared by all callers."""
+
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float) -> None:
+        self._requests = _LeakyBucket(requests_per_minute)
+        self._tokens = _LeakyBucket(tokens_per_minute)
+        self._lock = threading.Lock()
+
+    def _reserve(self, tokens: int, requests: int) -> float:
+        with self._lock:
+            return max(self._requests.reserve(requests), self._tokens.reserve(tokens))
+
+    async def acquire(self, tokens: int, requests: int = 1) -> None:
+        delay = self._reserve(tokens, requests)
+        if delay:
+            await asyncio.sleep(delay)
+
+    def acquire_sync(self, tokens: int, requests: int = 1) -> None:
+        delay = self._reserve(tokens, requests)
+        if delay:
+            time.sleep(delay)
+
+    def on_rate_limited(self) -> None:
+        with self._lock:
+            for bucket in (self._requests, self._tokens):
+                bucket.rate = max(bucket.rate * 0.5, bucket.max_rate * 0.05)
+
+    def on_success(self) -> None:
+        with self._lock:
+            for bucket in (self._requests, self._tokens):
+                bucket.rate = min(bucket.max_rate, bucket.rate + bucket.max_rate * 0.05)
+
+
+# One budget for every OpenAI caller in the process (SuperBuilderAgent and
+# the /agent orchestrator draw on the same account limits)
+OPENAI_RATE_LIMITER = RateLimiter(
+    requests_per_minute=float(os.environ.get("OPENAI_RPM_LIMIT", "3000")),
+    tokens_per_minute=float(os.environ.get("OPENAI_TPM_LIMIT", "90000")),
+)
+
+
+@functools.lru_cache(maxsize=None)
+def _encoder(model: str) -> Any:
+    # Building an encoding loads its BPE merge table, so do it once per model
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("cl100k_base")
+
+
+def estimate_tokens(text: str, max_tokens: int = 0, model: Optional[str] = None) -> int:
+    """Token count of ``text`` plus the reply budget.
+
+    Exact when ``model`` is given and tiktoken is installed; otherwise a
+    rough four-characters-per-token estimate.
+    """
+    if model is not None and tiktoken is not None:
+        return len(_encoder(model).encode(text)) + max_tokens
+    return len(text) // 4 + 1 + max_tokens
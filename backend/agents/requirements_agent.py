@@ -2,87 +2,106 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, List
-import uuid
+from typing import Any, Dict, Final, List, Sequence, Tuple
+import itertools
+import os
+import sys
 
 from ..models import ClarifyingQuestion, RequirementsSession, Specification
 
 
-DEFAULT_QUESTION_BANK: List[ClarifyingQuestion] = [
-    ClarifyingQuestion(
-        prompt="Who is the target audience and what problem are we solving for them?",
-        category="audience",
-        priority=5,
-    ),
-    ClarifyingQuestion(
-        prompt="What is the primary call-to-action or success metric?",
-        category="success",
-        priority=5,
-    ),
-    ClarifyingQuestion(
-        prompt="Are there brand guidelines, visual preferences, or examples you admire?",
-        category="design",
-        priority=4,
-    ),
-    ClarifyingQuestion(
-        prompt="List must-have features and any nice-to-have additions.",
-        category="features",
-        priority=4,
-    ),
-    ClarifyingQuestion(
-        prompt="What performance, accessibility, or compliance requirements do we need to respect?",
-        category="quality",
-        priority=4,
-    ),
-    ClarifyingQuestion(
-        prompt="What integrations or data sources are required (analytics, CRM, payments, etc.)?",
-        category="integrations",
-        priority=3,
-    ),
-    ClarifyingQuestion(
-        prompt="Are there constraints around timeline, hosting, or technology choices?",
-        category="constraints",
-        priority=3,
-    ),
-]
+# (prompt, category, priority). Strings are interned so the frozen bank
+# questions share them with anything that compares against categories.
+_RAW_BANK = (
+    ("Who is the target audience and what problem are we solving for them?", "audience", 5),
+    ("What is the primary call-to-action or success metric?", "success", 5),
+    ("Are there brand guidelines, visual preferences, or examples you admire?", "design", 4),
+    ("List must-have features and any nice-to-have additions.", "features", 4),
+    ("What performance, accessibility, or compliance requirements do we need to respect?", "quality", 4),
+    ("What integrations or data sources are required (analytics, CRM, payments, etc.)?", "integrations", 3),
+    ("Are there constraints around timeline, hosting, or technology choices?", "constraints", 3),
+)
+
+DEFAULT_QUESTION_BANK: Final[Tuple[ClarifyingQuestion, ...]] = tuple(
+    ClarifyingQuestion(prompt=sys.intern(prompt), category=sys.intern(category), priority=priority)
+    for prompt, category, priority in _RAW_BANK
+)
+
+
+# Question ids only need to be unique for matching answers back to
+# questions, so a per-process counter stands in for uuid4 (which reads the
+# OS CSPRNG on every call). The shared bank questions carry the uuid given
+# at import, so each session's copies always get a fresh counter id.
+_qid_counter = itertools.count()
+_qid_prefix = f"{os.getpid():x}-"
+
+
+def _next_question_id() -> str:
+    return f"{_qid_prefix}{next(_qid_counter):x}"
+
+
+# Landing pages get an extra performance question ahead of the bank's
+# performance/quality question. The bank files that under "quality", so both
+# categories trigger it.
+_LANDING_PERF_Q: Final = ClarifyingQuestion(
+    prompt="Do we need lighthouse performance targets or CDN/edge delivery?",
+    category="performance",
+    priority=0,
+)
+_PERFORMANCE_CATEGORIES = frozenset({"performance", "quality"})
+
+_SORTED_DEFAULT_BANK: Final = tuple(sorted(DEFAULT_QUESTION_BANK, key=lambda q: q.priority, reverse=True))
 
 
 class RequirementsAgent:
     """Generates clarifying questions and aggregates them into a specification."""
 
-    def __init__(self, question_bank: List[ClarifyingQuestion] | None = None) -> None:
+    def __init__(self, question_bank: Sequence[ClarifyingQuestion] | None = None) -> None:
         self.question_bank = question_bank or DEFAULT_QUESTION_BANK
+        self._sorted_bank = (
+            _SORTED_DEFAULT_BANK
+            if self.question_bank is DEFAULT_QUESTION_BANK
+            else tuple(sorted(self.question_bank, key=lambda q: q.priority, reverse=True))
+        )
+        self._landing_extra = sum(1 for q in self._sorted_bank if q.category in _PERFORMANCE_CATEGORIES)
 
     async def generate_questions(self, initial_goal: str) -> List[ClarifyingQuestion]:
         """Return a prioritized list of questions tailored to the provided goal."""
 
-        goal_hint = initial_goal.lower()
+        return self._generate_questions_sync(initial_goal)
+
+    def _generate_questions_sync(self, initial_goal: str) -> List[ClarifyingQuestion]:
+        # No I/O happens here; internal callers use this directly rather than
+        # creating and awaiting a coroutine.
+        if "landing" not in initial_goal.lower():
+            return list(self._sorted_bank)
+
         customized: List[ClarifyingQuestion] = []
-        for question in sorted(self.question_bank, key=lambda q: q.priority, reverse=True):
-            if "landing" in goal_hint and question.category == "performance":
-                customized.append(
-                    ClarifyingQuestion(
-                        prompt="Do we need lighthouse performance targets or CDN/edge delivery?",
-                        category="performance",
-                        priority=question.priority,
-                    )
-                )
+        for question in self._sorted_bank:
+            if question.category in _PERFORMANCE_CATEGORIES:
+                customized.append(_LANDING_PERF_Q.model_copy(update={"priority": question.priority}))
             customized.append(question)
         return customized
 
     async def generate_clarifying_questions(self, initial_goal: str) -> List[ClarifyingQuestion]:
         """Return clarifying questions with stable identifiers for tracking answers."""
 
-        questions = await self.generate_questions(initial_goal)
+        # Single pass over the sorted bank: each question is copied once with
+        # its final id and priority (boosted by how many follow it).
+        is_landing = "landing" in initial_goal.lower()
+        remaining = len(self._sorted_bank) + (self._landing_extra if is_landing else 0)
         enriched: List[ClarifyingQuestion] = []
-        for idx, question in enumerate(questions, start=1):
-            enriched.append(
-                ClarifyingQuestion(
-                    id=question.id or str(uuid.uuid4()),
-                    prompt=question.prompt,
-                    category=question.category,
-                    priority=question.priority + (len(questions) - idx),
+        for question in self._sorted_bank:
+            if is_landing and question.category in _PERFORMANCE_CATEGORIES:
+                remaining -= 1
+                enriched.append(
+                    _LANDING_PERF_Q.model_copy(
+                        update={"id": _next_question_id(), "priority": question.priority + remaining}
+                    )
                 )
+            remaining -= 1
+            enriched.append(
+                question.model_copy(update={"id": _next_question_id(), "priority": question.priority + remaining})
             )
         return enriched
 
@@ -91,27 +110,30 @@ class RequirementsAgent:
     ) -> Dict[str, Any]:
         """Update the session specification based on an answer and generate follow-ups."""
 
-        spec = dict(session.specification) or {"goal": session.initial_goal, "notes": []}
-        question_obj = next((q for q in session.questions if q.id == question), None)
+        spec = (
+            dict(session.specification)
+            if session.specification
+            else {"goal": session.initial_goal, "notes": []}
+        )
+        question_obj = session.questions_by_id.get(question)
         category = question_obj.category if question_obj else "general"
 
         # Aggregate answers under their category
-        if category not in spec:
-            spec[category] = []
-        if isinstance(spec[category], list):
-            spec[category].append(answer)
+        bucket = spec.setdefault(category, [])
+        if isinstance(bucket, list):
+            bucket.append(answer)
         else:
-            spec[category] = [spec[category], answer]
+            spec[category] = [bucket, answer]
 
         spec.setdefault("notes", []).append(
             f"Q: {question_obj.prompt if question_obj else question}\nA: {answer}"
         )
 
         followup_questions: List[ClarifyingQuestion] = []
-        if "integration" in answer.lower() or category == "integrations":
+        if category == "integrations" or "integration" in answer.lower():
             followup_questions.append(
                 ClarifyingQuestion(
-                    id=str(uuid.uuid4()),
+                    id=_next_question_id(),
                     prompt="Which APIs or data sources should we prioritize integrating first?",
                     category="integrations",
                     priority=5,
@@ -123,24 +145,25 @@ class RequirementsAgent:
     async def gather_requirements(self, initial_goal: str) -> Specification:
         """Simulate gathering requirements and produce a structured specification."""
 
-        questions = await self.generate_questions(initial_goal)
+        questions = self._generate_questions_sync(initial_goal)
         notes = [f"Pending user input: {question.prompt}" for question in questions]
         return Specification(goal=initial_goal, notes=notes)
 
     async def generate_prd(self, session: RequirementsSession) -> str:
         """Create a lightweight PRD string from gathered specification data."""
 
-        lines = [f"Product Requirements for: {session.initial_goal}", ""]
+        parts: List[str] = [f"Product Requirements for: {session.initial_goal}", ""]
         for category, entries in session.specification.items():
             if category == "notes":
                 continue
-            lines.append(f"## {category.title()}")
+            parts.append(f"## {category.title()}")
             if isinstance(entries, list):
-                lines.extend([f"- {item}" for item in entries])
+                parts.extend(f"- {item}" for item in entries)
             else:
-                lines.append(f"- {entries}")
-            lines.append("")
-        if session.specification.get("notes"):
-            lines.append("## Notes")
-            lines.extend([f"- {n}" for n in session.specification["notes"]])
-        return "\n".join(lines)
+                parts.append(f"- {entries}")
+            parts.append("")
+        notes = session.specification.get("notes")
+        if notes:
+            parts.append("## Notes")
+            parts.extend(f"- {n}" for n in notes)
+        return "\n".join(parts)
@@ -0,0 +1,106 @@
+"""Persistent cache of model replies keyed by model and exact prompt.
+
+SuperBuilderAgent re-sends identical prompts across restarts (the same goal
+planned again, the same step of a re-run task). ``ResponseCache`` keeps the
+reply for each ``sha256(model | prompt)`` in SQLite so a repeat skips the
+API round trip. Entries expire after ``ttl_seconds`` so a cached answer
+does not outlive prompt or model changes indefinitely; expired rows are
+deleted when the cache is opened and every ``PURGE_EVERY_WRITES`` writes.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+RESPONSE_CACHE_FILE = Path(
+    os.getenv("RESPONSE_CACHE_PATH", str(Path(__file__).resolve().parents[2] / ".cache" / "responses.db"))
+)
+RESPONSE_CACHE_TTL_SECONDS = 7 * 24 * 3600
+PURGE_EVERY_WRITES = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    prompt_hash TEXT PRIMARY KEY,
+    reply TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_created_at ON responses (created_at);
+"""
+
+
+def prompt_hash(model: str, prompt: str) -> str:
+    """Return the cache key for a prompt sent to ``model``."""
+    return hashlib.sha256(f"{model}|{prompt}".encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """SQLite-backed store mapping prompt hashes to model replies."""
+
+    def __init__(self, path: Path = RESPONSE_CACHE_FILE, ttl_seconds: float = RESPONSE_CACHE_TTL_SECONDS) -> None:
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._writes = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        # One connection per cache, shared across threads behind ``_lock``
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+            # WAL lets the API process and the worker read while one writes
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+            self._delete_expired(conn)
+        return self._conn
+
+    def _delete_expired(self, conn: sqlite3.Connection) -> int:
+        with conn:
+            cursor = conn.execute("DELETE FROM responses WHERE created_at < ?", (time.time() - self.ttl_seconds,))
+        return cursor.rowcount
+
+    def purge_expired(self) -> int:
+        """Delete entries past the TTL and return how many were removed."""
+        try:
+            with self._lock:
+                return self._delete_expired(self._connect())
+        except sqlite3.Error as exc:
+            logger.warning("Response cache purge failed: %s", exc)
+            return 0
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached reply, or None on a miss or expired entry."""
+        try:
+            with self._lock, self._connect() as conn:
+                row = conn.execute(
+                    "SELECT reply FROM responses WHERE prompt_hash = ? AND created_at >= ?",
+                    (key, time.time() - self.ttl_seconds),
+                ).fetchone()
+        except sqlite3.Error as exc:
+            logger.warning("Response cache lookup failed: %s", exc)
+            return None
+        return row[0] if row else None
+
+    def put(self, key: str, reply: str) -> None:
+        """Store a reply, replacing any previous entry for the key."""
+        try:
+            with self._lock, self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses (prompt_hash, reply, created_at) VALUES (?, ?, ?)",
+                    (key, reply, time.time()),
+                )
+                self._writes += 1
+                if self._writes % PURGE_EVERY_WRITES == 0:
+                    self._delete_expired(conn)
+        except sqlite3.Error as exc:
+            logger.warning("Response cache write failed: %s", exc)
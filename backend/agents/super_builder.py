@@ -15,12 +15,23 @@ file system operations.
 
 from __future__ import annotations
 
-from typing import Dict, Any, List, Optional
-from datetime import datetime
+from collections import Counter
+from typing import AsyncIterator, Dict, Any, List, Optional, Tuple
+from functools import lru_cache
 
+import asyncio
+import hashlib
+import importlib.util
 import os
 import json
+import re
 import logging
+import time
+
+import httpx
+
+from .rate_limit import OPENAI_RATE_LIMITER, estimate_tokens
+from .response_cache import ResponseCache, prompt_hash
 from ..models import Step
 from ..utils import file_ops
 
@@ -29,9 +40,520 @@ try:
 except ImportError:
     openai = None
 
+# orjson parses and serializes several times faster than stdlib json; its
+# decode error subclasses json.JSONDecodeError, so callers catch either.
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+
+    def _json_dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode("utf-8")
+
+except ImportError:  # pragma: no cover - optional dependency
+    _json_loads = json.loads
+    _json_dumps = json.dumps
+
 
 logger = logging.getLogger(__name__)
 
+# Default field values of a fresh plan step, taken from the model once so
+# plan installation stays in sync with ``models.Step`` without validating
+# a model per step.
+_STEP_DEFAULTS: Dict[str, Any] = Step(description="").model_dump()
+
+# (step logs, task logs) for the step being advanced
+_Logs = Tuple[List[str], List[str]]
+
+_HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+_HTTP_TIMEOUT = httpx.Timeout(60.0, connect=5.0)
+# HTTP/2 lets concurrent requests share one TLS connection; httpx needs the
+# optional ``h2`` package (``pip install httpx[http2]``) for it.
+_HTTP2 = importlib.util.find_spec("h2") is not None
+
+
+_SYSTEM_PROMPT = "You are a helpful assistant that generates concise plans and execution logs."
+
+# Caps in-flight async completions so a burst of tasks stays under the
+# account's rate limit instead of failing and falling back.
+_OPENAI_CONCURRENCY = asyncio.Semaphore(int(os.environ.get("OPENAI_MAX_CONCURRENCY", "16")))
+
+_RATE_LIMITER = OPENAI_RATE_LIMITER
+
+# Replies to identical (model, prompt) pairs are reused across restarts
+_RESPONSE_CACHE = ResponseCache()
+
+# Multi-prompt requests need a completions (instruct) model, not a chat model
+_COMPLETIONS_MODEL = os.environ.get("OPENAI_COMPLETIONS_MODEL", "gpt-3.5-turbo-instruct")
+_BATCH_MAX_PROMPTS = 20
+
+# Opt-in: pre-generate step results for whole task lists through the Batch API
+_USE_BATCH_API = os.environ.get("OPENAI_BATCH_API", "").lower() in ("1", "true", "yes")
+_BATCH_FINAL_STATES = frozenset({"completed", "failed", "expired", "cancelled"})
+
+
+@lru_cache(maxsize=1)
+def _openai_api_key() -> Optional[str]:
+    """Return the API key, or None (with a warning) when OpenAI is unusable.
+
+    Resolved once per process, so the environment is not re-read and the
+    fallback warning is not repeated on every call.
+    """
+    if openai is None:
+        logger.warning("openai package is not installed; falling back to static planning")
+        return None
+    api_key = os.environ.get("OPENAI_API_KEY")
+    if not api_key:
+        logger.warning("OPENAI_API_KEY environment variable not set; falling back to static planning")
+        return None
+    return api_key
+
+
+@lru_cache(maxsize=1)
+def _openai_client(api_key: str) -> Any:
+    client = openai.OpenAI(
+        api_key=api_key,
+        http_client=openai.DefaultHttpxClient(limits=_HTTP_LIMITS, timeout=_HTTP_TIMEOUT, http2=_HTTP2),
+    )
+    _OPEN_CLIENTS.append(client)
+    return client
+
+
+@lru_cache(maxsize=1)
+def _async_openai_client(api_key: str) -> Any:
+    # One pooled client per process so concurrent tasks reuse connections
+    client = openai.AsyncOpenAI(
+        api_key=api_key,
+        http_client=openai.DefaultAsyncHttpxClient(limits=_HTTP_LIMITS, timeout=_HTTP_TIMEOUT, http2=_HTTP2),
+    )
+    _OPEN_CLIENTS.append(client)
+    return client
+
+
+_OPEN_CLIENTS: List[Any] = []
+
+
+async def aclose_clients() -> None:
+    """Close the pooled OpenAI connections, e.g. when the app shuts down."""
+    _openai_client.cache_clear()
+    _async_openai_client.cache_clear()
+    while _OPEN_CLIENTS:
+        client = _OPEN_CLIENTS.pop()
+        result = client.close()
+        if asyncio.iscoroutine(result):
+            await result
+
+
+def _forget_clients_after_fork() -> None:
+    # A forked worker (gunicorn/uvicorn --workers) must not share the
+    # parent's pooled sockets. Drop the inherited clients without closing
+    # them, since closing would tear down the parent's connections, and let
+    # each worker lazily build its own pool that it then reuses.
+    _openai_client.cache_clear()
+    _async_openai_client.cache_clear()
+    _OPEN_CLIENTS.clear()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_forget_clients_after_fork)
+
+
+@lru_cache(maxsize=None)
+def _system_prompt_tokens(model_name: str) -> int:
+    # The system prompt is the same on every chat request; count it once
+    return estimate_tokens(_SYSTEM_PROMPT, model=model_name)
+
+
+def _chat_tokens(model_name: str, prompt: str, max_tokens: int) -> int:
+    return _system_prompt_tokens(model_name) + estimate_tokens(prompt, max_tokens, model=model_name)
+
+
+def _chat_request(model_name: str, prompt: str, max_tokens: int) -> Dict[str, Any]:
+    return {
+        "model": model_name,
+        "messages": [
+            {"role": "system", "content": _SYSTEM_PROMPT},
+            {"role": "user", "content": prompt},
+        ],
+        "max_tokens": max_tokens,
+        "temperature": 0.5,
+        "n": 1,
+    }
+
+
+def _note_failure(exc: Exception) -> None:
+    if isinstance(exc, openai.RateLimitError):
+        _RATE_LIMITER.on_rate_limited()
+        logger.warning("OpenAI rate limit hit; throttling further requests")
+        return
+    logger.error("Error calling OpenAI API: %s", exc, exc_info=True)
+
+
+def _openai_completion(model_name: str, prompt: str, max_tokens: int = 256) -> Optional[str]:
+    """Invoke the OpenAI chat completions API with the given prompt.
+
+    If the ``openai`` package is not available or an API error occurs,
+    this function returns ``None``. The caller should handle a ``None``
+    response and implement a fallback strategy.
+    """
+    api_key = _openai_api_key()
+    if api_key is None:
+        return None
+    cache_key = prompt_hash(model_name, prompt)
+    cached = _RESPONSE_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
+    _RATE_LIMITER.acquire_sync(_chat_tokens(model_name, prompt, max_tokens))
+    try:
+        response = _openai_client(api_key).chat.completions.create(
+            **_chat_request(model_name, prompt, max_tokens)
+        )
+    except Exception as exc:  # noqa: BLE001
+        _note_failure(exc)
+        return None
+    _RATE_LIMITER.on_success()
+    reply = (response.choices[0].message.content or "").strip()
+    if reply:
+        _RESPONSE_CACHE.put(cache_key, reply)
+    return reply
+
+
+async def _aopenai_completion(model_name: str, prompt: str, max_tokens: int = 256) -> Optional[str]:
+    """Async counterpart of ``_openai_completion`` using the shared async client."""
+    api_key = _openai_api_key()
+    if api_key is None:
+        return None
+    cache_key = prompt_hash(model_name, prompt)
+    cached = await asyncio.to_thread(_RESPONSE_CACHE.get, cache_key)
+    if cached is not None:
+        return cached
+    await _RATE_LIMITER.acquire(_chat_tokens(model_name, prompt, max_tokens))
+    try:
+        async with _OPENAI_CONCURRENCY:
+            response = await _async_openai_client(api_key).chat.completions.create(
+                **_chat_request(model_name, prompt, max_tokens)
+            )
+    except Exception as exc:  # noqa: BLE001
+        _note_failure(exc)
+        return None
+    _RATE_LIMITER.on_success()
+    reply = (response.choices[0].message.content or "").strip()
+    if reply:
+        await asyncio.to_thread(_RESPONSE_CACHE.put, cache_key, reply)
+    return reply
+
+
+async def _astream_openai_completion(model_name: str, prompt: str, max_tokens: int = 256) -> AsyncIterator[str]:
+    """Yield the reply as text deltas as they arrive.
+
+    Yields nothing when OpenAI is unavailable or the request fails before
+    any text arrives, mirroring ``_aopenai_completion`` returning None. A
+    failure after some text was yielded is logged and re-raised, since the
+    reply so far is truncated.
+    """
+    api_key = _openai_api_key()
+    if api_key is None:
+        return
+    await _RATE_LIMITER.acquire(_chat_tokens(model_name, prompt, max_tokens))
+    yielded = False
+    try:
+        async with _OPENAI_CONCURRENCY:
+            stream = await _async_openai_client(api_key).chat.completions.create(
+                **_chat_request(model_name, prompt, max_tokens), stream=True
+            )
+            async for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    yielded = True
+                    yield delta
+    except Exception as exc:  # noqa: BLE001
+        _note_failure(exc)
+        if yielded:
+            raise
+        return
+    _RATE_LIMITER.on_success()
+
+
+async def _abatch_complete(prompts: List[str], max_tokens: int = 256) -> List[Optional[str]]:
+    """Complete several prompts with one request per ``_BATCH_MAX_PROMPTS``.
+
+    The chat endpoint takes a single conversation, so this uses the legacy
+    completions endpoint, which accepts a list of prompts and tags each
+    choice with the index of the prompt it answers. Entries that fail come
+    back as ``None``.
+    """
+    results: List[Optional[str]] = [None] * len(prompts)
+    api_key = _openai_api_key() if prompts else None
+    if api_key is None:
+        return results
+    client = _async_openai_client(api_key)
+    for offset in range(0, len(prompts), _BATCH_MAX_PROMPTS):
+        chunk = prompts[offset : offset + _BATCH_MAX_PROMPTS]
+        await _RATE_LIMITER.acquire(
+            sum(estimate_tokens(prompt, max_tokens, model=_COMPLETIONS_MODEL) for prompt in chunk)
+        )
+        try:
+            async with _OPENAI_CONCURRENCY:
+                response = await client.completions.create(
+                    model=_COMPLETIONS_MODEL,
+                    prompt=chunk,
+                    max_tokens=max_tokens,
+                    temperature=0.5,
+                )
+        except Exception as exc:  # noqa: BLE001
+            _note_failure(exc)
+            continue
+        _RATE_LIMITER.on_success()
+        for choice in response.choices:
+            results[offset + choice.index] = choice.text.strip()
+    return results
+
+
+def _plan_prompt(cleaned_goal: str) -> str:
+    return (
+        "You are an autonomous software development assistant tasked with "
+        "breaking down high-level goals into concrete, incremental steps.\n"
+        f"Goal: {cleaned_goal}\n"
+        "Provide a JSON array of step descriptions (strings). Each step should "
+        "be actionable and concise. Do not include numbering or any additional commentary."
+    )
+
+
+def _plan_and_first_step_prompt(cleaned_goal: str) -> str:
+    # Planning and step 1 are back-to-back dependent calls for a new task;
+    # asking for both at once saves a round trip.
+    return (
+        "You are an autonomous software development assistant tasked with "
+        "breaking down high-level goals into concrete, incremental steps and "
+        "then carrying out the first one.\n"
+        f"Goal: {cleaned_goal}\n"
+        'Respond with a JSON object {"plan": [...], "first_step_result": "..."}. '
+        '"plan" is an array of step descriptions (strings); each step should be '
+        "actionable and concise, without numbering. \"first_step_result\" is a brief "
+        "log entry describing what you did to carry out the first step. "
+        "Do not include any additional commentary."
+    )
+
+
+_TRAILING_COMMA_RE = re.compile(r",\s*([\]}])")
+
+
+def _loads_lenient(text: str) -> Any:
+    """Parse model output that is almost JSON.
+
+    Tries the reply as-is, then the outermost ``[...]``/``{...}`` span (which
+    drops markdown fences and surrounding prose) with trailing commas removed.
+    Raises ``json.JSONDecodeError`` when neither parses, so a salvageable
+    reply does not cost another planner call.
+    """
+    try:
+        return _json_loads(text)
+    except json.JSONDecodeError as exc:
+        error = exc
+    starts = [idx for idx in (text.find("["), text.find("{")) if idx >= 0]
+    if starts:
+        start = min(starts)
+        end = text.rfind("]" if text[start] == "[" else "}")
+        if end > start:
+            fragment = text[start : end + 1]
+            for candidate in (fragment, _TRAILING_COMMA_RE.sub(r"\1", fragment)):
+                try:
+                    return _json_loads(candidate)
+                except json.JSONDecodeError:
+                    pass
+    raise error
+
+
+def _parse_plan_and_first_step(assistant_reply: Optional[str]) -> Tuple[Optional[Tuple[str, ...]], Optional[str]]:
+    """Split a combined planner reply into (plan, first step result).
+
+    Replies that ignore the object format are still accepted as a bare plan.
+    """
+    if assistant_reply:
+        try:
+            reply = _loads_lenient(assistant_reply)
+        except json.JSONDecodeError:
+            reply = None
+        if isinstance(reply, dict):
+            plan = reply.get("plan")
+            first = reply.get("first_step_result")
+            if isinstance(plan, list) and plan and all(isinstance(item, str) for item in plan):
+                first = first.strip() if isinstance(first, str) else ""
+                return tuple(plan), first or None
+            return None, None
+    return _parse_plan(assistant_reply), None
+
+
+def _parse_plan(assistant_reply: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """Turn the planner's reply into step descriptions, or None if unusable."""
+    if assistant_reply:
+        try:
+            plan_list = _loads_lenient(assistant_reply)
+            if isinstance(plan_list, list) and all(isinstance(item, str) for item in plan_list):
+                return tuple(plan_list)
+        except json.JSONDecodeError:
+            lines = [line.strip("- ").strip() for line in assistant_reply.split("\n") if line.strip()]
+            if lines:
+                return tuple(lines)
+    return None
+
+
+# Successful plans memoized per (normalized goal, model) with a use count;
+# when full, the least frequently used plan is evicted so goals that recur
+# across sessions stay resident. Failures are never stored so a missing key
+# or transient API error is retried next time. Shared by the sync and async
+# planning paths.
+_PLAN_MEMO: Dict[bytes, List[Any]] = {}  # key -> [plan, hits]
+_PLAN_MEMO_SIZE = 1024
+
+
+def _plan_key(cleaned_goal: str, model_name: str) -> bytes:
+    normalized = " ".join(cleaned_goal.lower().split())
+    return hashlib.blake2b(f"{model_name}\0{normalized}".encode("utf-8"), digest_size=16).digest()
+
+
+def _memo_get(key: bytes) -> Optional[Tuple[str, ...]]:
+    entry = _PLAN_MEMO.get(key)
+    if entry is None:
+        return None
+    entry[1] += 1
+    return entry[0]
+
+
+def _memo_put(key: bytes, plan: Tuple[str, ...]) -> None:
+    entry = _PLAN_MEMO.get(key)
+    if entry is not None:
+        entry[0] = plan
+        return
+    if len(_PLAN_MEMO) >= _PLAN_MEMO_SIZE:
+        del _PLAN_MEMO[min(_PLAN_MEMO, key=lambda k: _PLAN_MEMO[k][1])]
+    _PLAN_MEMO[key] = [plan, 1]
+
+
+def _submit_batch(model_name: str, prompts: List[Tuple[str, int, str]]) -> Optional[str]:
+    """Submit ``(task_id, step_idx, prompt)`` triples as one OpenAI Batch job.
+
+    Batch jobs are billed at half price from a separate rate-limit pool and
+    finish within 24 hours. Returns the batch id, or None if submission
+    failed.
+    """
+    api_key = _openai_api_key() if prompts else None
+    if api_key is None:
+        return None
+    lines = [
+        _json_dumps(
+            {
+                "custom_id": f"{task_id}:{step_idx}",
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": _chat_request(model_name, prompt, 256),
+            }
+        )
+        for task_id, step_idx, prompt in prompts
+    ]
+    client = _openai_client(api_key)
+    try:
+        batch_file = client.files.create(
+            file=("steps.jsonl", "\n".join(lines).encode("utf-8")),
+            purpose="batch",
+        )
+        batch = client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+        )
+        return batch.id
+    except Exception as exc:  # noqa: BLE001
+        logger.error("Error submitting OpenAI batch: %s", exc, exc_info=True)
+        return None
+
+
+def _fetch_batch_results(batch_id: str) -> Optional[Dict[str, str]]:
+    """Return ``custom_id -> reply`` once the batch has ended, else None.
+
+    A batch that failed, expired or was cancelled yields whatever results
+    it produced (possibly none) so callers stop waiting on it.
+    """
+    api_key = _openai_api_key()
+    if api_key is None:
+        return {}
+    client = _openai_client(api_key)
+    try:
+        batch = client.batches.retrieve(batch_id)
+        if batch.status not in _BATCH_FINAL_STATES:
+            return None
+        results: Dict[str, str] = {}
+        if batch.output_file_id:
+            for line in client.files.content(batch.output_file_id).text.splitlines():
+                if not line.strip():
+                    continue
+                entry = _json_loads(line)
+                response = entry.get("response") or {}
+                if response.get("status_code") != 200:
+                    continue
+                content = response["body"]["choices"][0]["message"]["content"] or ""
+                results[entry["custom_id"]] = content.strip()
+        return results
+    except Exception as exc:  # noqa: BLE001
+        logger.error("Error fetching OpenAI batch %s: %s", batch_id, exc, exc_info=True)
+        return None
+
+
+# Goal shapes common enough to plan offline: a match expands straight into
+# steps without a planner round trip. ``_TEMPLATE_HITS`` counts expansions
+# per template so production hit rates can guide which shapes to add.
+_PLAN_TEMPLATES: Tuple[Tuple[str, "re.Pattern[str]", Tuple[str, ...]], ...] = (
+    (
+        "tests",
+        re.compile(r"(?i)^(?:write|add|create) (?:unit |integration )?tests? for (?P<subject>.+?)\.?$"),
+        (
+            "Identify the behaviour of {subject} that needs test coverage",
+            "Write test cases for {subject}, including edge cases and error paths",
+            "Run the test suite and fix any failures for {subject}",
+        ),
+    ),
+    (
+        "endpoint",
+        re.compile(r"(?i)^(?:build|create|add) an? (?:fastapi |rest |api |http )*endpoint (?:for|to) (?P<subject>.+?)\.?$"),
+        (
+            "Define the request and response models for {subject}",
+            "Implement the endpoint handler for {subject}",
+            "Add validation and error handling for {subject}",
+            "Write tests for the {subject} endpoint",
+        ),
+    ),
+    (
+        "bugfix",
+        re.compile(r"(?i)^fix (?:the |a )?(?:bug|issue|error|crash) (?:in|with) (?P<subject>.+?)\.?$"),
+        (
+            "Reproduce the problem in {subject}",
+            "Locate the root cause in {subject}",
+            "Implement the fix for {subject}",
+            "Add a regression test for {subject}",
+        ),
+    ),
+)
+_TEMPLATE_HITS: Counter = Counter()
+
+
+def _templated_plan(cleaned_goal: str) -> Optional[Tuple[str, ...]]:
+    for name, pattern, steps in _PLAN_TEMPLATES:
+        match = pattern.match(cleaned_goal)
+        if match:
+            _TEMPLATE_HITS[name] += 1
+            subject = match.group("subject")
+            return tuple(step.format(subject=subject) for step in steps)
+    return None
+
+
+@lru_cache(maxsize=1024)
+def _fallback_plan(cleaned_goal: str) -> Tuple[str, ...]:
+    return (
+        f"Analyze the goal: {cleaned_goal}",
+        f"Design and implement a solution for: {cleaned_goal}",
+        f"Test and review the solution for: {cleaned_goal}",
+    )
+
 
 class SuperBuilderAgent:
     """A minimal autonomous agent to execute tasks for the Super Builder.
@@ -53,38 +575,15 @@ class SuperBuilderAgent:
         """
         # Placeholder for future configuration
         self.model_name = os.environ.get("OPENAI_MODEL", "gpt-3.5-turbo")
+        self.use_batch_api = _USE_BATCH_API
 
     def _call_openai(self, prompt: str, max_tokens: int = 256) -> Optional[str]:
-        """Invoke the OpenAI ChatCompletion API with the given prompt.
+        """Invoke the OpenAI chat completions API with the configured model."""
+        return _openai_completion(self.model_name, prompt, max_tokens)
 
-        If the ``openai`` package is not available or an API error occurs,
-        this function returns ``None``. The caller should handle a ``None``
-        response and implement a fallback strategy.
-        """
-        if openai is None:
-            logger.warning("openai package is not installed; falling back to static planning")
-            return None
-        api_key = os.environ.get("OPENAI_API_KEY")
-        if not api_key:
-            logger.warning("OPENAI_API_KEY environment variable not set; falling back to static planning")
-            return None
-        try:
-            openai.api_key = api_key
-            response = openai.ChatCompletion.create(
-                model=self.model_name,
-                messages=[
-                    {"role": "system", "content": "You are a helpful assistant that generates concise plans and execution logs."},
-                    {"role": "user", "content": prompt},
-                ],
-                max_tokens=max_tokens,
-                temperature=0.5,
-                n=1,
-            )
-            content = response.choices[0].message["content"]
-            return content.strip()
-        except Exception as exc:  # noqa: BLE001
-            logger.error("Error calling OpenAI API: %s", exc, exc_info=True)
-            return None
+    async def _acall_openai(self, prompt: str, max_tokens: int = 256) -> Optional[str]:
+        """Async variant of ``_call_openai``; the event loop stays free while waiting."""
+        return await _aopenai_completion(self.model_name, prompt, max_tokens)
 
     def execute_task(self, task: Dict[str, Any]) -> Dict[str, Any]:
         """Execute a single step of the provided task.
@@ -96,12 +595,273 @@ class SuperBuilderAgent:
         fields are updated accordingly.
         """
         # Ensure the plan exists; if empty create a new plan
+        self._ensure_plan(task)
+
+        step = self._pending_step(task)
+        reply = None
+        if step is not None and not self._is_tool_step(step["description"]):
+            reply = self._take_batch_result(step)
+            if reply is None:
+                reply = self._call_openai(self._step_prompt(task, step), max_tokens=256)
+        return self._advance(task, reply)
+
+    async def aexecute_task(self, task: Dict[str, Any]) -> Dict[str, Any]:
+        """Async variant of ``execute_task``.
+
+        The planner and step prompts go through the shared async client, so
+        concurrent tasks overlap their network waits on one event loop.
+        """
+        await self._aensure_plan(task)
+
+        step = self._pending_step(task)
+        reply = None
+        if step is not None and not self._is_tool_step(step["description"]):
+            reply = self._take_batch_result(step)
+            if reply is None:
+                reply = await self._acall_openai(self._step_prompt(task, step), max_tokens=256)
+        return self._advance(task, reply)
+
+    async def astream_step(self, task: Dict[str, Any]) -> AsyncIterator[str]:
+        """Advance ``task`` by one step, yielding the reply text as it streams in.
+
+        Same step semantics as ``aexecute_task``. Tool steps and pre-fetched
+        batch results yield their result in one piece. The task is updated in
+        place once the reply is complete; if the stream breaks off part way,
+        the step is left pending so the next run retries it.
+        """
+        await self._aensure_plan(task)
+
+        step = self._pending_step(task)
+        reply = None
+        if step is not None and not self._is_tool_step(step["description"]):
+            reply = self._take_batch_result(step)
+            if reply is None:
+                parts: List[str] = []
+                try:
+                    async for delta in _astream_openai_completion(
+                        self.model_name, self._step_prompt(task, step), max_tokens=256
+                    ):
+                        parts.append(delta)
+                        yield delta
+                except Exception:  # noqa: BLE001 - logged by _astream_openai_completion
+                    task.setdefault("logs", []).append(
+                        f"Reply to step '{step['description']}' was interrupted; the step will be retried."
+                    )
+                    task["updated_at"] = time.time()
+                    return
+                reply = "".join(parts).strip() or None
+            else:
+                yield reply
+        self._advance(task, reply)
+        if step is not None and reply is None:
+            yield step.get("result") or ""
+
+    async def aexecute_all_steps(self, task: Dict[str, Any]) -> Dict[str, Any]:
+        """Run every remaining step of ``task`` and return it completed.
+
+        Step prompts carry only the goal and the step's own description, never
+        an earlier step's result, so all model-backed steps are requested at
+        once (still under the shared semaphore and rate limiter) and the wall
+        clock is roughly one round trip instead of one per step. Replies are
+        then applied in plan order, with tool steps running locally in place.
+        """
+        await self._aensure_plan(task)
+
+        start = int(task.get("current_step", 0))
+        pending = [
+            step
+            for step in task["plan"][start:]
+            if step.get("status") == "pending" and not self._is_tool_step(step["description"])
+        ]
+
+        async def reply_for(step: Dict[str, Any]) -> Optional[str]:
+            reply = self._take_batch_result(step)
+            if reply is None:
+                reply = await self._acall_openai(self._step_prompt(task, step), max_tokens=256)
+            return reply
+
+        replies = dict(zip(map(id, pending), await asyncio.gather(*map(reply_for, pending))))
+        now = time.time()
+        while (step := self._pending_step(task)) is not None:
+            self._advance(task, replies.get(id(step)), now)
+        # Covers an empty plan or one whose remaining steps were already done
+        return self._advance(task, None, now)
+
+    # A task planned with the static fallback (planner unreachable) carries
+    # this metadata key. While it is set, the next run asks the planner to
+    # continue from the current step, given what has been completed, instead
+    # of leaving the generic steps in place or re-planning from scratch.
+    _PLAN_CHECKPOINT = "plan_checkpoint"
+
+    def _ensure_plan(self, task: Dict[str, Any]) -> None:
         if not task.get("plan"):
-            plan_descriptions = self._create_plan(task.get("goal", ""))
-            task["plan"] = [Step(description=desc).dict() for desc in plan_descriptions]
-            task["status"] = "in_progress"
-            task["current_step"] = 0
+            self._install_plan(task, *self._create_plan(task.get("goal", "")))
+        elif self._needs_resume(task):
+            self._resume_plan(task, self._call_openai(self._resume_prompt(task), max_tokens=256))
+
+    async def _aensure_plan(self, task: Dict[str, Any]) -> None:
+        if not task.get("plan"):
+            self._install_plan(task, *(await self._acreate_plan(task.get("goal", ""))))
+        elif self._needs_resume(task):
+            self._resume_plan(task, await self._acall_openai(self._resume_prompt(task), max_tokens=256))
+
+    def _needs_resume(self, task: Dict[str, Any]) -> bool:
+        metadata = task.get("metadata")
+        if not isinstance(metadata, dict) or self._PLAN_CHECKPOINT not in metadata:
+            return False
+        if self._pending_step(task) is None:
+            # Nothing left to re-plan
+            del metadata[self._PLAN_CHECKPOINT]
+            return False
+        return True
+
+    @staticmethod
+    def _resume_prompt(task: Dict[str, Any]) -> str:
+        current = int(task.get("current_step", 0))
+        done = "\n".join(
+            f"{idx + 1}. {step['description']}: {(step.get('result') or '')[:200]}"
+            for idx, step in enumerate(task["plan"][:current])
+        )
+        return (
+            "You are an autonomous software development assistant resuming a plan "
+            "that was interrupted.\n"
+            f"Goal: {task.get('goal', '').strip() or 'the task'}\n"
+            f"Completed steps:\n{done or '(none)'}\n"
+            f"Continue planning from step {current + 1}. Provide a JSON array of the "
+            "remaining step descriptions (strings). Do not repeat completed steps, "
+            "and do not include numbering or any additional commentary."
+        )
+
+    def _resume_plan(self, task: Dict[str, Any], assistant_reply: Optional[str]) -> None:
+        """Replace the remaining fallback steps with the planner's continuation."""
+        remaining = _parse_plan(assistant_reply)
+        if remaining is None:
+            # Still unreachable: keep the checkpoint and the fallback steps
+            return
+        current = int(task.get("current_step", 0))
+        task["plan"][current:] = [{**_STEP_DEFAULTS, "description": desc, "logs": []} for desc in remaining]
+        del task["metadata"][self._PLAN_CHECKPOINT]
+        task.setdefault("logs", []).append(f"Resumed planning from step {current + 1}.")
+
+    def _install_plan(
+        self, task: Dict[str, Any], plan_descriptions: List[str], first_step_result: Optional[str] = None
+    ) -> None:
+        # Same shape as ``Step(description=desc).model_dump()`` without validating
+        # a throwaway model per step. ``logs`` is the only mutable default and
+        # gets a fresh list per step.
+        task["plan"] = [{**_STEP_DEFAULTS, "description": desc, "logs": []} for desc in plan_descriptions]
+        task["status"] = "in_progress"
+        task["current_step"] = 0
+        if first_step_result and not self._is_tool_step(plan_descriptions[0]):
+            # Picked up like a Batch API result, so step 0 needs no extra call
+            task["plan"][0]["metadata"] = {"batch_result": first_step_result}
+        if tuple(plan_descriptions) == _fallback_plan(task.get("goal", "").strip() or "the task"):
+            if not isinstance(task.get("metadata"), dict):
+                task["metadata"] = {}
+            task["metadata"][self._PLAN_CHECKPOINT] = {"failed_at_step": 0}
 
+    @staticmethod
+    def _take_batch_result(step: Dict[str, Any]) -> Optional[str]:
+        metadata = step.get("metadata")
+        if isinstance(metadata, dict):
+            return metadata.pop("batch_result", None)
+        return None
+
+    def submit_batch(self, tasks: List[Dict[str, Any]]) -> Optional[str]:
+        """Queue every model-backed pending step of ``tasks`` as one Batch job.
+
+        Tasks are planned first if needed. The batch id is stored in each
+        task's metadata; ``collect_batch`` later fills in the results, which
+        ``execute_task`` then uses instead of a live call. Tasks still waiting
+        on an earlier batch, and steps that already hold a result, are left
+        out so nothing is paid for twice.
+        """
+        prompts: List[Tuple[str, int, str]] = []
+        batched: List[Dict[str, Any]] = []
+        for task in tasks:
+            if (task.get("metadata") or {}).get("openai_batch_id"):
+                continue
+            self._ensure_plan(task)
+            start = len(prompts)
+            for idx, step in enumerate(task["plan"]):
+                if (
+                    step.get("status") == "pending"
+                    and not self._is_tool_step(step["description"])
+                    and "batch_result" not in (step.get("metadata") or {})
+                ):
+                    prompts.append((str(task.get("id")), idx, self._step_prompt(task, step)))
+            if len(prompts) > start:
+                batched.append(task)
+
+        batch_id = _submit_batch(self.model_name, prompts)
+        if batch_id:
+            submitted_at = time.time()
+            for task in batched:
+                metadata = task.setdefault("metadata", {})
+                metadata["openai_batch_id"] = batch_id
+                metadata["openai_batch_submitted_at"] = submitted_at
+                task.setdefault("logs", []).append(f"Submitted pending steps to OpenAI batch {batch_id}.")
+        return batch_id
+
+    def collect_batch(self, tasks: List[Dict[str, Any]]) -> bool:
+        """Copy finished batch results into step metadata.
+
+        Returns True once no task is waiting on a batch any more.
+        """
+        fetched: Dict[str, Optional[Dict[str, str]]] = {}
+        waiting = False
+        for task in tasks:
+            metadata = task.get("metadata") or {}
+            batch_id = metadata.get("openai_batch_id")
+            if not batch_id:
+                continue
+            if batch_id not in fetched:
+                fetched[batch_id] = _fetch_batch_results(batch_id)
+            results = fetched[batch_id]
+            if results is None:
+                waiting = True
+                continue
+            for idx, step in enumerate(task.get("plan") or []):
+                reply = results.get(f"{task.get('id')}:{idx}")
+                if reply is not None and step.get("status") == "pending":
+                    if not isinstance(step.get("metadata"), dict):
+                        step["metadata"] = {}
+                    step["metadata"]["batch_result"] = reply
+            del metadata["openai_batch_id"]
+            metadata.pop("openai_batch_submitted_at", None)
+        return not waiting
+
+    def _pending_step(self, task: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        current_index = int(task.get("current_step", 0))
+        if current_index < len(task["plan"]):
+            step = task["plan"][current_index]
+            if step.get("status") == "pending":
+                return step
+        return None
+
+    @classmethod
+    def _is_tool_step(cls, description: str) -> bool:
+        """True when ``_advance`` handles the step locally without the model."""
+        verb, argument = cls._split_command(description)
+        return verb == "list dir" or (verb in cls._TOOL_HANDLERS and argument is not None)
+
+    @staticmethod
+    def _step_prompt(task: Dict[str, Any], step: Dict[str, Any]) -> str:
+        return (
+            f"You are executing the following step as part of a build/planning task.\n"
+            f"Goal: {task.get('goal', '')}\n"
+            f"Step: {step['description']}\n\n"
+            "Please describe what actions you would take to perform this step and summarize the result concisely."
+        )
+
+    def _advance(
+        self, task: Dict[str, Any], assistant_reply: Optional[str], now: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Run the current pending step, using ``assistant_reply`` for non-tool steps.
+
+        ``now`` (epoch seconds) lets a caller advancing many steps or tasks in
+        one tick stamp them all with the same ``updated_at``.
+        """
         # Identify the current step index; default to 0 if missing
         current_index: int = int(task.get("current_step", 0))
 
@@ -109,121 +869,23 @@ class SuperBuilderAgent:
         if current_index < len(task["plan"]):
             step: Dict[str, Any] = task["plan"][current_index]
             if step.get("status") == "pending":
-                # Allow custom handling for specific command-like steps.
-                description_lower = step["description"].lower()
-                handled = False
-
-                # Read file
-                if description_lower.startswith("read file"):
-                    parts = step["description"].split(":", 1)
-                    if len(parts) == 2:
-                        relative_path = parts[1].strip()
-                        try:
-                            content = file_ops.read_file(relative_path)
-                            step["result"] = content
-                            step.setdefault("logs", []).append(f"Read {relative_path} successfully.")
-                            task.setdefault("logs", []).append(f"Read {relative_path} successfully.")
-                        except Exception as exc:
-                            error_msg = str(exc)
-                            step.setdefault("error", error_msg)
-                            step.setdefault("logs", []).append(f"Error reading {relative_path}: {error_msg}")
-                            task.setdefault("logs", []).append(f"Error reading {relative_path}: {error_msg}")
-                        handled = True
-
-                # Write file
-                elif description_lower.startswith("write file"):
-                    parts = step["description"].split(":", 1)
-                    if len(parts) == 2:
-                        relative_path = parts[1].strip()
-                        metadata = step.get("metadata", {})
-                        content = None
-                        if isinstance(metadata, dict):
-                            content = metadata.get("content")
-                        if content is None:
-                            error_msg = "No content provided in metadata for write file"
-                            step.setdefault("error", error_msg)
-                            step.setdefault("logs", []).append(f"Error writing {relative_path}: {error_msg}")
-                            task.setdefault("logs", []).append(f"Error writing {relative_path}: {error_msg}")
-                        else:
-                            try:
-                                file_ops.write_file(relative_path, content)
-                                step["result"] = f"Wrote content to {relative_path}"
-                                step.setdefault("logs", []).append(f"Wrote {relative_path} successfully.")
-                                task.setdefault("logs", []).append(f"Wrote {relative_path} successfully.")
-                            except Exception as exc:
-                                error_msg = str(exc)
-                                step.setdefault("error", error_msg)
-                                step.setdefault("logs", []).append(f"Error writing {relative_path}: {error_msg}")
-                                task.setdefault("logs", []).append(f"Error writing {relative_path}: {error_msg}")
-                        handled = True
-
-                # Diff file
-                elif description_lower.startswith("diff file"):
-                    parts = step["description"].split(":", 1)
-                    if len(parts) == 2:
-                        relative_path = parts[1].strip()
-                        metadata = step.get("metadata", {})
-                        new_content = None
-                        # accept both "content" and "new_content"
-                        if isinstance(metadata, dict):
-                            new_content = metadata.get("content") or metadata.get("new_content")
-                        if new_content is None:
-                            error_msg = "No new content provided in metadata for diff file"
-                            step.setdefault("error", error_msg)
-                            step.setdefault("logs", []).append(f"Error diffing {relative_path}: {error_msg}")
-                            task.setdefault("logs", []).append(f"Error diffing {relative_path}: {error_msg}")
-                        else:
-                            try:
-                                original_content = file_ops.read_file(relative_path)
-                            except Exception as exc:
-                                error_msg = str(exc)
-                                step.setdefault("error", error_msg)
-                                step.setdefault("logs", []).append(f"Error reading {relative_path}: {error_msg}")
-                                task.setdefault("logs", []).append(f"Error reading {relative_path}: {error_msg}")
-                            else:
-                                diff_lines = file_ops.diff_text(original_content, new_content)
-                                step["result"] = "\n".join(diff_lines)
-                                step.setdefault("logs", []).append(f"Generated diff for {relative_path}.")
-                                task.setdefault("logs", []).append(f"Generated diff for {relative_path}.")
-                        handled = True
-
-                # List directory
-                elif description_lower.startswith("list dir"):
-                    parts = step["description"].split(":", 1)
-                    # If a path is provided after the colon, use it; otherwise list the root
-                    relative_path = parts[1].strip() if len(parts) == 2 else ""
-                    try:
-                        entries = file_ops.list_dir(relative_path)
-                        step["result"] = json.dumps(entries)
-                        dir_label = relative_path if relative_path else "."
-                        step.setdefault("logs", []).append(f"Listed directory {dir_label} successfully.")
-                        task.setdefault("logs", []).append(f"Listed directory {dir_label} successfully.")
-                    except Exception as exc:
-                        error_msg = str(exc)
-                        dir_label = relative_path if relative_path else "."
-                        step.setdefault("error", error_msg)
-                        step.setdefault("logs", []).append(f"Error listing directory {dir_label}: {error_msg}")
-                        task.setdefault("logs", []).append(f"Error listing directory {dir_label}: {error_msg}")
-                    handled = True
+                # Bound once so each log line is two appends, not two
+                # setdefault lookups plus two appends
+                description = step["description"]
+                logs: _Logs = (step.setdefault("logs", []), task.setdefault("logs", []))
+
+                # Command-like steps ("read file: path", ...) run locally
+                verb, relative_path = self._split_command(description)
+                handler = self._TOOL_HANDLERS.get(verb)
+                handled = handler is not None and handler(self, step, relative_path, logs)
 
                 # Default: use OpenAI or fallback
                 if not handled:
-                    prompt = (
-                        f"You are executing the following step as part of a build/planning task.\n"
-                        f"Goal: {task.get('goal', '')}\n"
-                        f"Step: {step['description']}\n\n"
-                        "Please describe what actions you would take to perform this step and summarize the result concisely."
-                    )
-                    assistant_reply = self._call_openai(prompt, max_tokens=256)
-                    if assistant_reply:
-                        step.setdefault("logs", []).append(assistant_reply)
-                        step["result"] = assistant_reply
-                        task.setdefault("logs", []).append(assistant_reply)
-                    else:
-                        fallback = f"Executed step: {step['description']}"
-                        step.setdefault("logs", []).append(fallback)
-                        step["result"] = fallback
-                        task.setdefault("logs", []).append(fallback)
+                    result = assistant_reply or f"Executed step: {description}"
+                    # Kept in ``result`` and in the task log the UI shows; a
+                    # third copy in the step's own log only grew tasks.json
+                    logs[1].append(result)
+                    step["result"] = result
 
                 # Mark the step as completed and move to the next
                 step["status"] = "completed"
@@ -235,38 +897,198 @@ class SuperBuilderAgent:
             task["status"] = "completed"
         else:
             task["status"] = "in_progress"
-        task["updated_at"] = datetime.utcnow().isoformat()
+        # Epoch seconds; ``Task.updated_at`` parses this into a UTC datetime
+        # when the dict is validated, so no string formatting happens here.
+        task["updated_at"] = time.time() if now is None else now
 
         return task
 
-    def _create_plan(self, goal: str) -> List[str]:
-        """Generate a multi-step plan for the given task goal."""
+    # One scan yields the tool verb and its stripped argument (None without
+    # a colon). Words after the verb and before the colon are ignored, so
+    # "read file x: a.txt" reads a.txt.
+    _COMMAND_RE = re.compile(
+        r"(?is)\s*(?P<verb>read\s+file|write\s+file|diff\s+file|list\s+dir)[^:]*(?::\s*(?P<arg>.*?)\s*)?\Z"
+    )
+
+    @classmethod
+    def _split_command(cls, description: str) -> Tuple[str, Optional[str]]:
+        """Split ``"Read file: a.txt"`` into ``("read file", "a.txt")``.
+
+        Descriptions that are not tool commands give ``("", None)``.
+        """
+        match = cls._COMMAND_RE.match(description)
+        if match is None:
+            return "", None
+        return " ".join(match.group("verb").lower().split()), match.group("arg")
+
+    @staticmethod
+    def _log(logs: _Logs, message: str) -> None:
+        step_logs, task_logs = logs
+        step_logs.append(message)
+        task_logs.append(message)
+
+    def _fail(self, step: Dict[str, Any], logs: _Logs, message: str, error_msg: str) -> None:
+        step.setdefault("error", error_msg)
+        self._log(logs, f"{message}: {error_msg}")
+
+    # Tool handlers return True when they handled the step; a False return
+    # sends it to the model reply like any other step.
+
+    def _handle_read(self, step: Dict[str, Any], relative_path: Optional[str], logs: _Logs) -> bool:
+        if relative_path is None:
+            return False
+        try:
+            step["result"] = file_ops.read_file(relative_path)
+            self._log(logs, f"Read {relative_path} successfully.")
+        except Exception as exc:
+            self._fail(step, logs, f"Error reading {relative_path}", str(exc))
+        return True
+
+    def _handle_write(self, step: Dict[str, Any], relative_path: Optional[str], logs: _Logs) -> bool:
+        if relative_path is None:
+            return False
+        metadata = step.get("metadata")
+        content = metadata.get("content") if isinstance(metadata, dict) else None
+        if content is None:
+            self._fail(step, logs, f"Error writing {relative_path}", "No content provided in metadata for write file")
+            return True
+        try:
+            file_ops.write_file(relative_path, content)
+            step["result"] = f"Wrote content to {relative_path}"
+            self._log(logs, f"Wrote {relative_path} successfully.")
+        except Exception as exc:
+            self._fail(step, logs, f"Error writing {relative_path}", str(exc))
+        return True
+
+    def _handle_diff(self, step: Dict[str, Any], relative_path: Optional[str], logs: _Logs) -> bool:
+        if relative_path is None:
+            return False
+        metadata = step.get("metadata")
+        # accept both "content" and "new_content"
+        new_content = (
+            metadata.get("content") or metadata.get("new_content") if isinstance(metadata, dict) else None
+        )
+        if new_content is None:
+            self._fail(step, logs, f"Error diffing {relative_path}", "No new content provided in metadata for diff file")
+            return True
+        try:
+            original_content = file_ops.read_file(relative_path)
+        except Exception as exc:
+            self._fail(step, logs, f"Error reading {relative_path}", str(exc))
+            return True
+        step["result"] = "\n".join(file_ops.diff_text(original_content, new_content))
+        self._log(logs, f"Generated diff for {relative_path}.")
+        return True
+
+    def _handle_list(self, step: Dict[str, Any], relative_path: Optional[str], logs: _Logs) -> bool:
+        # If a path is provided after the colon, use it; otherwise list the root
+        relative_path = relative_path or ""
+        dir_label = relative_path or "."
+        try:
+            step["result"] = _json_dumps(file_ops.list_dir(relative_path))
+            self._log(logs, f"Listed directory {dir_label} successfully.")
+        except Exception as exc:
+            self._fail(step, logs, f"Error listing directory {dir_label}", str(exc))
+        return True
+
+    _TOOL_HANDLERS = {
+        "read file": _handle_read,
+        "write file": _handle_write,
+        "diff file": _handle_diff,
+        "list dir": _handle_list,
+    }
+
+    def _create_plan(self, goal: str) -> Tuple[List[str], Optional[str]]:
+        """Generate a multi-step plan for the given task goal.
+
+        Returns the plan and, when the planner was called, its result for the
+        first step (None otherwise).
+        """
         cleaned_goal = goal.strip() or "the task"
-        plan_prompt = (
-            "You are an autonomous software development assistant tasked with "
-            "breaking down high-level goals into concrete, incremental steps.\n"
-            f"Goal: {cleaned_goal}\n"
-            "Provide a JSON array of step descriptions (strings). Each step should "
-            "be actionable and concise. Do not include numbering or any additional commentary."
+        key = _plan_key(cleaned_goal, self.model_name)
+        plan = _memo_get(key) or _templated_plan(cleaned_goal)
+        if plan is not None:
+            return list(plan), None
+        plan, first_result = _parse_plan_and_first_step(
+            self._call_openai(_plan_and_first_step_prompt(cleaned_goal), max_tokens=512)
         )
-        assistant_reply = self._call_openai(plan_prompt, max_tokens=256)
-        if assistant_reply:
-            try:
-                plan_list = json.loads(assistant_reply)
-                if isinstance(plan_list, list) and all(isinstance(item, str) for item in plan_list):
-                    return plan_list
-            except json.JSONDecodeError:
-                lines = [line.strip("- ").strip() for line in assistant_reply.split("\n") if line.strip()]
-                if lines:
-                    return lines
-        # Fallback plan
-        return [
-            f"Analyze the goal: {cleaned_goal}",
-            f"Design and implement a solution for: {cleaned_goal}",
-            f"Test and review the solution for: {cleaned_goal}",
-        ]
+        if plan is None:
+            return list(_fallback_plan(cleaned_goal)), None
+        _memo_put(key, plan)
+        return list(plan), first_result
 
+    async def _acreate_plan(self, goal: str) -> Tuple[List[str], Optional[str]]:
+        """Async variant of ``_create_plan`` sharing the same memo."""
+        cleaned_goal = goal.strip() or "the task"
+        key = _plan_key(cleaned_goal, self.model_name)
+        plan = _memo_get(key) or _templated_plan(cleaned_goal)
+        if plan is not None:
+            return list(plan), None
+        plan, first_result = _parse_plan_and_first_step(
+            await self._acall_openai(_plan_and_first_step_prompt(cleaned_goal), max_tokens=512)
+        )
+        if plan is None:
+            return list(_fallback_plan(cleaned_goal)), None
+        _memo_put(key, plan)
+        return list(plan), first_result
+
+    async def aexecute_tasks(self, tasks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Advance several tasks by one step each, batching their model calls.
+
+        Tasks without a plan get their planner prompts sent together, and
+        every pending step that needs the model is answered from one more
+        shared request, so N tasks cost two HTTP requests instead of 2N.
+        """
+        # Tasks planned while the planner was unreachable resume side by side
+        await asyncio.gather(
+            *(self._aensure_plan(task) for task in tasks if task.get("plan") and self._needs_resume(task))
+        )
+        unplanned = [task for task in tasks if not task.get("plan")]
+        goals = [task.get("goal", "").strip() or "the task" for task in unplanned]
+        # Batched plans come from the instruct model, so they are memoized
+        # under it; a plan the chat model already made is still reused here
+        keys = {goal: _plan_key(goal, _COMPLETIONS_MODEL) for goal in goals}
+        known = {
+            goal: _memo_get(_plan_key(goal, self.model_name)) or _memo_get(key) or _templated_plan(goal)
+            for goal, key in keys.items()
+        }
+        # Goals differing only in case/whitespace share a key; ask once
+        missing = list({keys[goal]: goal for goal, plan in known.items() if plan is None}.values())
+        replies = await _abatch_complete([_plan_prompt(goal) for goal in missing])
+        for goal, reply in zip(missing, replies):
+            plan = _parse_plan(reply)
+            if plan is not None:
+                _memo_put(keys[goal], plan)
+        for task, goal in zip(unplanned, goals):
+            plan = known[goal] or _memo_get(keys[goal]) or _fallback_plan(goal)
+            self._install_plan(task, list(plan))
 
+        needs_model: List[Tuple[int, str]] = []
+        prefilled: Dict[int, str] = {}
+        for idx, task in enumerate(tasks):
+            step = self._pending_step(task)
+            if step is not None and not self._is_tool_step(step["description"]):
+                reply = self._take_batch_result(step)
+                if reply is None:
+                    needs_model.append((idx, self._step_prompt(task, step)))
+                else:
+                    prefilled[idx] = reply
+        step_replies: Dict[int, Optional[str]] = dict(
+            zip(
+                (idx for idx, _ in needs_model),
+                await _abatch_complete([prompt for _, prompt in needs_model]),
+            )
+        )
+        step_replies.update(prefilled)
+        now = time.time()
+        return [self._advance(task, step_replies.get(idx), now) for idx, task in enumerate(tasks)]
+
+
+@lru_cache(maxsize=None)
 def get_agent() -> SuperBuilderAgent:
-    """Factory function to obtain a SuperBuilderAgent."""
+    """Factory function to obtain a SuperBuilderAgent.
+
+    The agent is created once per process and shared by every request, like
+    the pooled OpenAI clients it calls through.
+    """
     return SuperBuilderAgent()
@@ -1,10 +1,16 @@
+import heapq
+import json
+import logging
 import os
+import time
 import uuid
-from datetime import datetime
-from typing import Any, Dict, Iterable, List, Optional
+from collections import defaultdict
+from itertools import islice
+from typing import Any, AsyncIterator, Dict, Iterable, List, MutableMapping, Optional
 
-from fastapi import Body, FastAPI, HTTPException, Query, WebSocket, WebSocketDisconnect
+from fastapi import Body, Depends, FastAPI, HTTPException, Query, Request, Response, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 import httpx
 import asyncio
 from pydantic import BaseModel
@@ -20,8 +26,10 @@ from backend.models import (
     MessageRequest,
     MessageResponse,
     RequirementsSession,
+    SessionState,
     Task,
     Project,
+    utcnow,
 )
 from backend.orchestrator import (
     AgentOrchestrationResponse,
@@ -31,22 +39,38 @@ from backend.orchestrator import (
 from backend.agents.requirements_agent import RequirementsAgent
 from backend.agents.council import DevelopmentCouncil
 from backend.storage import (
+    load_recent_tasks,
+    load_task,
+    load_task_records,
     load_tasks,
-    save_tasks,
+    next_task_id,
+    task_etag,
+    tasks_etag,
     upsert_task,
+    upsert_tasks,
     load_projects,
     save_projects,
     upsert_project,
     load_memory,
     save_memory,
 )
+from backend.agents.super_builder import aclose_clients as close_super_builder_clients
 from backend.agents.super_builder import get_agent as get_super_builder_agent
 from backend.agents.claude_agent import get_agent as get_claude_agent
-from backend.utils.file_ops import WORKSPACE_DIR, list_dir, read_file
+from backend.utils.file_ops import WORKSPACE_DIR, list_dir, path_version, read_file
+from backend.utils.ttl_cache import TTLCache
 from uuid import uuid4
 
+# Same optional encoder storage uses; the streamed routes fall back to json
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
 APP_VERSION = "0.2.0"
 
+logger = logging.getLogger(__name__)
+
 # --------------------------------------------------------------------------- #
 # Agent selection
 # --------------------------------------------------------------------------- #
@@ -67,6 +91,32 @@ def _get_agent():
     return get_super_builder_agent()
 
 
+async def _run_agent_step(agent: Any, task_payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Advance a task payload by one agent step without blocking the event loop.
+
+    Agents exposing ``aexecute_task`` are awaited directly; synchronous
+    agents run in a worker thread.
+    """
+    if hasattr(agent, "aexecute_task"):
+        return await agent.aexecute_task(task_payload)
+    return await asyncio.to_thread(agent.execute_task, task_payload)
+
+
+async def _run_agent_to_completion(agent: Any, task_payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Drive a task to a terminal status.
+
+    Agents exposing ``aexecute_all_steps`` run the remaining steps in one
+    call (overlapping their model requests); others are stepped in a loop.
+    """
+    if hasattr(agent, "aexecute_all_steps"):
+        return await agent.aexecute_all_steps(task_payload)
+    while task_payload.get("status") not in ("completed", "failed"):
+        task_payload = await _run_agent_step(agent, task_payload)
+    return task_payload
+
+
 # --------------------------------------------------------------------------- #
 # FastAPI app
 # --------------------------------------------------------------------------- #
@@ -89,17 +139,71 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# In-memory store for simple chat per session
-SESSIONS_STORE: Dict[str, List[Dict[str, str]]] = {}
-REQUIREMENTS_SESSIONS: Dict[str, RequirementsSession] = {}
-COUNCIL_DEBATES: Dict[str, CouncilDebateResult] = {}
+
+@app.on_event("shutdown")
+async def _close_model_clients() -> None:
+    await close_super_builder_clients()
+
+
+# In-memory store for simple chat per session. These live only in this
+# process, so entries idle for a day are dropped and the least recently used
+# go first once a store is full.
+_SESSION_TTL_SECONDS = 24 * 3600
+SESSIONS_STORE: MutableMapping[str, List[Dict[str, str]]] = TTLCache(maxsize=5000, ttl=_SESSION_TTL_SECONDS)
+REQUIREMENTS_SESSIONS: MutableMapping[str, RequirementsSession] = TTLCache(maxsize=1000, ttl=_SESSION_TTL_SECONDS)
+COUNCIL_DEBATES: MutableMapping[str, CouncilDebateResult] = TTLCache(maxsize=1000, ttl=_SESSION_TTL_SECONDS)
+# Oldest chat messages beyond this are dropped from a session
+_MAX_SESSION_MESSAGES = 500
+
+# Both agents are stateless between calls (their question bank and debate
+# templates are fixed at construction), so one instance serves every request.
+REQUIREMENTS_AGENT = RequirementsAgent()
+DEVELOPMENT_COUNCIL = DevelopmentCouncil()
+
+# Background step-run jobs started by POST /tasks/{task_id}/run/async
+RUN_JOBS: Dict[str, Dict[str, Any]] = {}
+_MAX_RUN_JOBS = 1000
+# Tasks driven at once by POST /tasks/run-all when the agent has no batch API
+_RUN_ALL_CONCURRENCY = int(os.environ.get("RUN_ALL_MAX_CONCURRENCY", "10"))
+# Reply text received so far for steps running via POST /tasks/{task_id}/run/stream,
+# keyed by task id, so status polls see progress before the step is saved
+STREAMING_REPLIES: Dict[str, List[str]] = {}
+# The event loop only keeps weak references to tasks; hold them until done
+_BACKGROUND_TASKS: set = set()
+
+
+def _spawn(coro: Any) -> None:
+    task = asyncio.create_task(coro)
+    _BACKGROUND_TASKS.add(task)
+    task.add_done_callback(_BACKGROUND_TASKS.discard)
+
 
 # Load memory from disk on startup
 MEMORY_STORE: dict[str, MemoryItem] = {}
+# Lowercased "content tags" text of each memory item, plus an index from
+# every three-character substring of it to the item ids containing it. A
+# search only checks the items that contain all of the query's trigrams,
+# instead of lowering and scanning every item.
+_MEMORY_HAYSTACKS: dict[str, str] = {}
+_MEMORY_TRIGRAMS: defaultdict[str, set[str]] = defaultdict(set)
+
+
+def _trigrams(text: str) -> set[str]:
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+def _index_memory_item(item: MemoryItem) -> None:
+    haystack = " ".join([item.content] + item.tags).lower()
+    _MEMORY_HAYSTACKS[item.id] = haystack
+    for gram in _trigrams(haystack):
+        _MEMORY_TRIGRAMS[gram].add(item.id)
+
+
 try:
     _loaded_memory = load_memory()
     for item in _loaded_memory:
         MEMORY_STORE[item.id] = item
+        _index_memory_item(item)
 except Exception as e:
     print(f"Failed to load memory: {e}")
 
@@ -178,18 +282,74 @@ def _ensure_session(session_id: str) -> None:
 
 
 def _find_task(task_id: str) -> Task:
-    tasks = load_tasks()
-    for t in tasks:
-        if str(t.id) == str(task_id):
-            return t
+    """Look up a task or raise 404.
+
+    Also used as ``Depends(_find_task)`` by the ``{task_id}`` routes; FastAPI
+    runs it in its threadpool, so the lookup never blocks the event loop.
+    """
+    task = load_task(str(task_id))
+    if task is not None:
+        return task
     raise HTTPException(status_code=404, detail=f"Task {task_id} not found")
 
 
+def _check_etag(request: Request, response: Response, etag: str) -> str:
+    """Answer 304 if the client already holds ``etag``, else tag the response.
+
+    Returns the quoted tag for handlers that build their own response.
+    """
+    etag = f'"{etag}"'
+    known = {tag.strip().removeprefix("W/") for tag in request.headers.get("if-none-match", "").split(",")}
+    if etag in known or "*" in known:
+        raise HTTPException(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return etag
+
+
+def _check_task_etag(task_id: str, request: Request, response: Response) -> Optional[str]:
+    """Conditional-GET check for the ``{task_id}`` read routes.
+
+    Runs ahead of ``_find_task`` so an unchanged task is never loaded.
+    Unknown ids pass through to its 404.
+    """
+    etag = task_etag(str(task_id))
+    return _check_etag(request, response, etag) if etag is not None else None
+
+
+def _check_path_etag(request: Request, response: Response, path: str) -> None:
+    # Missing or out-of-workspace paths are left to the handler's 404/400
+    try:
+        etag = path_version(path)
+    except (FileNotFoundError, ValueError):
+        return
+    _check_etag(request, response, etag)
+
+
 def _update_and_save_task(updated_task: Task) -> Task:
     upsert_task(updated_task)
     return updated_task
 
 
+def _json(value: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(value, default=str)
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+
+
+async def _json_array(items: Iterable[Any], chunk_size: int = 256) -> AsyncIterator[bytes]:
+    """Encode ``items`` as a JSON array, yielding it ``chunk_size`` items at a time.
+
+    Each chunk is encoded in one call, with its brackets stripped, rather
+    than item by item.
+    """
+    items = iter(items)
+    sep = b"["
+    while chunk := list(islice(items, chunk_size)):
+        yield sep + _json(chunk)[1:-1]
+        sep = b","
+    yield b"]" if sep == b"," else b"[]"
+
+
 def add_memory_item(
     content: str,
     task_id: str | None = None,
@@ -202,30 +362,41 @@ def add_memory_item(
         content=content,
         tags=tags or [],
         importance=importance,
-        created_at=datetime.utcnow(),
+        created_at=utcnow(),
         last_used_at=None,
     )
     MEMORY_STORE[mem.id] = mem
+    _index_memory_item(mem)
     save_memory(list(MEMORY_STORE.values()))
     return mem
 
 
-def list_memory_items(task_id: str | None = None) -> list[MemoryItem]:
+def list_memory_items(task_id: str | None = None, limit: int | None = None) -> list[MemoryItem]:
     items: Iterable[MemoryItem] = MEMORY_STORE.values()
     if task_id is not None:
-        items = [m for m in items if m.task_id == task_id or m.task_id is None]
+        items = (m for m in items if m.task_id == task_id or m.task_id is None)
+    if limit is not None:
+        # Same result as sorting and slicing, without sorting every item
+        return heapq.nlargest(limit, items, key=lambda m: m.created_at)
     return sorted(items, key=lambda m: m.created_at, reverse=True)
 
 
 def search_memory_items(query: str, task_id: str | None = None) -> list[MemoryItem]:
     query_lower = query.lower()
-    items = list_memory_items(task_id=task_id)
-    results: list[MemoryItem] = []
-    for item in items:
-        haystack = " ".join([item.content] + item.tags).lower()
-        if query_lower in haystack:
-            results.append(item)
-    return results
+    grams = _trigrams(query_lower)
+    if grams:
+        # Smallest posting list first keeps the intersection cheap
+        postings = sorted((_MEMORY_TRIGRAMS.get(gram, set()) for gram in grams), key=len)
+        candidates: Iterable[str] = set.intersection(*postings)
+    else:
+        candidates = list(_MEMORY_HAYSTACKS)
+    results = [
+        MEMORY_STORE[mem_id]
+        for mem_id in candidates
+        if query_lower in _MEMORY_HAYSTACKS[mem_id]
+        and (task_id is None or MEMORY_STORE[mem_id].task_id in (task_id, None))
+    ]
+    return sorted(results, key=lambda m: m.created_at, reverse=True)
 
 
 # --------------------------------------------------------------------------- #
@@ -251,7 +422,7 @@ class MemoryCreateRequest(BaseModel):
 
 
 @app.post("/memory", response_model=MemoryItem)
-async def create_memory(payload: MemoryCreateRequest = Body(...)) -> MemoryItem:
+def create_memory(payload: MemoryCreateRequest = Body(...)) -> MemoryItem:
     """
     Create a new memory item. Used when the user clicks 'Save to memory'
     from the UI.
@@ -291,7 +462,7 @@ async def start_requirements_gathering(request: Dict[str, str]):
     if not goal.strip():
         raise HTTPException(status_code=400, detail="Goal cannot be empty")
 
-    agent = RequirementsAgent()
+    agent = REQUIREMENTS_AGENT
     questions = await agent.generate_clarifying_questions(goal)
 
     session = RequirementsSession(
@@ -307,7 +478,7 @@ async def start_requirements_gathering(request: Dict[str, str]):
     return {
         "session_id": session.session_id,
         "goal": goal,
-        "questions": [q.dict() for q in questions],
+        "questions": [q.model_dump() for q in questions],
         "total_questions": len(questions),
     }
 
@@ -323,7 +494,7 @@ async def submit_answer(session_id: str, submission: AnswerSubmission):
         raise HTTPException(status_code=404, detail="Session not found")
 
     session = REQUIREMENTS_SESSIONS[session_id]
-    agent = RequirementsAgent()
+    agent = REQUIREMENTS_AGENT
 
     result = await agent.process_answer(
         question=submission.question_id, answer=submission.answer, session=session
@@ -333,7 +504,7 @@ async def submit_answer(session_id: str, submission: AnswerSubmission):
         {
             "question_id": submission.question_id,
             "answer": submission.answer,
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": utcnow().isoformat(),
         }
     )
     session.specification = result["specification"]
@@ -350,7 +521,7 @@ async def submit_answer(session_id: str, submission: AnswerSubmission):
     return {
         "session_id": session_id,
         "specification": session.specification,
-        "followup_questions": [q.dict() for q in followup_questions],
+        "followup_questions": [q.model_dump() for q in followup_questions],
         "progress": {
             "answered": answered_count,
             "total": total_count,
@@ -370,7 +541,7 @@ async def finalize_requirements(session_id: str):
         raise HTTPException(status_code=404, detail="Session not found")
 
     session = REQUIREMENTS_SESSIONS[session_id]
-    agent = RequirementsAgent()
+    agent = REQUIREMENTS_AGENT
 
     prd = await agent.generate_prd(session)
 
@@ -395,7 +566,7 @@ async def get_requirements_session(session_id: str):
     return {
         "session_id": session.session_id,
         "goal": session.initial_goal,
-        "questions": [q.dict() for q in session.questions],
+        "questions": [q.model_dump() for q in session.questions],
         "answers": session.answers,
         "specification": session.specification,
         "progress": {
@@ -417,7 +588,7 @@ async def start_council_debate(request: CouncilDebateRequest):
     This is a long-running operation that conducts 3 rounds of debate.
     """
 
-    council = DevelopmentCouncil()
+    council = DEVELOPMENT_COUNCIL
     debate_id = str(uuid.uuid4())
 
     try:
@@ -442,9 +613,12 @@ async def start_council_debate(request: CouncilDebateRequest):
 
 
 @app.get("/council/debate/{debate_id}", response_model=Dict[str, Any])
-async def get_debate_details(debate_id: str):
+async def get_debate_details(debate_id: str) -> StreamingResponse:
     """
     Get detailed information about a council debate.
+
+    The rounds are encoded and sent one at a time rather than building the
+    whole document first.
     """
 
     if debate_id not in COUNCIL_DEBATES:
@@ -452,29 +626,32 @@ async def get_debate_details(debate_id: str):
 
     result = COUNCIL_DEBATES[debate_id]
 
-    return {
-        "debate_id": debate_id,
-        "prd": result.prd,
-        "rounds": [
-            {
-                "round_number": r.round_number,
-                "topic": r.topic,
-                "opinions": [
-                    {
-                        "agent": o.agent_role,
-                        "proposal": o.proposal,
-                        "concerns": o.concerns,
-                        "recommendations": o.recommendations,
-                        "confidence": o.confidence,
-                    }
-                    for o in r.opinions
-                ],
-            }
-            for r in result.rounds
-        ],
-        "final_architecture": result.final_architecture,
-        "consensus_reached": result.consensus_reached,
-    }
+    def _round(r: Any) -> Dict[str, Any]:
+        return {
+            "round_number": r.round_number,
+            "topic": r.topic,
+            "opinions": [
+                {
+                    "agent": o.agent_role,
+                    "proposal": o.proposal,
+                    "concerns": o.concerns,
+                    "recommendations": o.recommendations,
+                    "confidence": o.confidence,
+                }
+                for o in r.opinions
+            ],
+        }
+
+    async def _body() -> AsyncIterator[bytes]:
+        yield b'{"debate_id":' + _json(debate_id) + b',"prd":' + _json(result.prd) + b',"rounds":'
+        async for chunk in _json_array(_round(r) for r in result.rounds):
+            yield chunk
+        yield (
+            b',"final_architecture":' + _json(result.final_architecture)
+            + b',"consensus_reached":' + _json(result.consensus_reached) + b"}"
+        )
+
+    return StreamingResponse(_body(), media_type="application/json")
 
 
 # --------------------------------------------------------------------------- #
@@ -493,21 +670,19 @@ async def create_task_with_council(request: Dict[str, Any]):
         raise HTTPException(status_code=400, detail="Goal is required")
 
     if "prd" not in request:
-        req_agent = RequirementsAgent()
+        req_agent = REQUIREMENTS_AGENT
         questions = await req_agent.generate_clarifying_questions(request["goal"])
 
         return {
             "step": "requirements",
             "message": "Please answer these questions first",
-            "questions": [q.dict() for q in questions],
+            "questions": [q.model_dump() for q in questions],
         }
 
-    council = DevelopmentCouncil()
+    council = DEVELOPMENT_COUNCIL
     debate_result = await council.conduct_debate(request["prd"])
 
-    tasks = load_tasks()
-    numeric_ids = [int(t.id) for t in tasks if str(t.id).isdigit()]
-    next_id = str(max(numeric_ids) + 1) if numeric_ids else str(uuid.uuid4())
+    next_id = await asyncio.to_thread(next_task_id)
 
     task = Task(
         id=next_id,
@@ -528,8 +703,7 @@ async def create_task_with_council(request: Dict[str, Any]):
         },
     )
 
-    tasks.append(task)
-    save_tasks(tasks)
+    await asyncio.to_thread(upsert_task, task)
 
     return task
 
@@ -539,7 +713,7 @@ async def create_task_with_council(request: Dict[str, Any]):
 # --------------------------------------------------------------------------- #
 
 @app.get("/projects", response_model=List[Project])
-async def list_projects() -> List[Project]:
+def list_projects() -> List[Project]:
     """
     List all projects.
     """
@@ -550,7 +724,7 @@ class CreateProjectRequest(BaseModel):
     description: Optional[str] = None
 
 @app.post("/projects", response_model=Project)
-async def create_project(request: CreateProjectRequest) -> Project:
+def create_project(request: CreateProjectRequest) -> Project:
     """
     Create a new project.
     """
@@ -562,7 +736,7 @@ async def create_project(request: CreateProjectRequest) -> Project:
     return project
 
 @app.get("/projects/{project_id}", response_model=Project)
-async def get_project(project_id: str) -> Project:
+def get_project(project_id: str) -> Project:
     """
     Get a specific project by ID.
     """
@@ -573,12 +747,12 @@ async def get_project(project_id: str) -> Project:
     raise HTTPException(status_code=404, detail="Project not found")
 
 @app.get("/projects/{project_id}/tasks", response_model=List[Task])
-async def get_project_tasks(project_id: str) -> List[Task]:
+def get_project_tasks(project_id: str) -> List[Task]:
     """
     Get all tasks for a specific project.
     """
-    tasks = load_tasks()
-    return [t for t in tasks if t.project_id == project_id]
+    # Filter the raw records so only this project's tasks are validated
+    return [Task(**record) for record in load_task_records() if record.get("project_id") == project_id]
 
 
 # --------------------------------------------------------------------------- #
@@ -587,13 +761,11 @@ async def get_project_tasks(project_id: str) -> List[Task]:
 
 
 @app.get("/execution/{task_id}/status", response_model=Dict[str, Any])
-async def get_execution_status(task_id: str):
+async def get_execution_status(task_id: str, task: Task = Depends(_find_task)):
     """
     Get real-time execution status with verification results.
     """
 
-    task = _find_task(task_id)
-
     return {
         "task_id": task_id,
         "status": task.status,
@@ -601,6 +773,8 @@ async def get_execution_status(task_id: str):
         "total_steps": len(task.plan),
         "progress_percentage": (task.current_step / len(task.plan) * 100) if task.plan else 0,
         "recent_logs": task.logs[-10:] if task.logs else [],
+        # Text of a step reply still being streamed, None when idle
+        "streaming_reply": "".join(STREAMING_REPLIES[task_id]) if task_id in STREAMING_REPLIES else None,
         "verification_results": task.metadata.get("verification_results", [])
         if hasattr(task, "metadata")
         else [],
@@ -613,10 +787,11 @@ async def get_execution_status(task_id: str):
 
 
 @app.get("/health")
-def health() -> Dict[str, Any]:
+async def health(response: Response) -> Dict[str, Any]:
     """
     Simple health check including current agent mode and workspace path.
     """
+    response.headers["Cache-Control"] = "public, max-age=5"
     return {
         "status": "ok",
         "version": APP_VERSION,
@@ -625,6 +800,18 @@ def health() -> Dict[str, Any]:
     }
 
 
+@app.get("/debug/cache")
+async def cache_stats() -> Dict[str, Any]:
+    """
+    Size and hit/miss counts of the in-memory session stores.
+    """
+    return {
+        "sessions": SESSIONS_STORE.stats(),
+        "requirements_sessions": REQUIREMENTS_SESSIONS.stats(),
+        "council_debates": COUNCIL_DEBATES.stats(),
+    }
+
+
 # --------------------------------------------------------------------------- #
 # AI Orchestration (ChatGPT + Claude)
 # --------------------------------------------------------------------------- #
@@ -635,6 +822,26 @@ class AgentChatRequest(BaseModel):
     messages: List[ConversationMessage]
 
 
+def _merge_chat_history(stored: List[Message], incoming: List[ConversationMessage]) -> bool:
+    """Bring a task's saved messages in line with the history a client sent.
+
+    Clients resend the whole conversation each turn. When the saved messages
+    are a prefix of it only the new tail is appended, keeping the ids and
+    timestamps already stored; any other history (edited or reset on the
+    client) replaces them. Returns whether anything changed.
+    """
+    same_prefix = len(stored) <= len(incoming) and all(
+        old.role == new.role and old.content == new.content for old, new in zip(stored, incoming)
+    )
+    if same_prefix:
+        if len(stored) == len(incoming):
+            return False
+        stored.extend(Message(role=m.role, content=m.content) for m in incoming[len(stored):])
+    else:
+        stored[:] = [Message(role=m.role, content=m.content) for m in incoming]
+    return True
+
+
 @app.post("/agent", response_model=AgentOrchestrationResponse)
 async def agent_chat(request: AgentChatRequest) -> AgentOrchestrationResponse:
     """
@@ -645,17 +852,18 @@ async def agent_chat(request: AgentChatRequest) -> AgentOrchestrationResponse:
     so chats are persisted across refreshes.
     """
     messages_for_llm: List[ConversationMessage] = []
+    now = utcnow()
 
     if request.task_id is not None:
         task_id_str = str(request.task_id)
-        relevant_memory = list_memory_items(task_id=task_id_str)[:10]
+        relevant_memory = list_memory_items(task_id=task_id_str, limit=10)
 
         memory_preamble = ""
         if relevant_memory:
             memory_lines = []
             for item in relevant_memory:
                 memory_lines.append(f"- {item.content}")
-                item.last_used_at = datetime.utcnow()
+                item.last_used_at = now
             memory_preamble = (
                 "Here are important notes and context you should remember about this user and task:\n"
                 + "\n".join(memory_lines)
@@ -671,15 +879,10 @@ async def agent_chat(request: AgentChatRequest) -> AgentOrchestrationResponse:
 
     # ✅ Save the incoming messages immediately so we don't lose user input if LLM fails
     if request.task_id is not None:
-        tasks = load_tasks()
-        for task in tasks:
-            if str(task.id) == str(request.task_id):
-                task.messages = [
-                    Message(**m.model_dump()) for m in request.messages
-                ]
-                task.updated_at = datetime.utcnow()
-                upsert_task(task)
-                break
+        task = await asyncio.to_thread(load_task, str(request.task_id))
+        if task is not None and _merge_chat_history(task.messages, request.messages):
+            task.updated_at = now
+            await asyncio.to_thread(upsert_task, task)
 
     try:
         response = await orchestrate(messages_for_llm)
@@ -688,27 +891,26 @@ async def agent_chat(request: AgentChatRequest) -> AgentOrchestrationResponse:
 
     # ✅ Persist the assistant reply
     if request.task_id is not None:
-        tasks = load_tasks()
-        for task in tasks:
-            if str(task.id) == str(request.task_id):
-                # We append the new assistant message to the existing ones
-                task.messages.append(
-                    Message(
-                        id=str(uuid.uuid4()),
-                        role="assistant",
-                        content=response.reply,
-                        created_at=datetime.utcnow(),
-                    )
+        replied_at = utcnow()
+        task = await asyncio.to_thread(load_task, str(request.task_id))
+        if task is not None:
+            # We append the new assistant message to the existing ones
+            task.messages.append(
+                Message(
+                    id=str(uuid.uuid4()),
+                    role="assistant",
+                    content=response.reply,
+                    created_at=replied_at,
                 )
+            )
 
-                # 🔥 Persist the rich collaboration / plan log if present
-                if getattr(response, "log", None):
-                    task.collaboration_log = response.log
-                    log_line = f"[{datetime.utcnow().isoformat()}] Updated collaboration plan."
-                    task.logs.append(log_line)
-                task.updated_at = datetime.utcnow()
-                upsert_task(task)
-                break
+            # 🔥 Persist the rich collaboration / plan log if present
+            if getattr(response, "log", None):
+                task.collaboration_log = response.log
+                log_line = f"[{replied_at.isoformat()}] Updated collaboration plan."
+                task.logs.append(log_line)
+            task.updated_at = replied_at
+            await asyncio.to_thread(upsert_task, task)
 
     return response
 
@@ -719,7 +921,7 @@ async def agent_chat(request: AgentChatRequest) -> AgentOrchestrationResponse:
 
 
 @app.post("/session")
-def create_session() -> Dict[str, str]:
+async def create_session() -> Dict[str, str]:
     """
     Create a new chat session and return its identifier.
     """
@@ -728,7 +930,7 @@ def create_session() -> Dict[str, str]:
     return {"session_id": session_id}
 
 
-@app.get("/session/{session_id}")
+@app.get("/session/{session_id}", response_model=SessionState)
 def get_session_state(session_id: str) -> Dict[str, Any]:
     """
     Return current state for a session.
@@ -741,7 +943,8 @@ def get_session_state(session_id: str) -> Dict[str, Any]:
     messages = SESSIONS_STORE.get(session_id, [])
     return {
         "session_id": session_id,
-        "tasks": [t.dict(by_alias=True) for t in tasks],
+        # Task models go straight to FastAPI's pydantic-core JSON encoder
+        "tasks": tasks,
         "messages": messages,
     }
 
@@ -752,13 +955,12 @@ def get_session_state(session_id: str) -> Dict[str, Any]:
 
 
 @app.get("/tasks", response_model=List[Task])
-async def list_all_tasks(limit: int = Query(30, ge=1, le=100)) -> List[Task]:
+def list_all_tasks(request: Request, response: Response, limit: int = Query(30, ge=1, le=100)) -> List[Task]:
     """
     Get up to `limit` tasks ordered by most recently updated.
     """
-    tasks = load_tasks()
-    tasks.sort(key=lambda t: t.updated_at, reverse=True)
-    return tasks[:limit]
+    _check_etag(request, response, tasks_etag())
+    return load_recent_tasks(limit)
 
 
 @app.post("/tasks", response_model=Task)
@@ -766,10 +968,7 @@ def create_task_direct(request: CreateTaskRequest) -> Task:
     """
     Create a new task without requiring a session.
     """
-    tasks = load_tasks()
-
-    numeric_ids = [int(t.id) for t in tasks if str(t.id).isdigit()]
-    next_id = str(max(numeric_ids) + 1) if numeric_ids else str(uuid.uuid4())
+    next_id = next_task_id()
 
     task = Task(
         id=next_id,
@@ -781,94 +980,376 @@ def create_task_direct(request: CreateTaskRequest) -> Task:
         plan=[],
         logs=["Task created."],
     )
-    tasks.append(task)
-    save_tasks(tasks)
+    upsert_task(task)
     return task
 
 
-@app.get("/tasks/{task_id}", response_model=Task)
-async def get_task_direct(task_id: str) -> Task:
+@app.get("/tasks/{task_id}", response_model=Task, dependencies=[Depends(_check_task_etag)])
+async def get_task_direct(task: Task = Depends(_find_task)) -> Task:
     """
     Get a specific task by ID.
     """
-    return _find_task(task_id)
+    return task
+
+
+def _register_run_job(**fields: Any) -> str:
+    if len(RUN_JOBS) >= _MAX_RUN_JOBS:
+        # Forget the oldest finished jobs first
+        for old_id in [j for j, job in RUN_JOBS.items() if job["status"] in ("completed", "failed")]:
+            del RUN_JOBS[old_id]
+            if len(RUN_JOBS) < _MAX_RUN_JOBS:
+                break
+
+    job_id = str(uuid4())
+    RUN_JOBS[job_id] = {"job_id": job_id, **fields, "status": "queued", "created_at": utcnow().isoformat()}
+    return job_id
+
+
+async def _run_job(job_id: str, task_id: str, run_all: bool) -> None:
+    job = RUN_JOBS[job_id]
+    job["status"] = "running"
+    try:
+        task = await asyncio.to_thread(_find_task, task_id)
+        agent = _get_agent()
+        if run_all:
+            task_payload = await _run_agent_to_completion(agent, task.model_dump())
+        else:
+            task_payload = await _run_agent_step(agent, task.model_dump())
+        updated_task = await asyncio.to_thread(_update_and_save_task, Task(**task_payload))
+    except Exception as exc:  # noqa: BLE001
+        job.update(status="failed", error=str(exc), finished_at=utcnow().isoformat())
+        return
+    job.update(status="completed", task_status=updated_task.status, finished_at=utcnow().isoformat())
+
+
+@app.post("/tasks/{task_id}/run/async", status_code=202, dependencies=[Depends(_find_task)])
+async def run_task_async(task_id: str, run_all: bool = Query(False, alias="all")) -> Dict[str, Any]:
+    """
+    Start running the task in the background and return a job id at once,
+    instead of holding the request open for the model round trip(s). Poll
+    ``GET /tasks/run/status/{job_id}`` for the outcome.
+    """
+    job_id = _register_run_job(task_id=task_id, all=run_all)
+    _spawn(_run_job(job_id, task_id, run_all))
+    return {"job_id": job_id, "status": "queued"}
+
+
+@app.get("/tasks/run/status/{job_id}")
+async def get_run_status(job_id: str) -> Dict[str, Any]:
+    """
+    Status of a background run started with ``/tasks/{task_id}/run/async``.
+    """
+    job = RUN_JOBS.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job
 
 
 @app.post("/tasks/{task_id}/run", response_model=Task)
-def run_task_direct(task_id: str) -> Task:
+async def run_task_direct(task: Task = Depends(_find_task)) -> Task:
     """
     Run a single planning/execution step on the task using the selected agent.
     """
-    task = _find_task(task_id)
     agent = _get_agent()
 
-    task_payload = task.dict()
-    updated_payload = agent.execute_task(task_payload)  # type: ignore[arg-type]
+    task_payload = task.model_dump()
+    updated_payload = await _run_agent_step(agent, task_payload)
     updated_task = Task(**updated_payload)
-    return _update_and_save_task(updated_task)
+    return await asyncio.to_thread(_update_and_save_task, updated_task)
+
+
+@app.post("/tasks/{task_id}/run/stream")
+async def stream_task_step(task: Task = Depends(_find_task)) -> StreamingResponse:
+    """
+    Run one step on the task, streaming the agent's reply as NDJSON
+    ``{"delta": ...}`` lines while it is generated. The text so far is also
+    reported by ``/execution/{task_id}/status``; the task is saved once the
+    step completes.
+    """
+    agent = _get_agent()
+    if not hasattr(agent, "astream_step"):
+        raise HTTPException(status_code=400, detail="Selected agent does not support step streaming")
+
+    async def _events() -> AsyncIterator[str]:
+        task_payload = task.model_dump()
+        parts = STREAMING_REPLIES[task.id] = []
+        try:
+            async for delta in agent.astream_step(task_payload):
+                parts.append(delta)
+                yield json.dumps({"delta": delta}) + "\n"
+        finally:
+            if STREAMING_REPLIES.get(task.id) is parts:
+                del STREAMING_REPLIES[task.id]
+
+        updated_task = await asyncio.to_thread(_update_and_save_task, Task(**task_payload))
+        yield json.dumps({"done": True, "task_id": updated_task.id, "status": updated_task.status}) + "\n"
+
+    return StreamingResponse(_events(), media_type="application/x-ndjson")
 
 
 @app.post("/tasks/{task_id}/run-all", response_model=Task)
-def run_task_all_direct(task_id: str) -> Task:
+async def run_task_all_direct(task: Task = Depends(_find_task)) -> Task:
     """
     Run the task until completion, calling the agent in a loop.
     """
-    task = _find_task(task_id)
     agent = _get_agent()
 
-    task_payload = task.dict()
-    while task_payload.get("status") not in ("completed", "failed"):
-        task_payload = agent.execute_task(task_payload)  # type: ignore[arg-type]
+    task_payload = await _run_agent_to_completion(agent, task.model_dump())
     updated_task = Task(**task_payload)
-    return _update_and_save_task(updated_task)
+    return await asyncio.to_thread(_update_and_save_task, updated_task)
+
+
+@app.post("/tasks/{task_id}/plan/stream")
+def stream_task_plan(task: Task = Depends(_find_task)) -> StreamingResponse:
+    """
+    Generate the plan for a task, streaming each step as an NDJSON line as
+    soon as the planner emits it. The full plan is saved once the stream ends.
+    """
+    if task.plan:
+        raise HTTPException(status_code=400, detail="Task already has a plan")
+
+    agent = _get_agent()
+    if not hasattr(agent, "stream_plan"):
+        raise HTTPException(status_code=400, detail="Selected agent does not support plan streaming")
+
+    def _events() -> Iterable[str]:
+        descriptions: List[str] = []
+        for description in agent.stream_plan(task.goal):
+            descriptions.append(description)
+            yield json.dumps({"step": description}) + "\n"
+
+        updated_task = Task(**agent.apply_plan(task.model_dump(), descriptions))
+        _update_and_save_task(updated_task)
+        yield json.dumps({"done": True, "task_id": updated_task.id, "steps": len(descriptions)}) + "\n"
+
+    return StreamingResponse(_events(), media_type="application/x-ndjson")
 
 
 @app.post("/tasks/run-all")
-def run_all_tasks() -> Dict[str, Any]:
+async def run_all_tasks() -> Dict[str, Any]:
     """
     Run all pending tasks.
     """
-    tasks = load_tasks()
+    return await _run_all_pending()
+
+
+async def _run_all_job(job_id: str) -> None:
+    job = RUN_JOBS[job_id]
+    job["status"] = "running"
+    try:
+        result = await _run_all_pending(job)
+    except Exception as exc:  # noqa: BLE001
+        job.update(status="failed", error=str(exc), finished_at=utcnow().isoformat())
+        return
+    job.update(status="completed", **result, finished_at=utcnow().isoformat())
+
+
+@app.post("/tasks/run-all/async", status_code=202)
+async def run_all_tasks_async() -> Dict[str, Any]:
+    """
+    Start running all pending tasks in the background and return a job id at
+    once; poll ``GET /tasks/run/status/{job_id}`` for the outcome.
+    """
+    job_id = _register_run_job(task_id=None, all=True)
+    _spawn(_run_all_job(job_id))
+    return {"job_id": job_id, "status": "queued"}
+
+
+@app.post("/session/{session_id}/run_all")
+async def run_all_session_tasks(session_id: str) -> Dict[str, Any]:
+    """
+    Session-scoped alias of ``/tasks/run-all``: loads the tasks once and
+    advances them together, batching each round's model calls.
+    """
+    _ensure_session(session_id)
+    return await _run_all_pending()
+
+
+def _finished(task_payload: Dict[str, Any]) -> bool:
+    return task_payload.get("status") in ("completed", "failed")
+
+
+async def _run_all_pending(job: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Drive every queued or in-progress task to completion.
+
+    Progress is saved as it is made (after each lockstep round, or as each
+    task finishes), and counted in ``job`` when given. A task whose agent
+    call raises is logged and left for the next run without stopping the
+    others.
+    """
+    tasks = await asyncio.to_thread(load_tasks)
+    agent = _get_agent()
+    payloads = [task.model_dump() for task in tasks if task.status in ("queued", "in_progress")]
+    progress = job if job is not None else {}
+    progress.update(processed=0, failed=0)
+
+    remaining = payloads
+    if hasattr(agent, "aexecute_tasks"):
+        # Advance all tasks in lockstep so each round's model calls are batched
+        try:
+            while remaining:
+                remaining = await agent.aexecute_tasks(remaining)
+                await asyncio.to_thread(upsert_tasks, [Task(**task_payload) for task_payload in remaining])
+                progress["processed"] += sum(1 for task_payload in remaining if _finished(task_payload))
+                remaining = [task_payload for task_payload in remaining if not _finished(task_payload)]
+        except Exception:  # noqa: BLE001
+            # Can't tell which task broke the round; finish the rest one by one
+            logger.exception("Batched run-all round failed; continuing task by task")
+
+    # Tasks are independent, so drive them concurrently rather than one
+    # after another; each still advances a step at a time
+    slots = asyncio.Semaphore(_RUN_ALL_CONCURRENCY)
+
+    async def _drive(task_payload: Dict[str, Any]) -> None:
+        async with slots:
+            try:
+                while not _finished(task_payload):
+                    task_payload = await _run_agent_step(agent, task_payload)
+                await asyncio.to_thread(upsert_task, Task(**task_payload))
+            except Exception:  # noqa: BLE001
+                logger.exception("Run-all failed for task %s", task_payload.get("id"))
+                progress["failed"] += 1
+                return
+        progress["processed"] += 1
+
+    await asyncio.gather(*(_drive(task_payload) for task_payload in remaining))
+
+    return {
+        "message": f"Processed {progress['processed']} tasks",
+        "total": len(tasks),
+        "failed": progress["failed"],
+    }
+
+
+_BATCH_POLL_SECONDS = 60.0
+
+
+# Batches get a 24h completion window; stop polling a little after it
+_BATCH_POLL_DEADLINE_SECONDS = 26 * 3600
+
+
+def _merge_batch_results(batch_id: str, collected: List[Dict[str, Any]]) -> None:
+    """Copy the ``batch_result`` of each collected step into the stored task.
+
+    The tasks are re-read rather than the polled copies saved, so steps
+    run while the batch was being fetched are kept. Steps that already
+    moved on get nothing. The batch id is cleared either way so the tasks
+    can be batched again.
+    """
+    updated: List[Task] = []
+    for payload in collected:
+        task = load_task(str(payload["id"]))
+        if task is None or (task.metadata or {}).get("openai_batch_id") != batch_id:
+            continue
+        for step, polled in zip(task.plan, payload.get("plan") or []):
+            reply = (polled.get("metadata") or {}).get("batch_result")
+            if reply is not None and step.status == "pending" and step.description == polled.get("description"):
+                step.metadata = {**(step.metadata or {}), "batch_result": reply}
+        del task.metadata["openai_batch_id"]
+        task.metadata.pop("openai_batch_submitted_at", None)
+        updated.append(task)
+    upsert_tasks(updated)
+
+
+async def _poll_openai_batch(agent: Any, batch_id: str, batch_task_ids: List[str], submitted_at: float) -> None:
+    """Background poller: copy batch results into the tasks once the job ends.
+
+    Gives up (logging, and freeing the tasks for another batch) once the
+    batch is well past its completion window.
+    """
+    deadline = submitted_at + _BATCH_POLL_DEADLINE_SECONDS
+    while True:
+        await asyncio.sleep(_BATCH_POLL_SECONDS)
+        tasks = [await asyncio.to_thread(load_task, task_id) for task_id in batch_task_ids]
+        payloads = [
+            task.model_dump()
+            for task in tasks
+            if task is not None and (task.metadata or {}).get("openai_batch_id") == batch_id
+        ]
+        if not payloads:
+            return
+        done = await asyncio.to_thread(agent.collect_batch, payloads)
+        if not done and time.time() < deadline:
+            continue
+        if not done:
+            logger.warning("OpenAI batch %s not collected before its deadline; giving up", batch_id)
+        await asyncio.to_thread(_merge_batch_results, batch_id, payloads)
+        return
+
+
+@app.on_event("startup")
+async def _resume_batch_polls() -> None:
+    """Restart pollers for batches submitted before the last restart."""
+    agent = _get_agent()
+    if not getattr(agent, "use_batch_api", False):
+        return
+    pending: Dict[str, List[str]] = defaultdict(list)
+    submitted: Dict[str, float] = {}
+    for record in await asyncio.to_thread(load_task_records):
+        metadata = record.get("metadata") or {}
+        batch_id = metadata.get("openai_batch_id")
+        if batch_id:
+            pending[batch_id].append(str(record.get("id")))
+            submitted[batch_id] = float(metadata.get("openai_batch_submitted_at") or time.time())
+    for batch_id, batch_task_ids in pending.items():
+        _spawn(_poll_openai_batch(agent, batch_id, batch_task_ids, submitted[batch_id]))
+
+
+@app.post("/tasks/batch")
+async def submit_tasks_batch() -> Dict[str, Any]:
+    """
+    Submit the pending steps of all queued tasks to the OpenAI Batch API.
+
+    Results arrive within 24 hours at half the price of live calls; a
+    background poller stores them on the steps, and running the tasks
+    afterwards uses them instead of calling the model again.
+    """
     agent = _get_agent()
-    completed = 0
+    if not getattr(agent, "use_batch_api", False):
+        raise HTTPException(status_code=400, detail="Batch API mode is not enabled for the selected agent")
 
-    for task in tasks:
-        if task.status in ("queued", "in_progress"):
-            task_payload = task.dict()
-            while task_payload.get("status") not in ("completed", "failed"):
-                task_payload = agent.execute_task(task_payload)  # type: ignore[arg-type]
-            updated_task = Task(**task_payload)
-            _update_and_save_task(updated_task)
-            completed += 1
+    tasks = await asyncio.to_thread(load_tasks)
+    payloads = [task.model_dump() for task in tasks if task.status in ("queued", "in_progress")]
+    batch_id = await asyncio.to_thread(agent.submit_batch, payloads)
+    if not batch_id:
+        raise HTTPException(status_code=502, detail="Could not submit OpenAI batch")
 
-    return {"message": f"Processed {completed} tasks", "total": len(tasks)}
+    await asyncio.to_thread(upsert_tasks, [Task(**task_payload) for task_payload in payloads])
+    batched = [p for p in payloads if (p.get("metadata") or {}).get("openai_batch_id") == batch_id]
+    _spawn(_poll_openai_batch(agent, batch_id, [p["id"] for p in batched], time.time()))
+    return {"batch_id": batch_id, "tasks": len(batched)}
 
 
-@app.get("/tasks/{task_id}/steps")
-def get_task_steps_direct(task_id: str) -> Dict[str, Any]:
+@app.get("/tasks/{task_id}/steps", response_model=Dict[str, Any], dependencies=[Depends(_check_task_etag)])
+async def get_task_steps_direct(task: Task = Depends(_find_task)) -> Dict[str, Any]:
     """
     Get the steps/plan for a specific task.
     """
-    task = _find_task(task_id)
-    return {"task_id": task.id, "steps": [step.dict() for step in task.plan]}
+    return {"task_id": task.id, "steps": [step.model_dump() for step in task.plan]}
 
 
-@app.get("/tasks/{task_id}/logs")
-def get_task_logs_direct(task_id: str) -> List[str]:
+@app.get("/tasks/{task_id}/logs", response_model=List[str])
+async def get_task_logs_direct(
+    etag: Optional[str] = Depends(_check_task_etag), task: Task = Depends(_find_task)
+) -> StreamingResponse:
     """
     Get logs for a specific task.
+
+    The task log is followed by each step's logs under a header line; the
+    lines are streamed as a JSON array instead of being copied into one list.
     """
-    task = _find_task(task_id)
 
-    # Combine task logs and step logs
-    all_logs = list(task.logs)
-    for idx, step in enumerate(task.plan):
-        all_logs.append(f"\n--- Step {idx + 1}: {step.description} ---")
-        all_logs.extend(step.logs)
-        if step.error:
-            all_logs.append(f"ERROR: {step.error}")
+    def _lines() -> Iterable[str]:
+        yield from task.logs
+        for idx, step in enumerate(task.plan):
+            yield f"\n--- Step {idx + 1}: {step.description} ---"
+            yield from step.logs
+            if step.error:
+                yield f"ERROR: {step.error}"
 
-    return all_logs
+    headers = {"ETag": etag} if etag is not None else None
+    return StreamingResponse(_json_array(_lines()), media_type="application/json", headers=headers)
 
 
 # --------------------------------------------------------------------------- #
@@ -884,9 +1365,7 @@ def create_task(session_id: str, request: CreateTaskRequest) -> Task:
     For now tasks are global; the session_id is recorded in logs only.
     """
     _ensure_session(session_id)
-    tasks = load_tasks()
-    numeric_ids = [int(t.id) for t in tasks if str(t.id).isdigit()]
-    next_id = str(max(numeric_ids) + 1) if numeric_ids else str(uuid.uuid4())
+    next_id = next_task_id()
 
     task = Task(
         id=next_id,
@@ -898,59 +1377,52 @@ def create_task(session_id: str, request: CreateTaskRequest) -> Task:
         plan=[],
         logs=[f"[session:{session_id}] Task created."],
     )
-    tasks.append(task)
-    save_tasks(tasks)
+    upsert_task(task)
     return task
 
 
 @app.get("/session/{session_id}/tasks/{task_id}", response_model=Task)
-def get_task(session_id: str, task_id: str) -> Task:
+async def get_task(session_id: str, task: Task = Depends(_find_task)) -> Task:
     _ensure_session(session_id)
-    return _find_task(task_id)
+    return task
 
 
 @app.post("/session/{session_id}/tasks/{task_id}/run", response_model=Task)
-def run_task_once(session_id: str, task_id: str) -> Task:
+async def run_task_once(session_id: str, task: Task = Depends(_find_task)) -> Task:
     """
     Run a single planning/execution step on the task using the selected agent.
     """
     _ensure_session(session_id)
-    task = _find_task(task_id)
     agent = _get_agent()
 
-    task_payload = task.dict()
-    updated_payload = agent.execute_task(task_payload)  # type: ignore[arg-type]
+    task_payload = task.model_dump()
+    updated_payload = await _run_agent_step(agent, task_payload)
     updated_task = Task(**updated_payload)
-    return _update_and_save_task(updated_task)
+    return await asyncio.to_thread(_update_and_save_task, updated_task)
 
 
 @app.post("/session/{session_id}/tasks/{task_id}/run_all", response_model=Task)
-def run_task_all(session_id: str, task_id: str) -> Task:
+async def run_task_all(session_id: str, task: Task = Depends(_find_task)) -> Task:
     """
     Run the task until completion, calling the agent in a loop.
     """
     _ensure_session(session_id)
-    task = _find_task(task_id)
     agent = _get_agent()
 
-    task_payload = task.dict()
-    while task_payload.get("status") not in ("completed", "failed"):
-        task_payload = agent.execute_task(task_payload)  # type: ignore[arg-type]
+    task_payload = await _run_agent_to_completion(agent, task.model_dump())
     updated_task = Task(**task_payload)
-    return _update_and_save_task(updated_task)
+    return await asyncio.to_thread(_update_and_save_task, updated_task)
 
 
-@app.get("/session/{session_id}/tasks/{task_id}/plan")
-def get_task_plan(session_id: str, task_id: str) -> Dict[str, Any]:
+@app.get("/session/{session_id}/tasks/{task_id}/plan", response_model=Dict[str, Any])
+async def get_task_plan(session_id: str, task: Task = Depends(_find_task)) -> Dict[str, Any]:
     _ensure_session(session_id)
-    task = _find_task(task_id)
-    return {"plan": [step.dict() for step in task.plan]}
+    return {"plan": [step.model_dump() for step in task.plan]}
 
 
-@app.get("/session/{session_id}/tasks/{task_id}/logs")
-def get_task_logs(session_id: str, task_id: str) -> Dict[str, Any]:
+@app.get("/session/{session_id}/tasks/{task_id}/logs", response_model=Dict[str, Any])
+async def get_task_logs(session_id: str, task: Task = Depends(_find_task)) -> Dict[str, Any]:
     _ensure_session(session_id)
-    task = _find_task(task_id)
 
     step_logs: List[Dict[str, Any]] = []
     for idx, step in enumerate(task.plan):
@@ -977,14 +1449,16 @@ def get_task_logs(session_id: str, task_id: str) -> Dict[str, Any]:
 
 
 @app.post("/session/{session_id}/message", response_model=MessageResponse)
-def send_message(session_id: str, request: MessageRequest) -> MessageResponse:
+async def send_message(session_id: str, request: MessageRequest) -> MessageResponse:
     """
     Simple echo-style chat endpoint. This is intentionally basic; the
     main intelligence lives in the agents that operate on tasks.
     """
     _ensure_session(session_id)
     response_text = f"Echo: {request.message}"
-    SESSIONS_STORE[session_id].append({"user": request.message, "assistant": response_text})
+    messages = SESSIONS_STORE[session_id]
+    messages.append({"user": request.message, "assistant": response_text})
+    del messages[:-_MAX_SESSION_MESSAGES]
     return MessageResponse(session_id=session_id, message=request.message, response=response_text)
 
 
@@ -994,11 +1468,14 @@ def send_message(session_id: str, request: MessageRequest) -> MessageResponse:
 
 
 @app.get("/workspace/list")
-def list_workspace_dir(path: str = Query("", description="Relative path inside workspace")) -> Dict[str, Any]:
+def list_workspace_dir(
+    request: Request, response: Response, path: str = Query("", description="Relative path inside workspace")
+) -> Dict[str, Any]:
     """
     List a directory inside the workspace. The workspace root is fixed;
     attempts to escape it will raise an error in file_ops.
     """
+    _check_path_etag(request, response, path)
     try:
         entries = list_dir(path)
     except FileNotFoundError:
@@ -1009,10 +1486,11 @@ def list_workspace_dir(path: str = Query("", description="Relative path inside w
 
 
 @app.get("/workspace/file/{file_path:path}")
-def read_workspace_file(file_path: str) -> Dict[str, Any]:
+def read_workspace_file(file_path: str, request: Request, response: Response) -> Dict[str, Any]:
     """
     Read the contents of a file from the workspace.
     """
+    _check_path_etag(request, response, file_path)
     try:
         content = read_file(file_path)
     except FileNotFoundError:
@@ -1029,10 +1507,13 @@ def read_workspace_file(file_path: str) -> Dict[str, Any]:
 
 
 @app.get("/files")
-def list_files(path: str = Query("", description="Relative path inside workspace")) -> List[Dict[str, Any]]:
+def list_files(
+    request: Request, response: Response, path: str = Query("", description="Relative path inside workspace")
+) -> List[Dict[str, Any]]:
     """
     List files in workspace directory.
     """
+    _check_path_etag(request, response, path)
     try:
         entries = list_dir(path)
         return [
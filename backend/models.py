@@ -8,11 +8,19 @@ generated during execution.
 
 from __future__ import annotations
 
-from datetime import datetime
-from typing import Any, Dict, List, Optional
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
 import uuid
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, field_validator
+
+
+def utcnow() -> datetime:
+    """Current time as naive UTC, the convention for stored timestamps.
+
+    Replaces ``datetime.utcnow()``, which is deprecated since Python 3.12.
+    """
+    return datetime.now(timezone.utc).replace(tzinfo=None)
 
 
 class Project(BaseModel):
@@ -20,7 +28,7 @@ class Project(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     name: str
     description: Optional[str] = None
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=utcnow)
     status: str = "active"  # active, archived
 
 
@@ -52,6 +60,10 @@ class Step(BaseModel):
         default=None,
         description="Optional metadata associated with the step (e.g. file paths, diff summaries)",
     )
+    user_prompt_cache_key: Optional[str] = Field(
+        default=None,
+        description="Hash of (task goal, step description) used to look up cached generated content",
+    )
 
 
 class Message(BaseModel):
@@ -77,14 +89,14 @@ class Task(BaseModel):
     plan: List[Step] = Field(default_factory=list, description="Ordered list of plan steps")
     current_step: Optional[int] = Field(default=0, description="Index of the current step in the plan")
     created_at: datetime = Field(
-        default_factory=datetime.utcnow,
+        default_factory=utcnow,
         alias="createdAt",
         description="ISO timestamp when the task was created",
     )
     updated_at: datetime = Field(
-        default_factory=datetime.utcnow,
+        default_factory=utcnow,
         alias="updatedAt",
-        description="ISO timestamp when the task was last updated",
+        description="ISO timestamp when the task was last updated (agents may set epoch seconds)",
     )
 
     # New fields to capture task-level logs and errors
@@ -115,6 +127,15 @@ class Task(BaseModel):
 
     model_config = ConfigDict(populate_by_name=True)
 
+    @field_validator("created_at", "updated_at")
+    @classmethod
+    def _as_naive_utc(cls, value: datetime) -> datetime:
+        # Defaults are naive UTC (``utcnow``) while agents may send "...Z" strings
+        # or epoch seconds, which parse as aware; mixing the two breaks sorting.
+        if value.tzinfo is not None:
+            return value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+
 
 class MemoryItem(BaseModel):
     id: str
@@ -137,6 +158,14 @@ class MessageResponse(BaseModel):
     response: str
 
 
+class SessionState(BaseModel):
+    """Response body for GET /session/{session_id}."""
+
+    session_id: str
+    tasks: List[Task]
+    messages: List[Dict[str, Any]] = Field(default_factory=list)
+
+
 class AnswerSubmission(BaseModel):
     question_id: str
     answer: str
@@ -149,6 +178,17 @@ class RequirementsSession(BaseModel):
     answers: List[Dict[str, Any]] = Field(default_factory=list)
     specification: Dict[str, Any] = Field(default_factory=dict)
 
+    _questions_index: Dict[str, ClarifyingQuestion] = PrivateAttr(default_factory=dict)
+    _indexed_count: int = PrivateAttr(default=0)
+
+    @property
+    def questions_by_id(self) -> Dict[str, ClarifyingQuestion]:
+        """Questions keyed by id, rebuilt whenever follow-ups have been added."""
+        if self._indexed_count != len(self.questions):
+            self._questions_index = {q.id: q for q in self.questions if q.id}
+            self._indexed_count = len(self.questions)
+        return self._questions_index
+
 
 class ClarifyingQuestion(BaseModel):
     """Represents a targeted question asked during requirements gathering."""
@@ -158,6 +198,8 @@ class ClarifyingQuestion(BaseModel):
     category: str
     priority: int = Field(default=1, description="Higher values indicate greater urgency")
 
+    model_config = ConfigDict(frozen=True)
+
 
 class Specification(BaseModel):
     """Structured representation of requirements for a user goal."""
@@ -183,21 +225,27 @@ class PlanStep(BaseModel):
     name: str
     description: str
     requires_review: bool = False
-    verification: List[str] = Field(default_factory=list)
+    verification: Tuple[str, ...] = ()
+
+    model_config = ConfigDict(frozen=True)
 
 
 class PlanPhase(BaseModel):
     """Grouping of related steps and checks."""
 
     name: str
-    steps: List[PlanStep]
-    verification: List[str] = Field(default_factory=list)
+    steps: Tuple[PlanStep, ...]
+    verification: Tuple[str, ...] = ()
+
+    model_config = ConfigDict(frozen=True)
 
 
 class DetailedPlan(BaseModel):
     """High-level roadmap produced by the council."""
 
-    phases: List[PlanPhase]
+    phases: Tuple[PlanPhase, ...]
+
+    model_config = ConfigDict(frozen=True)
 
 
 class AgentOpinion(BaseModel):
@@ -206,22 +254,28 @@ class AgentOpinion(BaseModel):
     agent: str
     role: str
     proposal: str
-    concerns: List[str] = Field(default_factory=list)
+    concerns: Tuple[str, ...] = ()
+
+    model_config = ConfigDict(frozen=True)
 
 
 class DebateRound(BaseModel):
     """One round of council discussion on a topic."""
 
     topic: str
-    opinions: List[AgentOpinion]
+    opinions: Tuple[AgentOpinion, ...]
+
+    model_config = ConfigDict(frozen=True)
 
 
 class CouncilDecision(BaseModel):
     """Outcome of council deliberation including consensus and dissent."""
 
     consensus: str
-    rationale: List[str] = Field(default_factory=list)
-    dissent: List[str] = Field(default_factory=list)
+    rationale: Tuple[str, ...] = ()
+    dissent: Tuple[str, ...] = ()
+
+    model_config = ConfigDict(frozen=True)
 
 
 class DebateResult(BaseModel):
@@ -5,9 +5,14 @@ import httpx
 from fastapi import HTTPException
 from pydantic import BaseModel
 
+from .agents.rate_limit import OPENAI_RATE_LIMITER, estimate_tokens
+
 OPENAI_URL = "https://api.openai.com/v1/chat/completions"
 ANTHROPIC_URL = "https://api.anthropic.com/v1/messages"
 
+# Reply budget assumed when reserving tokens for requests without max_tokens
+_REPLY_TOKENS_ESTIMATE = 1024
+
 
 class ConversationMessage(BaseModel):
     role: Literal["system", "user", "assistant"]
@@ -41,6 +46,25 @@ async def orchestrate(messages: List[ConversationMessage]) -> AgentOrchestration
         return AgentOrchestrationResponse(mode="collab", reply=collab["final"], log=collab["log"])
 
 
+async def _post_openai(payload: Dict[str, Any], openai_key: str, client: httpx.AsyncClient) -> Dict[str, Any]:
+    # Wait for room in the shared RPM/TPM budget first instead of spending a
+    # round trip on a 429
+    prompt = "\n".join(m["content"] for m in payload["messages"])
+    await OPENAI_RATE_LIMITER.acquire(
+        estimate_tokens(prompt, payload.get("max_tokens", _REPLY_TOKENS_ESTIMATE), model=payload["model"])
+    )
+    response = await client.post(
+        OPENAI_URL,
+        headers={"Authorization": f"Bearer {openai_key}", "Content-Type": "application/json"},
+        json=payload,
+    )
+    if response.status_code == 429:
+        OPENAI_RATE_LIMITER.on_rate_limited()
+    response.raise_for_status()
+    OPENAI_RATE_LIMITER.on_success()
+    return response.json()
+
+
 async def _detect_intent(user_text: str, openai_key: str, client: httpx.AsyncClient) -> str:
     payload = {
         "model": "gpt-4o-mini",
@@ -57,13 +81,7 @@ async def _detect_intent(user_text: str, openai_key: str, client: httpx.AsyncCli
         ],
     }
 
-    response = await client.post(
-        OPENAI_URL,
-        headers={"Authorization": f"Bearer {openai_key}", "Content-Type": "application/json"},
-        json=payload,
-    )
-    response.raise_for_status()
-    data = response.json()
+    data = await _post_openai(payload, openai_key, client)
     raw = data.get("choices", [{}])[0].get("message", {}).get("content", "").strip().lower()
     return "build" if "build" in raw else "simple"
 
@@ -76,13 +94,7 @@ async def _openai_chat(
         "messages": [m.model_dump() for m in messages],
     }
 
-    response = await client.post(
-        OPENAI_URL,
-        headers={"Authorization": f"Bearer {openai_key}", "Content-Type": "application/json"},
-        json=payload,
-    )
-    response.raise_for_status()
-    data = response.json()
+    data = await _post_openai(payload, openai_key, client)
     return data.get("choices", [{}])[0].get("message", {}).get("content", "No response.")
 
 
@@ -121,13 +133,7 @@ async def _openai_plan_for_claude(
         ],
     }
 
-    response = await client.post(
-        OPENAI_URL,
-        headers={"Authorization": f"Bearer {openai_key}", "Content-Type": "application/json"},
-        json=payload,
-    )
-    response.raise_for_status()
-    data = response.json()
+    data = await _post_openai(payload, openai_key, client)
     return data.get("choices", [{}])[0].get("message", {}).get("content", "")
 
 
@@ -188,11 +194,5 @@ async def _openai_final_build(
         ],
     }
 
-    response = await client.post(
-        OPENAI_URL,
-        headers={"Authorization": f"Bearer {openai_key}", "Content-Type": "application/json"},
-        json=payload,
-    )
-    response.raise_for_status()
-    data = response.json()
+    data = await _post_openai(payload, openai_key, client)
     return data.get("choices", [{}])[0].get("message", {}).get("content", "")
@@ -1,41 +1,302 @@
+import hashlib
+import heapq
 import json
+import os
+import stat
+import tempfile
+import threading
+import uuid
+from contextlib import contextmanager
 from pathlib import Path
-from typing import List
-from .models import Task, Project, MemoryItem
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from pydantic import TypeAdapter
+
+from .models import Task, Project, MemoryItem, utcnow
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+# orjson (de)serializes several times faster than stdlib json and writes the
+# same indented layout; its decode error subclasses json.JSONDecodeError.
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
 
 # Path to tasks.json relative to repository root
 TASKS_FILE = Path(__file__).resolve().parent.parent / "tasks.json"
 PROJECTS_FILE = Path(__file__).resolve().parent.parent / "projects.json"
 
+# ``upsert_task`` appends the updated task as one line to a journal next to
+# tasks.json instead of rewriting every task on every step. Loading replays
+# the journal over the snapshot; once the journal passes this size it is
+# folded back into tasks.json.
+TASK_JOURNAL_COMPACT_BYTES = 4 * 1024 * 1024
+
+
+def _dumps(data: Any, indent: bool = False) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data, default=str, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(data, indent=2 if indent else None, default=str).encode("utf-8")
+
+
+def _loads(data: bytes) -> Any:
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    """Replace ``path`` with ``data`` so readers never see a half-written file."""
+    try:
+        mode = stat.S_IMODE(path.stat().st_mode)
+    except FileNotFoundError:
+        mode = 0o644
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.chmod(tmp, mode)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def _task_journal_file() -> Path:
+    return TASKS_FILE.with_name(TASKS_FILE.stem + ".journal.jsonl")
+
+
+@contextmanager
+def _task_files_lock() -> Iterator[None]:
+    """Exclusive lock over tasks.json and its journal, across processes.
+
+    Held around every journal append and snapshot rewrite, so the worker
+    can't append to a journal that is being folded in and unlinked.
+    """
+    with TASKS_FILE.with_name(TASKS_FILE.stem + ".lock").open("a") as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)  # released when the file closes
+        yield
+
+
+# Parsed task records (id -> dict) kept between calls. The worker runs in
+# another process, so the cache is keyed on the files' size and mtime and is
+# re-read whenever either file changed on disk; this process's own upserts
+# update it in place.
+_records_lock = threading.RLock()
+_records_cache: Optional[Tuple[Tuple[Any, ...], Dict[str, Dict[str, Any]]]] = None
+
+
+def _file_state(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _files_key() -> Tuple[Any, ...]:
+    return TASKS_FILE, _file_state(TASKS_FILE), _file_state(_task_journal_file())
+
+
+def _read_task_records() -> Dict[str, Dict[str, Any]]:
+    records: Dict[str, Dict[str, Any]] = {}
+    if TASKS_FILE.exists():
+        for item in _loads(TASKS_FILE.read_bytes()):
+            records[item.get("id")] = item
+    journal = _task_journal_file()
+    if journal.exists():
+        with journal.open("rb") as f:
+            for line in f:
+                try:
+                    item = _loads(line)
+                except json.JSONDecodeError:
+                    # A torn final line from an interrupted write
+                    continue
+                records[item.get("id")] = item
+    return records
+
+
+def _task_records() -> Dict[str, Dict[str, Any]]:
+    global _records_cache
+    with _records_lock:
+        key = _files_key()
+        if _records_cache is None or _records_cache[0] != key:
+            _records_cache = (key, _read_task_records())
+        return _records_cache[1]
+
 
 def load_tasks() -> List[Task]:
-    """Load tasks from tasks.json, returning a list of Task objects."""
-    if not TASKS_FILE.exists():
-        return []
-    with TASKS_FILE.open("r", encoding="utf-8") as f:
-        data = json.load(f)
-    return [Task(**item) for item in data]
+    """Load tasks from tasks.json plus its update journal, returning Task objects."""
+    with _records_lock:
+        records = list(_task_records().values())
+    return [Task(**item) for item in records]
+
+
+def load_task_records() -> List[Dict[str, Any]]:
+    """Return the stored tasks as plain dicts (keyed by alias), unvalidated.
+
+    For read-only callers that only filter or re-serialize; the dicts are
+    shared with the cache and must not be mutated.
+    """
+    with _records_lock:
+        return list(_task_records().values())
+
+
+_DATETIME = TypeAdapter(datetime)
+
+
+def _updated_at(record: Dict[str, Any]) -> datetime:
+    # Same value Task.updated_at would hold, without validating the rest
+    value = record.get("updatedAt", record.get("updated_at"))
+    if value is None:
+        return utcnow()
+    value = _DATETIME.validate_python(value)
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def load_recent_tasks(limit: int) -> List[Task]:
+    """Return the ``limit`` most recently updated tasks, newest first.
+
+    Only the returned tasks are built as models; the rest are ranked by
+    their raw ``updatedAt`` value.
+    """
+    with _records_lock:
+        records = heapq.nlargest(limit, _task_records().values(), key=_updated_at)
+    return [Task(**record) for record in records]
+
+
+def load_task(task_id: str) -> Optional[Task]:
+    """Return one task by id without building every other task."""
+    with _records_lock:
+        record = _task_records().get(task_id)
+    return Task(**record) if record is not None else None
+
+
+def task_ids() -> List[str]:
+    """Return the ids of all stored tasks without building Task objects."""
+    with _records_lock:
+        return list(_task_records())
+
+
+# task id -> (record, etag); an entry is current while the cached record is
+# the very dict it was computed from, so updates need no explicit eviction
+_record_etags: Dict[str, Tuple[Dict[str, Any], str]] = {}
+
+
+def task_etag(task_id: str) -> Optional[str]:
+    """Return a validator for one stored task, or None if it doesn't exist.
+
+    It is a hash of the stored record, so it changes with every update and is
+    the same in every process that reads the same files.
+    """
+    with _records_lock:
+        record = _task_records().get(task_id)
+        if record is None:
+            return None
+        cached = _record_etags.get(task_id)
+        if cached is not None and cached[0] is record:
+            return cached[1]
+        etag = hashlib.blake2b(_dumps(record), digest_size=8).hexdigest()
+        _record_etags[task_id] = (record, etag)
+        return etag
+
+
+def tasks_etag() -> str:
+    """Return a validator that changes whenever any stored task changes."""
+    return hashlib.blake2b(repr(_files_key()).encode(), digest_size=8).hexdigest()
+
+
+def _task_counter_file() -> Path:
+    return TASKS_FILE.with_name(TASKS_FILE.stem + ".counter")
+
+
+# Written to the counter file when the stored tasks use UUID ids
+_UUID_IDS = "uuid"
+
+
+def next_task_id() -> str:
+    """Allocate an id for a new task without scanning the existing ones.
+
+    Numeric ids continue from the last one issued, which is kept in a counter
+    file next to tasks.json and updated under an exclusive lock, so two
+    processes never hand out the same id. The stored ids are only scanned to
+    seed the counter, or to reseed it if tasks.json was replaced and the id
+    is already taken. Tasks without numeric ids get UUIDs.
+    """
+    with _records_lock, _task_counter_file().open("a+", encoding="utf-8") as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)  # released when the file closes
+        f.seek(0)
+        last = f.read().strip()
+        if last == _UUID_IDS:
+            return str(uuid.uuid4())
+        records = _task_records()
+        if not last.isdigit() or str(int(last) + 1) in records:
+            numeric_ids = [int(task_id) for task_id in records if str(task_id).isdigit()]
+            last = str(max(numeric_ids)) if numeric_ids else _UUID_IDS
+        next_id = str(uuid.uuid4()) if last == _UUID_IDS else str(int(last) + 1)
+        f.seek(0)
+        f.truncate()
+        f.write(_UUID_IDS if last == _UUID_IDS else next_id)
+        return next_id
 
 
 def save_tasks(tasks: List[Task]) -> None:
-    """Persist tasks back to tasks.json."""
-    serialized = [task.dict(by_alias=True) for task in tasks]
-    with TASKS_FILE.open("w", encoding="utf-8") as f:
-        json.dump(serialized, f, indent=2, default=str)
+    """Persist tasks back to tasks.json, replacing any journaled updates."""
+    with _records_lock, _task_files_lock():
+        _replace_tasks(tasks)
+
+
+def _replace_tasks(tasks: List[Task]) -> None:
+    # Callers hold _records_lock and _task_files_lock
+    global _records_cache
+    serialized = [task.model_dump(by_alias=True) for task in tasks]
+    _write_atomic(TASKS_FILE, _dumps(serialized, indent=True))
+    _task_journal_file().unlink(missing_ok=True)
+    _records_cache = None
 
 
 def upsert_task(task: Task) -> None:
     """Update an existing task or insert it if it doesn't exist."""
-    tasks = load_tasks()
+    upsert_tasks([task])
 
-    for idx, existing in enumerate(tasks):
-        if existing.id == task.id:
-            tasks[idx] = task
-            break
-    else:
-        tasks.append(task)
 
-    save_tasks(tasks)
+def upsert_tasks(tasks: List[Task]) -> None:
+    """Update or insert several tasks with a single journal append."""
+    global _records_cache
+    records = [task.model_dump(by_alias=True) for task in tasks]
+    if not records:
+        return
+    data = b"".join(_dumps(record) + b"\n" for record in records)
+    journal = _task_journal_file()
+    with _records_lock, _task_files_lock():
+        cached_key = _records_cache[0] if _records_cache is not None else None
+        with journal.open("ab") as f:
+            offset = f.tell()
+            f.write(data)
+            journal_size = f.tell()
+
+        # Apply the update to the cache only if nothing else touched the
+        # files between our last read and this append; otherwise re-read later
+        journal_before = (cached_key[2] or (0, 0))[1] if cached_key else None
+        key = _files_key()
+        if journal_before == offset and key[:2] == cached_key[:2] and key[2] and key[2][1] == journal_size:
+            for task, record in zip(tasks, records):
+                _records_cache[1][task.id] = record
+            _records_cache = (key, _records_cache[1])
+        else:
+            _records_cache = None
+
+        # Fold the journal in under the same lock, so no other process can
+        # append between reading it and unlinking it
+        if journal_size >= TASK_JOURNAL_COMPACT_BYTES:
+            _replace_tasks(load_tasks())
 
 
 def load_projects() -> List[Project]:
@@ -43,8 +304,7 @@ def load_projects() -> List[Project]:
     if not PROJECTS_FILE.exists():
         return []
     try:
-        with PROJECTS_FILE.open("r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = _loads(PROJECTS_FILE.read_bytes())
         return [Project(**item) for item in data]
     except (json.JSONDecodeError, FileNotFoundError):
         return []
@@ -52,9 +312,8 @@ def load_projects() -> List[Project]:
 
 def save_projects(projects: List[Project]) -> None:
     """Persist projects back to projects.json."""
-    serialized = [project.dict(by_alias=True) for project in projects]
-    with PROJECTS_FILE.open("w", encoding="utf-8") as f:
-        json.dump(serialized, f, indent=2, default=str)
+    serialized = [project.model_dump(by_alias=True) for project in projects]
+    _write_atomic(PROJECTS_FILE, _dumps(serialized, indent=True))
 
 
 def upsert_project(project: Project) -> None:
@@ -77,14 +336,12 @@ def load_memory() -> List[MemoryItem]:
     if not MEMORY_FILE.exists():
         return []
     try:
-        with MEMORY_FILE.open("r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = _loads(MEMORY_FILE.read_bytes())
         return [MemoryItem(**item) for item in data]
     except (json.JSONDecodeError, FileNotFoundError):
         return []
 
 def save_memory(items: List[MemoryItem]) -> None:
     """Persist memory items to memory.json."""
-    serialized = [item.dict() for item in items]
-    with MEMORY_FILE.open("w", encoding="utf-8") as f:
-        json.dump(serialized, f, indent=2, default=str)
+    serialized = [item.model_dump() for item in items]
+    _write_atomic(MEMORY_FILE, _dumps(serialized, indent=True))
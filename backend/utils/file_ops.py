@@ -9,6 +9,8 @@ to compute diffs between two versions of text.
 from __future__ import annotations
 
 import difflib
+import mmap
+import os
 from pathlib import Path
 from typing import List, Dict
 
@@ -16,6 +18,18 @@ from typing import List, Dict
 # The workspace is located at the root of the ``builder`` project (sibling to ``backend``).
 WORKSPACE_DIR = Path(__file__).resolve().parents[2] / "workspace"
 
+# Files at least this large are decoded straight from a memory map rather
+# than read into an intermediate bytes buffer first; below it the extra
+# mmap/munmap syscalls cost more than the copy they save.
+MMAP_READ_THRESHOLD = 1 << 20
+
+# Line matching dominates diff time on large files; cdifflib is a C drop-in
+# for difflib's pure-Python SequenceMatcher.
+try:
+    from cdifflib import CSequenceMatcher as _SequenceMatcher
+except ImportError:  # pragma: no cover - optional dependency
+    _SequenceMatcher = difflib.SequenceMatcher
+
 
 def _resolve_path(path: str) -> Path:
     """Resolve a relative path within the workspace directory."""
@@ -26,12 +40,31 @@ def _resolve_path(path: str) -> Path:
     return target
 
 
+def path_version(path: str) -> str:
+    """Return a token that changes when a workspace file or directory does.
+
+    For a file that is any rewrite; for a directory, any entry being added,
+    removed or renamed (which is all ``list_dir`` reports).
+    """
+    st = _resolve_path(path).stat()
+    return f"{st.st_ino:x}-{st.st_mtime_ns:x}-{st.st_size:x}"
+
+
 def read_file(path: str) -> str:
     """Read and return the contents of a file within the workspace."""
     target = _resolve_path(path)
     if not target.exists():
         raise FileNotFoundError(f"File not found: {path}")
-    return target.read_text(encoding="utf-8")
+    if target.stat().st_size < MMAP_READ_THRESHOLD:
+        return target.read_text(encoding="utf-8")
+    with open(target, "rb") as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        has_cr = mm.find(b"\r") != -1
+        with memoryview(mm) as view:
+            text = str(view, "utf-8")
+    # Match read_text's universal-newline translation
+    if has_cr:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
 
 
 def write_file(path: str, content: str) -> None:
@@ -41,16 +74,45 @@ def write_file(path: str, content: str) -> None:
     target.write_text(content, encoding="utf-8")
 
 
+def _format_range(start: int, length: int) -> str:
+    """Hunk range in unified diff notation (same as ``difflib``)."""
+    beginning = start + 1
+    if not length:
+        beginning -= 1
+    if length == 1:
+        return str(beginning)
+    return f"{beginning},{length}"
+
+
 def diff_text(original: str, modified: str) -> List[str]:
-    """Compute a unified diff between two strings."""
-    diff = difflib.unified_diff(
-        original.splitlines(),
-        modified.splitlines(),
-        fromfile="original",
-        tofile="modified",
-        lineterm="",
-    )
-    return list(diff)
+    """Compute a unified diff between two strings.
+
+    Output matches ``difflib.unified_diff`` (``fromfile="original"``,
+    ``tofile="modified"``, no line terminators), but the line matching runs
+    on cdifflib's C ``SequenceMatcher`` when that package is installed.
+    """
+    if original == modified:
+        return []
+    a = original.splitlines()
+    b = modified.splitlines()
+    lines: List[str] = []
+    for group in _SequenceMatcher(None, a, b).get_grouped_opcodes(3):
+        if not lines:
+            lines.extend(("--- original", "+++ modified"))
+        first, last = group[0], group[-1]
+        lines.append(
+            f"@@ -{_format_range(first[1], last[2] - first[1])} "
+            f"+{_format_range(first[3], last[4] - first[3])} @@"
+        )
+        for tag, i1, i2, j1, j2 in group:
+            if tag == "equal":
+                lines.extend(" " + line for line in a[i1:i2])
+                continue
+            if tag in ("replace", "delete"):
+                lines.extend("-" + line for line in a[i1:i2])
+            if tag in ("replace", "insert"):
+                lines.extend("+" + line for line in b[j1:j2])
+    return lines
 
 # ---------------------------------------------------------------------------
 # Directory listing
@@ -83,8 +145,11 @@ def list_dir(path: str = "") -> List[Dict[str, str]]:
         raise FileNotFoundError(f"Path not found: {path}")
     if not target.is_dir():
         raise FileNotFoundError(f"Path is not a directory: {path}")
-    entries: List[Dict[str, str]] = []
-    for child in sorted(target.iterdir()):
-        entry_type = "directory" if child.is_dir() else "file"
-        entries.append({"name": child.name, "type": entry_type})
+    # scandir reports the entry type from readdir itself, so is_dir() needs
+    # no extra stat() per child (symlinks are still followed)
+    with os.scandir(target) as it:
+        entries = [
+            {"name": entry.name, "type": "directory" if entry.is_dir() else "file"} for entry in it
+        ]
+    entries.sort(key=lambda entry: entry["name"])
     return entries
@@ -0,0 +1,83 @@
+"""Size- and idle-time-bounded mapping for per-process state.
+
+Chat sessions, requirements sessions and council debates are kept in memory
+for the life of the process. ``TTLCache`` stops them accumulating forever:
+entries untouched for ``ttl`` seconds expire, and once ``maxsize`` entries
+are held the least recently used one is dropped.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterator, MutableMapping, Tuple
+
+
+class TTLCache(MutableMapping):
+    """LRU mapping whose entries also expire after ``ttl`` idle seconds."""
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        # key -> (expires_at, value). Reads and writes both push the expiry
+        # out by ``ttl`` and move the key to the end, so the front is always
+        # the next entry to expire as well as the least recently used.
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.RLock()
+
+    def _expire(self, now: float) -> None:
+        while self._data:
+            key, (expires_at, _) = next(iter(self._data.items()))
+            if expires_at > now:
+                break
+            del self._data[key]
+
+    def __getitem__(self, key: Hashable) -> Any:
+        with self._lock:
+            now = time.monotonic()
+            self._expire(now)
+            try:
+                _, value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                raise
+            self._data[key] = (now + self.ttl, value)
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self._expire(now)
+            self._data[key] = (now + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def __delitem__(self, key: Hashable) -> None:
+        with self._lock:
+            del self._data[key]
+
+    def __contains__(self, key: object) -> bool:
+        # A membership test neither counts as a hit nor refreshes the entry
+        with self._lock:
+            self._expire(time.monotonic())
+            return key in self._data
+
+    def __iter__(self) -> Iterator[Hashable]:
+        with self._lock:
+            self._expire(time.monotonic())
+            return iter(list(self._data))
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._expire(time.monotonic())
+            return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        """Current size and hit/miss counts, for sizing the limits."""
+        return {"size": len(self), "maxsize": self.maxsize, "ttl": self.ttl, "hits": self.hits, "misses": self.misses}
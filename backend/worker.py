@@ -1,7 +1,8 @@
 import time
 import logging
 import traceback
-from .storage import load_tasks, upsert_task
+from .models import Task
+from .storage import load_task_records, upsert_task
 from .agents.claude_agent import get_agent
 
 logger = logging.getLogger(__name__)
@@ -16,36 +17,37 @@ def run_worker_loop(poll_seconds: int = 5):
 
     while True:
         try:
-            tasks = load_tasks()
+            # Scan the raw records and validate only the task we pick; most
+            # polls find nothing to do
+            records = load_task_records()
             # Sort by created_at to process oldest first, or prioritize in_progress
             # Simple priority: in_progress first, then queued.
 
             target_task = None
 
             # 1. Continue in_progress tasks
-            for task in tasks:
-                if task.status == "in_progress":
-                    target_task = task
+            for record in records:
+                if record.get("status") == "in_progress":
+                    target_task = Task(**record)
                     break
 
             # 2. Pick up queued tasks
             if not target_task:
-                for task in tasks:
-                    if task.status == "queued":
-                        target_task = task
+                for record in records:
+                    if record.get("status", "queued") == "queued":
+                        target_task = Task(**record)
                         break
 
             if target_task:
                 logger.info(f"Processing task {target_task.id}: {target_task.goal[:50]}...")
 
                 # Execute one step (or plan generation)
-                task_dict = target_task.dict()
+                task_dict = target_task.model_dump()
                 updated_dict = agent.execute_task(task_dict)
 
                 # Convert back to Task object and save
                 # We need to be careful with the conversion if fields mismatch,
                 # but models.py should handle it.
-                from backend.models import Task
                 updated_task = Task(**updated_dict)
                 upsert_task(updated_task)
 
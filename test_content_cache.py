@@ -0,0 +1,50 @@
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from backend.agents import content_cache
+
+
+class TestContentCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        patcher = patch.object(content_cache, "CONTENT_CACHE_DIR", Path(self.tmpdir.name))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.tmpdir.cleanup)
+
+    def test_roundtrip(self):
+        fp = content_cache.fingerprint("Build a site", "Create file index.html", "index.html")
+        self.assertIsNone(content_cache.get(fp))
+
+        content_cache.put(fp, "<html></html>")
+
+        self.assertEqual(content_cache.get(fp), "<html></html>")
+
+    def test_expired_entry_is_a_miss(self):
+        fp = content_cache.fingerprint("goal", "step", "a.txt")
+        content_cache.put(fp, "old")
+        stale = time.time() - content_cache.CONTENT_CACHE_TTL_SECONDS - 1
+        os.utime(content_cache._entry_path(fp), (stale, stale))
+
+        self.assertIsNone(content_cache.get(fp))
+
+    def test_sweep_evicts_least_recently_used(self):
+        old_fp = content_cache.fingerprint("goal", "step", "old.txt")
+        new_fp = content_cache.fingerprint("goal", "step", "new.txt")
+        content_cache.put(old_fp, "x" * 10)
+        earlier = time.time() - 60
+        os.utime(content_cache._entry_path(old_fp), (earlier, earlier))
+
+        with patch.object(content_cache, "CONTENT_CACHE_MAX_BYTES", 15):
+            content_cache.put(new_fp, "y" * 10)
+
+        self.assertIsNone(content_cache.get(old_fp))
+        self.assertEqual(content_cache.get(new_fp), "y" * 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
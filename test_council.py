@@ -0,0 +1,21 @@
+import asyncio
+import unittest
+
+from backend.agents.council import DevelopmentCouncil
+from backend.models import Specification
+
+
+class TestDevelopmentCouncil(unittest.TestCase):
+    def test_shared_debate_content_cannot_be_changed_by_callers(self):
+        council = DevelopmentCouncil()
+        result = asyncio.run(council.debate(Specification(goal="Build a landing page")))
+        plan = asyncio.run(council.produce_plan(Specification(goal="Build a landing page")))
+
+        with self.assertRaises(AttributeError):
+            result.rounds[1].opinions[0].concerns.append("changed")
+        with self.assertRaises(AttributeError):
+            plan.phases[0].steps.append(plan.phases[0].steps[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import difflib
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from backend.utils import file_ops
+
+
+class TestReadFile(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        patcher = patch.object(file_ops, "WORKSPACE_DIR", Path(self.tmpdir.name))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.tmpdir.cleanup)
+
+    def test_large_file_matches_small_file_read(self):
+        body = "héllo\r\nworld\rend\n" * 1000
+        Path(self.tmpdir.name, "a.txt").write_bytes(body.encode("utf-8"))
+        expected = Path(self.tmpdir.name, "a.txt").read_text(encoding="utf-8")
+
+        self.assertEqual(file_ops.read_file("a.txt"), expected)
+        with patch.object(file_ops, "MMAP_READ_THRESHOLD", 1):
+            self.assertEqual(file_ops.read_file("a.txt"), expected)
+
+
+class TestDiffText(unittest.TestCase):
+    def test_matches_difflib_unified_diff(self):
+        original = "\n".join(f"line {i}" for i in range(40))
+        modified = original.replace("line 3\n", "").replace("line 20", "line twenty") + "\nline 40"
+        expected = list(
+            difflib.unified_diff(
+                original.splitlines(),
+                modified.splitlines(),
+                fromfile="original",
+                tofile="modified",
+                lineterm="",
+            )
+        )
+
+        self.assertEqual(file_ops.diff_text(original, modified), expected)
+        self.assertEqual(file_ops.diff_text(original, original), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
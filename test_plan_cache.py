@@ -0,0 +1,28 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from backend.agents.plan_cache import PlanCache
+
+
+class TestPlanCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache = PlanCache(Path(self.tmpdir.name) / "plans.db")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_exact_hit_ignores_case_and_whitespace(self):
+        self.cache.put("Build a landing page", ["Create index.html", "Style it"])
+
+        self.assertEqual(self.cache.get("  build a   LANDING page "), ["Create index.html", "Style it"])
+
+    def test_miss_for_unrelated_goal(self):
+        self.cache.put("Build a landing page", ["Create index.html"])
+
+        self.assertIsNone(self.cache.get("Write a CLI parser"))
+
+
+if __name__ == "__main__":
+    unittest.main()
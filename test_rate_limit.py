@@ -0,0 +1,23 @@
+import unittest
+
+from backend.agents.rate_limit import RateLimiter
+
+
+class TestRateLimiter(unittest.TestCase):
+    def test_waits_once_the_minute_budget_is_spent(self):
+        limiter = RateLimiter(requests_per_minute=60, tokens_per_minute=1_000_000)
+
+        self.assertEqual(limiter._reserve(tokens=1, requests=60), 0)
+        self.assertAlmostEqual(limiter._reserve(tokens=1, requests=1), 1.0, places=1)
+
+    def test_rate_limit_halves_and_success_recovers(self):
+        limiter = RateLimiter(requests_per_minute=100, tokens_per_minute=1000)
+
+        limiter.on_rate_limited()
+        self.assertEqual(limiter._requests.rate, 50)
+        limiter.on_success()
+        self.assertEqual(limiter._requests.rate, 55)
+
+
+if __name__ == "__main__":
+    unittest.main()
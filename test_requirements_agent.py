@@ -0,0 +1,38 @@
+import asyncio
+import unittest
+
+from backend.agents.requirements_agent import RequirementsAgent
+
+
+class TestRequirementsAgent(unittest.TestCase):
+    def setUp(self):
+        self.agent = RequirementsAgent()
+
+    def test_landing_goal_adds_performance_question(self):
+        questions = asyncio.run(self.agent.generate_questions("Build a landing page"))
+
+        categories = [q.category for q in questions]
+        self.assertIn("performance", categories)
+        self.assertEqual(categories.index("performance") + 1, categories.index("quality"))
+
+    def test_other_goals_get_the_bank_by_priority(self):
+        questions = asyncio.run(self.agent.generate_questions("Write a CLI parser"))
+
+        self.assertNotIn("performance", [q.category for q in questions])
+        priorities = [q.priority for q in questions]
+        self.assertEqual(priorities, sorted(priorities, reverse=True))
+
+    def test_each_session_gets_its_own_question_ids(self):
+        first = asyncio.run(self.agent.generate_clarifying_questions("Build a landing page"))
+        second = asyncio.run(self.agent.generate_clarifying_questions("Build a landing page"))
+
+        ids = [q.id for q in first + second]
+        self.assertEqual(len(ids), len(set(ids)))
+
+    def test_exposes_session_api(self):
+        for name in ("generate_clarifying_questions", "process_answer", "generate_prd"):
+            self.assertTrue(hasattr(RequirementsAgent, name), name)
+
+
+if __name__ == "__main__":
+    unittest.main()
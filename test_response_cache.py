@@ -0,0 +1,40 @@
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+
+from backend.agents.response_cache import ResponseCache, prompt_hash
+
+
+class TestResponseCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache = ResponseCache(Path(self.tmpdir.name) / "responses.db")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_roundtrip_is_keyed_by_model_and_prompt(self):
+        self.cache.put(prompt_hash("gpt-a", "Plan X"), "reply")
+
+        self.assertEqual(self.cache.get(prompt_hash("gpt-a", "Plan X")), "reply")
+        self.assertIsNone(self.cache.get(prompt_hash("gpt-b", "Plan X")))
+
+    def test_expired_entry_is_a_miss(self):
+        self.cache.ttl_seconds = -1
+        self.cache.put(prompt_hash("gpt-a", "Plan X"), "reply")
+
+        self.assertIsNone(self.cache.get(prompt_hash("gpt-a", "Plan X")))
+
+    def test_expired_rows_are_deleted(self):
+        self.cache.put(prompt_hash("gpt-a", "Plan X"), "reply")
+        self.cache.put(prompt_hash("gpt-a", "Plan Y"), "reply")
+        self.cache.ttl_seconds = -1
+
+        self.assertEqual(self.cache.purge_expired(), 2)
+        with sqlite3.connect(self.cache.path) as conn:
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,131 @@
+import json
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from backend import storage
+from backend.models import Task
+
+
+class TestTaskJournal(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        patcher = patch.object(storage, "TASKS_FILE", Path(self.tmpdir.name) / "tasks.json")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.tmpdir.cleanup)
+
+    def test_upsert_is_journaled_and_replayed(self):
+        first = Task(type="build", goal="one")
+        storage.save_tasks([first])
+
+        storage.upsert_task(first.model_copy(update={"status": "completed"}))
+        storage.upsert_task(Task(type="build", goal="two"))
+
+        snapshot = json.loads(storage.TASKS_FILE.read_text(encoding="utf-8"))
+        self.assertEqual([t["status"] for t in snapshot], ["queued"])
+        self.assertEqual(
+            [(t.goal, t.status) for t in storage.load_tasks()],
+            [("one", "completed"), ("two", "queued")],
+        )
+
+    def test_upsert_tasks_appends_once(self):
+        first, second = Task(type="build", goal="one"), Task(type="build", goal="two")
+        storage.upsert_tasks([first, second])
+
+        lines = storage._task_journal_file().read_bytes().splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertEqual([t.goal for t in storage.load_tasks()], ["one", "two"])
+
+    def test_task_etag_changes_only_with_the_task(self):
+        first, second = Task(type="build", goal="one"), Task(type="build", goal="two")
+        storage.upsert_tasks([first, second])
+        etag = storage.task_etag(first.id)
+
+        second.status = "completed"
+        storage.upsert_task(second)
+        self.assertEqual(storage.task_etag(first.id), etag)
+
+        first.status = "completed"
+        storage.upsert_task(first)
+        self.assertNotEqual(storage.task_etag(first.id), etag)
+        self.assertIsNone(storage.task_etag("missing"))
+
+    def test_large_journal_is_compacted(self):
+        with patch.object(storage, "TASK_JOURNAL_COMPACT_BYTES", 1):
+            storage.upsert_task(Task(type="build", goal="one"))
+
+        self.assertFalse(storage._task_journal_file().exists())
+        self.assertEqual([t.goal for t in storage.load_tasks()], ["one"])
+
+    def test_append_during_compaction_is_kept(self):
+        late = Task(type="build", goal="late")
+        write_atomic = storage._write_atomic
+
+        def append_late():
+            # What the worker process does: append under the shared file lock
+            with storage._task_files_lock(), storage._task_journal_file().open("ab") as f:
+                f.write(json.dumps(late.model_dump(by_alias=True), default=str).encode() + b"\n")
+
+        appenders = []
+
+        def write_while_appending(path, data):
+            appender = threading.Thread(target=append_late)
+            appender.start()
+            appender.join(timeout=0.2)  # blocked until the compaction is done
+            appenders.append(appender)
+            write_atomic(path, data)
+
+        with patch.object(storage, "TASK_JOURNAL_COMPACT_BYTES", 1), patch.object(
+            storage, "_write_atomic", write_while_appending
+        ):
+            storage.upsert_task(Task(type="build", goal="one"))
+        for appender in appenders:
+            appender.join()
+
+        self.assertEqual(sorted(t.goal for t in storage.load_tasks()), ["late", "one"])
+
+    def test_cached_records_follow_writes_from_other_processes(self):
+        storage.save_tasks([Task(type="build", goal="one")])
+        storage.upsert_task(Task(type="build", goal="two"))
+        with patch.object(storage, "_read_task_records", wraps=storage._read_task_records) as read:
+            storage.load_tasks()
+            storage.load_tasks()
+            self.assertEqual(read.call_count, 1)
+
+        # Another process (the worker) appends to the journal directly
+        other = Task(type="build", goal="three")
+        with storage._task_journal_file().open("a", encoding="utf-8") as f:
+            f.write(json.dumps(other.model_dump(by_alias=True), default=str) + "\n")
+
+        self.assertEqual([t.goal for t in storage.load_tasks()], ["one", "two", "three"])
+        self.assertEqual(storage.load_task(other.id).goal, "three")
+        self.assertIn(other.id, storage.task_ids())
+
+    def test_recent_tasks_match_full_sort(self):
+        storage.save_tasks([Task(type="build", goal=str(n), updated_at=1_700_000_000 + n) for n in (3, 1, 2)])
+        storage.upsert_task(Task(type="build", goal="0", updated_at="2020-01-01T00:00:00Z"))
+
+        self.assertEqual([t.goal for t in storage.load_recent_tasks(2)], ["3", "2"])
+        self.assertEqual([t.goal for t in storage.load_recent_tasks(10)], ["3", "2", "1", "0"])
+
+    def test_next_task_id_continues_numeric_ids(self):
+        storage.save_tasks([Task(id="7", type="build", goal="one")])
+        self.assertEqual(storage.next_task_id(), "8")
+        self.assertEqual(storage.next_task_id(), "9")
+
+        # tasks.json replaced behind the counter's back: reseed from the ids
+        storage.save_tasks([Task(id=str(n), type="build", goal="x") for n in (10, 12)])
+        self.assertEqual(storage.next_task_id(), "13")
+
+    def test_next_task_id_uses_uuids_without_numeric_ids(self):
+        storage.save_tasks([Task(type="build", goal="one")])
+        first, second = storage.next_task_id(), storage.next_task_id()
+        self.assertNotEqual(first, second)
+        self.assertFalse(first.isdigit())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,29 @@
+import unittest
+
+from backend.agents.super_builder import SuperBuilderAgent, _parse_plan, _parse_plan_and_first_step
+
+
+class TestPlanParsing(unittest.TestCase):
+    def test_almost_json_replies_keep_their_structure(self):
+        self.assertEqual(_parse_plan('```json\n["a", "b",]\n```'), ("a", "b"))
+        self.assertEqual(_parse_plan('Here is the plan:\n["a", "b"]'), ("a", "b"))
+        self.assertEqual(
+            _parse_plan_and_first_step('```json\n{"plan": ["a"], "first_step_result": "x",}\n```'),
+            (("a",), "x"),
+        )
+
+    def test_plain_text_falls_back_to_lines(self):
+        self.assertEqual(_parse_plan("- a\n- b"), ("a", "b"))
+
+
+class TestToolCommands(unittest.TestCase):
+    def test_verbs_match_as_prefixes(self):
+        split = SuperBuilderAgent._split_command
+        self.assertEqual(split("Read file: a.py"), ("read file", "a.py"))
+        self.assertEqual(split("Read files: a.py"), ("read file", "a.py"))
+        self.assertEqual(split("List directory: src"), ("list dir", "src"))
+        self.assertEqual(split("Design the schema"), ("", None))
+
+
+if __name__ == "__main__":
+    unittest.main()
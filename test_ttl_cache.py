@@ -0,0 +1,32 @@
+import unittest
+from unittest.mock import patch
+
+from backend.utils import ttl_cache
+from backend.utils.ttl_cache import TTLCache
+
+
+class TestTTLCache(unittest.TestCase):
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache["a"] = 1
+        cache["b"] = 2
+        cache["a"]
+        cache["c"] = 3
+
+        self.assertEqual(sorted(cache), ["a", "c"])
+
+    def test_idle_entries_expire(self):
+        cache = TTLCache(maxsize=10, ttl=60)
+        with patch.object(ttl_cache.time, "monotonic", return_value=0.0):
+            cache["a"] = 1
+            cache["b"] = 2
+        with patch.object(ttl_cache.time, "monotonic", return_value=50.0):
+            cache["a"]
+        with patch.object(ttl_cache.time, "monotonic", return_value=70.0):
+            self.assertIn("a", cache)
+            self.assertNotIn("b", cache)
+            self.assertEqual(len(cache), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()